@@ -0,0 +1,36 @@
+"""add keyset pagination indexes
+
+Revision ID: 0c4e7a9b2d15
+Revises: f3b8c6d1a2e4
+Create Date: 2026-10-17 20:03:27.904116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c4e7a9b2d15'
+down_revision: Union[str, None] = 'f3b8c6d1a2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (parent foreign key, id): each listing page is one range scan
+    op.create_index('ix_cars_user_id_id', 'cars', ['user_id', 'id'], unique=False)
+    op.create_index(
+        'ix_build_lists_car_id_id', 'build_lists', ['car_id', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_parts_build_list_id_id', 'parts', ['build_list_id', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_parts_build_list_id_id', table_name='parts')
+    op.drop_index('ix_build_lists_car_id_id', table_name='build_lists')
+    op.drop_index('ix_cars_user_id_id', table_name='cars')
@@ -0,0 +1,129 @@
+"""add build list and car rollups
+
+Revision ID: 2b7d9e4a6c18
+Revises: 5e8a1c3f7b90
+Create Date: 2026-10-17 23:05:42.561903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7d9e4a6c18'
+down_revision: Union[str, None] = '5e8a1c3f7b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (child, parent, foreign key, count column, summed child column, sum column);
+# parts roll up into build lists, and build lists into cars
+ROLLUPS = [
+    ('parts', 'build_lists', 'build_list_id', 'part_count', 'price', 'total_price'),
+    (
+        'build_lists',
+        'cars',
+        'car_id',
+        'build_list_count',
+        'total_price',
+        'total_spend',
+    ),
+]
+OPERATIONS = ('insert', 'delete', 'update')
+
+
+def postgres_triggers(child, parent, fk, count, value, total):
+    """Statement-level triggers: one aggregated UPDATE of the parents per statement."""
+    inserted = f'SELECT {fk}, 1 AS n, coalesce({value}, 0) AS total FROM new_rows'
+    deleted = f'SELECT {fk}, -1 AS n, -coalesce({value}, 0) AS total FROM old_rows'
+    changes = {
+        'insert': (inserted, 'NEW TABLE AS new_rows'),
+        'delete': (deleted, 'OLD TABLE AS old_rows'),
+        'update': (
+            f'{inserted} UNION ALL {deleted}',
+            'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+        ),
+    }
+    for operation, (rows, transition_tables) in changes.items():
+        name = f'{child}_rollup_{operation}'
+        op.execute(
+            f'CREATE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN '
+            f'UPDATE {parent} AS p SET {count} = p.{count} + d.n, '
+            f'{total} = p.{total} + d.total '
+            f'FROM (SELECT {fk} AS id, sum(n) AS n, sum(total) AS total '
+            f'FROM ({rows}) AS c GROUP BY {fk}) AS d '
+            'WHERE p.id = d.id AND (d.n <> 0 OR d.total <> 0); '
+            'RETURN NULL; END $$'
+        )
+        op.execute(
+            f'CREATE TRIGGER {name} AFTER {operation.upper()} ON {child} '
+            f'REFERENCING {transition_tables} '
+            f'FOR EACH STATEMENT EXECUTE FUNCTION {name}()'
+        )
+
+
+def sqlite_triggers(child, parent, fk, count, value, total):
+    """Row-level triggers (SQLite has no others)."""
+
+    def apply(row, sign):
+        return (
+            f'UPDATE {parent} SET {count} = {count} {sign} 1, '
+            f'{total} = {total} {sign} coalesce({row}.{value}, 0) '
+            f'WHERE id = {row}.{fk};'
+        )
+
+    op.execute(
+        f'CREATE TRIGGER {child}_rollup_insert AFTER INSERT ON {child} '
+        f"BEGIN {apply('new', '+')} END"
+    )
+    op.execute(
+        f'CREATE TRIGGER {child}_rollup_delete AFTER DELETE ON {child} '
+        f"BEGIN {apply('old', '-')} END"
+    )
+    op.execute(
+        f'CREATE TRIGGER {child}_rollup_update AFTER UPDATE OF {value}, {fk} '
+        f'ON {child} WHEN old.{value} IS NOT new.{value} OR old.{fk} != new.{fk} '
+        f"BEGIN {apply('old', '-')} {apply('new', '+')} END"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for child, parent, fk, count, value, total in ROLLUPS:
+        op.add_column(
+            parent, sa.Column(count, sa.Integer(), nullable=False, server_default='0')
+        )
+        op.add_column(
+            parent, sa.Column(total, sa.Integer(), nullable=False, server_default='0')
+        )
+        # Backfill before the triggers exist; build lists first, cars sum them
+        op.execute(
+            f'UPDATE {parent} SET '
+            f'{count} = (SELECT count(*) FROM {child} WHERE {child}.{fk} = {parent}.id), '
+            f'{total} = (SELECT coalesce(sum({value}), 0) FROM {child} '
+            f'WHERE {child}.{fk} = {parent}.id)'
+        )
+
+    triggers = (
+        postgres_triggers
+        if op.get_bind().dialect.name == 'postgresql'
+        else sqlite_triggers
+    )
+    for rollup in ROLLUPS:
+        triggers(*rollup)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    for child, parent, fk, count, value, total in reversed(ROLLUPS):
+        for operation in OPERATIONS:
+            name = f'{child}_rollup_{operation}'
+            if postgres:
+                op.execute(f'DROP TRIGGER IF EXISTS {name} ON {child}')
+                op.execute(f'DROP FUNCTION IF EXISTS {name}()')
+            else:
+                op.execute(f'DROP TRIGGER IF EXISTS {name}')
+        op.drop_column(parent, total)
+        op.drop_column(parent, count)
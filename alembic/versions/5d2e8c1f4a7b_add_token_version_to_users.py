@@ -0,0 +1,31 @@
+"""add token version to users
+
+Revision ID: 5d2e8c1f4a7b
+Revises: a7c287046186
+Create Date: 2026-10-17 09:12:44.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8c1f4a7b'
+down_revision: Union[str, None] = 'a7c287046186'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
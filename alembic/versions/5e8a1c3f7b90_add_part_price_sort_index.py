@@ -0,0 +1,33 @@
+"""add part price sort index
+
+Revision ID: 5e8a1c3f7b90
+Revises: b93f0c7a5e21
+Create Date: 2026-10-17 22:41:09.318275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a1c3f7b90'
+down_revision: Union[str, None] = 'b93f0c7a5e21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A build list's parts by price, keyset paged on (price, id)
+    op.create_index(
+        'ix_parts_build_list_id_price_id',
+        'parts',
+        ['build_list_id', 'price', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_parts_build_list_id_price_id', table_name='parts')
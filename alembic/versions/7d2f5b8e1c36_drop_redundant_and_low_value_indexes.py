@@ -0,0 +1,43 @@
+"""drop redundant and low-value indexes
+
+Revision ID: 7d2f5b8e1c36
+Revises: 0c4e7a9b2d15
+Create Date: 2026-10-17 20:41:09.662870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2f5b8e1c36'
+down_revision: Union[str, None] = '0c4e7a9b2d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, column). The id indexes duplicate the primary keys; the rest
+# are long free text or low-selectivity columns no query filters on. Every one
+# of them is still written on each insert and update.
+INDEXES = [
+    ('ix_users_id', 'users', 'id'),
+    ('ix_cars_id', 'cars', 'id'),
+    ('ix_build_lists_id', 'build_lists', 'id'),
+    ('ix_parts_id', 'parts', 'id'),
+    ('ix_cars_trim', 'cars', 'trim'),
+    ('ix_build_lists_description', 'build_lists', 'description'),
+    ('ix_parts_description', 'parts', 'description'),
+    ('ix_parts_price', 'parts', 'price'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, column in INDEXES:
+        op.create_index(name, table, [column], unique=False)
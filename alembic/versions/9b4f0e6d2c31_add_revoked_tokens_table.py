@@ -0,0 +1,37 @@
+"""add revoked tokens table
+
+Revision ID: 9b4f0e6d2c31
+Revises: 5d2e8c1f4a7b
+Create Date: 2026-10-17 11:40:03.552917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4f0e6d2c31'
+down_revision: Union[str, None] = '5d2e8c1f4a7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('jti', sa.String(), nullable=False),
+        sa.Column('expires_at', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('jti'),
+    )
+    op.create_index(
+        op.f('ix_revoked_tokens_expires_at'), 'revoked_tokens', ['expires_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_revoked_tokens_expires_at'), table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
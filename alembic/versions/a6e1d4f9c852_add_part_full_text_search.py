@@ -0,0 +1,79 @@
+"""add part full-text search
+
+Revision ID: a6e1d4f9c852
+Revises: 7d2f5b8e1c36
+Create Date: 2026-10-17 21:26:51.214733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e1d4f9c852'
+down_revision: Union[str, None] = '7d2f5b8e1c36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Name matches rank above manufacturer and part number, which rank above description
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(manufacturer, '') || ' ' || "
+    "coalesce(part_number, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+FTS5_COLUMNS = 'name, manufacturer, part_number, description'
+FTS5_NEW_ROW = 'new.id, new.name, new.manufacturer, new.part_number, new.description'
+FTS5_OLD_ROW = (
+    "'delete', old.id, old.name, old.manufacturer, old.part_number, old.description"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # Generated, so every write keeps it current without application code
+        op.execute(
+            'ALTER TABLE parts ADD COLUMN search_vector tsvector '
+            f'GENERATED ALWAYS AS ({SEARCH_DOCUMENT}) STORED'
+        )
+        op.execute(
+            'CREATE INDEX ix_parts_search_vector ON parts USING gin (search_vector)'
+        )
+        return
+
+    # SQLite (local development): an FTS5 index over parts, kept by triggers
+    op.execute(
+        f'CREATE VIRTUAL TABLE parts_fts USING fts5({FTS5_COLUMNS}, '
+        "content='parts', content_rowid='id', tokenize='porter unicode61')"
+    )
+    op.execute(
+        'CREATE TRIGGER parts_fts_insert AFTER INSERT ON parts BEGIN '
+        f'INSERT INTO parts_fts(rowid, {FTS5_COLUMNS}) VALUES ({FTS5_NEW_ROW}); END'
+    )
+    op.execute(
+        'CREATE TRIGGER parts_fts_delete AFTER DELETE ON parts BEGIN '
+        f'INSERT INTO parts_fts(parts_fts, rowid, {FTS5_COLUMNS}) '
+        f'VALUES ({FTS5_OLD_ROW}); END'
+    )
+    op.execute(
+        'CREATE TRIGGER parts_fts_update AFTER UPDATE ON parts BEGIN '
+        f'INSERT INTO parts_fts(parts_fts, rowid, {FTS5_COLUMNS}) '
+        f'VALUES ({FTS5_OLD_ROW}); '
+        f'INSERT INTO parts_fts(rowid, {FTS5_COLUMNS}) VALUES ({FTS5_NEW_ROW}); END'
+    )
+    op.execute("INSERT INTO parts_fts(parts_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_parts_search_vector', table_name='parts')
+        op.drop_column('parts', 'search_vector')
+        return
+
+    for trigger in ('parts_fts_insert', 'parts_fts_delete', 'parts_fts_update'):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS parts_fts')
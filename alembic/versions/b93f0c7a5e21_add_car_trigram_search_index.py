@@ -0,0 +1,36 @@
+"""add car trigram search index
+
+Revision ID: b93f0c7a5e21
+Revises: a6e1d4f9c852
+Create Date: 2026-10-17 22:08:14.730562
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b93f0c7a5e21'
+down_revision: Union[str, None] = 'a6e1d4f9c852'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres only; other databases use the application's in-process index
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute(
+        'CREATE INDEX ix_cars_make_model_trgm ON cars '
+        "USING gin ((make || ' ' || model) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_cars_make_model_trgm', table_name='cars')
@@ -0,0 +1,44 @@
+"""add rate limit counters table
+
+Revision ID: c3a91d7e5b08
+Revises: 9b4f0e6d2c31
+Create Date: 2026-10-17 14:05:27.904311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a91d7e5b08'
+down_revision: Union[str, None] = '9b4f0e6d2c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rate_limit_counters',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('window_start', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('key', 'window_start'),
+    )
+    op.create_index(
+        op.f('ix_rate_limit_counters_expires_at'),
+        'rate_limit_counters',
+        ['expires_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f('ix_rate_limit_counters_expires_at'), table_name='rate_limit_counters'
+    )
+    op.drop_table('rate_limit_counters')
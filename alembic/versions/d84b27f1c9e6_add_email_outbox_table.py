@@ -0,0 +1,48 @@
+"""add email outbox table
+
+Revision ID: d84b27f1c9e6
+Revises: c3a91d7e5b08
+Create Date: 2026-10-17 16:21:50.670184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd84b27f1c9e6'
+down_revision: Union[str, None] = 'c3a91d7e5b08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('to_email', sa.String(), nullable=False),
+        sa.Column('template_id', sa.String(), nullable=False),
+        sa.Column('template_data', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.Integer(), nullable=False),
+        sa.Column('sent_at', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_email_outbox_status_next_attempt_at',
+        'email_outbox',
+        ['status', 'next_attempt_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_email_outbox_status_next_attempt_at', table_name='email_outbox')
+    op.drop_table('email_outbox')
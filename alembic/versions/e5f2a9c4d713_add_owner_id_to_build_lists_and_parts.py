@@ -0,0 +1,54 @@
+"""add owner_id to build_lists and parts
+
+Revision ID: e5f2a9c4d713
+Revises: d84b27f1c9e6
+Create Date: 2026-10-17 18:05:12.318842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f2a9c4d713'
+down_revision: Union[str, None] = 'd84b27f1c9e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('build_lists', sa.Column('owner_id', sa.Integer(), nullable=True))
+    op.add_column('parts', sa.Column('owner_id', sa.Integer(), nullable=True))
+
+    # Backfill from the owning car; parts copy their (now filled) build list
+    op.execute(
+        "UPDATE build_lists SET owner_id = "
+        "(SELECT cars.user_id FROM cars WHERE cars.id = build_lists.car_id)"
+    )
+    op.execute(
+        "UPDATE parts SET owner_id = "
+        "(SELECT build_lists.owner_id FROM build_lists "
+        "WHERE build_lists.id = parts.build_list_id)"
+    )
+
+    op.alter_column('build_lists', 'owner_id', nullable=False)
+    op.alter_column('parts', 'owner_id', nullable=False)
+    op.create_foreign_key(
+        'build_lists_owner_id_fkey', 'build_lists', 'users', ['owner_id'], ['id']
+    )
+    op.create_foreign_key('parts_owner_id_fkey', 'parts', 'users', ['owner_id'], ['id'])
+    op.create_index(op.f('ix_build_lists_owner_id'), 'build_lists', ['owner_id'], unique=False)
+    op.create_index(op.f('ix_parts_owner_id'), 'parts', ['owner_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_parts_owner_id'), table_name='parts')
+    op.drop_index(op.f('ix_build_lists_owner_id'), table_name='build_lists')
+    op.drop_constraint('parts_owner_id_fkey', 'parts', type_='foreignkey')
+    op.drop_constraint('build_lists_owner_id_fkey', 'build_lists', type_='foreignkey')
+    op.drop_column('parts', 'owner_id')
+    op.drop_column('build_lists', 'owner_id')
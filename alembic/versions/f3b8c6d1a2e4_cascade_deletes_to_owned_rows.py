@@ -0,0 +1,44 @@
+"""cascade deletes to owned rows
+
+Revision ID: f3b8c6d1a2e4
+Revises: e5f2a9c4d713
+Create Date: 2026-10-17 19:12:40.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8c6d1a2e4'
+down_revision: Union[str, None] = 'e5f2a9c4d713'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (constraint, table, referenced table, column)
+FOREIGN_KEYS = [
+    ('cars_user_id_fkey', 'cars', 'users', 'user_id'),
+    ('build_lists_car_id_fkey', 'build_lists', 'cars', 'car_id'),
+    ('build_lists_owner_id_fkey', 'build_lists', 'users', 'owner_id'),
+    ('parts_build_list_id_fkey', 'parts', 'build_lists', 'build_list_id'),
+    ('parts_owner_id_fkey', 'parts', 'users', 'owner_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Deletes are single DELETE ... RETURNING statements; the database removes
+    # the dependent rows instead of the ORM loading and deleting each one
+    for name, table, referred_table, column in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(
+            name, table, referred_table, [column], ['id'], ondelete='CASCADE'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, referred_table, column in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred_table, [column], ['id'])
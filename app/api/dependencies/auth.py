@@ -1,16 +1,24 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
+from uuid import uuid4
+import hashlib
+import hmac
+import time
 
-from fastapi import Depends, HTTPException, status, Cookie  # Import Cookie
+from fastapi import Depends, Header, HTTPException, Response, status, Cookie  # Import Cookie
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-import bcrypt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.metrics import register_metrics_source
 from app.db.session import get_db
 from app.api.models.user import User as DBUser
-from app.api.schemas.token import TokenData
+from app.api.schemas.token import TokenUser
+from app.api.utils.security import get_password_hash, verify_password  # noqa: F401
+from app.api.services.token_revocation import revocation_store
+from app.api.services.user_cache import user_cache
+from app.api.utils.cache import TTLCache
 
 ALGORITHM = settings.HASH_ALGORITHM  # Add this line
 
@@ -19,26 +27,6 @@ oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_STR}/auth/token"  # Or "auth/token" if API_STR is a base for all paths
 )
 
-# --- Password Utilities ---
-
-
-def verify_password(plain_password: str, hashed_password_str: str) -> bool:
-    """Verifies a plain password against a hashed password."""
-    # Ensure hashed_password_str is bytes, as bcrypt expects
-    hashed_password_bytes = hashed_password_str.encode("utf-8")
-    plain_password_bytes = plain_password.encode("utf-8")
-    return bcrypt.checkpw(plain_password_bytes, hashed_password_bytes)
-
-
-def get_password_hash(password: str) -> str:
-    """Hashes a plain password."""
-    password_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt(rounds=12)
-    hashed_bytes = bcrypt.hashpw(password_bytes, salt)
-    # Store as string
-    return hashed_bytes.decode("utf-8")
-
-
 # --- JWT Utilities ---
 
 
@@ -59,38 +47,164 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-# --- Dependency to Get Current User ---
+# Payloads of tokens that already passed signature and expiry checks, keyed by
+# a digest of the raw token so the cache never holds usable credentials.
+_verified_tokens = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS
+)
+register_metrics_source("token_cache", _verified_tokens.stats)
 
 
-async def get_current_user(
-    access_token: Optional[str] = Cookie(None),  # Read "access_token" cookie
-    db: Session = Depends(get_db),
-) -> DBUser:
+def decode_token(token: str) -> Dict[str, Any]:
     """
-    Decodes JWT token from cookie, validates credentials, and returns the user.
+    Verifies and decodes a JWT, skipping the signature check for tokens seen before.
+    Raises JWTError exactly like jwt.decode for invalid or expired tokens.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _verified_tokens.get(key)
+    if payload is None:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.HASH_ALGORITHM]
+        )
+        exp = payload.get("exp")
+        # Cached entries must expire no later than the token itself
+        _verified_tokens.set(
+            key, payload, ttl=exp - time.time() if exp is not None else None
+        )
+    return dict(payload)
+
+
+# --- Access / Refresh Token Pair ---
+
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+# The refresh cookie is only sent to the auth endpoints that consume it
+REFRESH_COOKIE_PATH = f"{settings.API_STR}/auth"
+
+
+def create_token_pair(user: DBUser) -> Tuple[str, str]:
+    """
+    Creates a short-lived access token and a long-lived refresh token for a user.
+    The access token carries everything needed to authorize a request.
+    """
+    claims = {"sub": str(user.id), "ver": user.token_version}
+    access_token = create_access_token(
+        data={
+            **claims,
+            "type": ACCESS_TOKEN_TYPE,
+            "dis": user.disabled,
+            "jti": uuid4().hex,
+        }
+    )
+    refresh_token = create_access_token(
+        data={**claims, "type": REFRESH_TOKEN_TYPE, "jti": uuid4().hex},
+        expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    return access_token, refresh_token
+
+
+def set_auth_cookies(response: Response, user: DBUser):
+    """Issues a fresh token pair for the user as HTTP-only cookies."""
+    access_token, refresh_token = create_token_pair(user)
+    response.set_cookie(
+        key="access_token",
+        value=access_token,
+        httponly=True,  # Crucial for security
+        max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # Cookie expiry in seconds
+        path="/",  # Cookie available for all paths
+        samesite="lax",  # Recommended for CSRF protection balance
+        secure=False,  # TODO: Set to True in production if using HTTPS
+    )
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        httponly=True,
+        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+        path=REFRESH_COOKIE_PATH,
+        samesite="lax",
+        secure=False,  # TODO: Set to True in production if using HTTPS
     )
-    if access_token is None:
-        raise credentials_exception
 
+
+def clear_auth_cookies(response: Response):
+    response.delete_cookie("access_token", path="/")
+    response.delete_cookie("refresh_token", path=REFRESH_COOKIE_PATH)
+
+
+def read_token(token: Optional[str], token_type: str) -> Optional[TokenUser]:
+    """
+    Returns the identity in a token of the given type, or None if the token is
+    missing, invalid, expired, or of another type (e.g. an email-verification token).
+    """
+    if token is None:
+        return None
     try:
-        payload = jwt.decode(
-            access_token, settings.SECRET_KEY, algorithms=[settings.HASH_ALGORITHM]
-        )
-        username: Optional[str] = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
+        payload = decode_token(token)
     except JWTError:
-        raise credentials_exception
+        return None
+    if payload.get("type") != token_type:
+        return None
+    try:
+        return TokenUser(
+            id=int(payload["sub"]),
+            disabled=payload.get("dis", False),
+            token_version=payload.get("ver", 0),
+            jti=payload.get("jti"),
+            expires_at=payload.get("exp"),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
 
-    user = db.query(DBUser).filter(DBUser.username == token_data.username).first()
+
+# --- Dependency to Get Current User ---
+
+
+async def _get_user(db: AsyncSession, user_id: int) -> Optional[DBUser]:
+    """Load a user by id, serving repeat lookups from the user cache."""
+    user = await user_cache.get(db, user_id)
     if user is None:
-        raise credentials_exception
+        user = await db.get(DBUser, user_id)
+        if user is not None:
+            user_cache.set(user)
+    return user
+
+
+async def get_current_token_user(
+    access_token: Optional[str] = Cookie(None),  # Read "access_token" cookie
+) -> TokenUser:
+    """
+    Validates the access token cookie and returns the identity it carries.
+    Does not touch the database (revocation is answered from memory for all but
+    revoked tokens); use this unless the handler needs the full user row.
+    """
+    token_user = read_token(access_token, ACCESS_TOKEN_TYPE)
+    if token_user is None or await revocation_store.is_revoked(token_user.jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if token_user.disabled:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+        )
+    return token_user
+
+
+async def get_current_user(
+    token_user: TokenUser = Depends(get_current_token_user),
+    db: AsyncSession = Depends(get_db),
+) -> DBUser:
+    """
+    Validates the access token cookie and returns the full user row.
+    """
+    user = await _get_user(db, token_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     if user.disabled:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
@@ -100,26 +214,19 @@ async def get_current_user(
 
 async def get_current_active_user_optional(
     access_token: Optional[str] = Cookie(None),  # Read "access_token" cookie
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Optional[DBUser]:
     """
     Optionally returns the current active user if a valid token cookie is present.
     Returns None if no token, token is invalid/expired, user not found, or user is inactive.
     """
-    if access_token is None:
-        return None
-    try:
-        payload = jwt.decode(
-            access_token, settings.SECRET_KEY, algorithms=[settings.HASH_ALGORITHM]
-        )
-        username: Optional[str] = payload.get("sub")
-        if username is None:
-            return None  # Invalid token payload
-        token_data = TokenData(username=username)
-    except JWTError:  # Covers expired, invalid signature, etc.
-        return None  # Token is invalid or expired
-
-    user = db.query(DBUser).filter(DBUser.username == token_data.username).first()
+    token_user = read_token(access_token, ACCESS_TOKEN_TYPE)
+    if token_user is None or token_user.disabled:
+        return None  # Token is missing, invalid or expired, or user was inactive
+    if await revocation_store.is_revoked(token_user.jti):
+        return None  # Token was revoked (e.g. by logging out)
+
+    user = await _get_user(db, token_user.id)
     if user is None:
         return None  # User from token not found in DB
 
@@ -127,3 +234,22 @@ async def get_current_active_user_optional(
         return None  # User is inactive, so not considered an "active user"
 
     return user
+
+
+# --- Internal Endpoints ---
+
+
+def verify_internal_token(x_internal_token: Optional[str] = Header(None)):
+    """
+    Guards operational endpoints with the shared INTERNAL_API_TOKEN header.
+    They do not exist (404) while no token is configured.
+    """
+    if not settings.INTERNAL_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_internal_token is None or not hmac.compare_digest(
+        x_internal_token.encode("utf-8"), settings.INTERNAL_API_TOKEN.encode("utf-8")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
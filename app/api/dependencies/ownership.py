@@ -0,0 +1,151 @@
+import logging
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Select, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.models.build_list import BuildList as DBBuildList
+from app.api.models.car import Car as DBCar
+from app.api.models.part import Part as DBPart
+from app.api.schemas.token import TokenUser
+
+# Existence and ownership checks shared by the cars, build lists and parts
+# routers. Each check is one primary-key lookup (build lists and parts carry
+# their owner's id), and the result is kept on the request's session until its
+# transaction ends, so asking again about the same object costs nothing.
+
+_CACHE_KEY = "ownership"
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_ownership(session: Session, transaction):
+    # A committed delete or move can make a cached answer stale
+    if transaction.parent is None:
+        session.info.pop(_CACHE_KEY, None)
+
+
+async def _lookup(
+    db: AsyncSession, kind: str, object_id: int, query: Select
+) -> Tuple[Optional[Any], Optional[int]]:
+    """Return (object, owner user id) for `query`, or (None, None) if it matched nothing."""
+    cache = db.sync_session.info.setdefault(_CACHE_KEY, {})
+    key = (kind, object_id)
+    if key not in cache:
+        row = (await db.execute(query)).first()
+        cache[key] = (row[0], row[1]) if row else (None, None)
+    return cache[key]
+
+
+def _check(
+    label: str,
+    object_id: int,
+    obj: Optional[Any],
+    owner_id: Optional[int],
+    current_user: TokenUser,
+    logger: logging.Logger,
+    not_found_detail: Optional[str],
+    authorization_detail: Optional[str],
+):
+    if obj is None:
+        detail = not_found_detail or f"{label} with id {object_id} not found"
+        logger.warning(
+            f"{label} ownership verification failed: {detail} (User: {current_user.id})"
+        )
+        raise HTTPException(status_code=404, detail=detail)
+
+    if owner_id != current_user.id:
+        detail = (
+            authorization_detail
+            or f"Not authorized to perform this action on this {label.lower()}"
+        )
+        logger.warning(
+            f"{label} ownership verification failed: {detail} (User: {current_user.id}, Owner: {owner_id})"
+        )
+        raise HTTPException(status_code=403, detail=detail)
+
+    return obj
+
+
+async def verify_car_ownership(
+    car_id: int,
+    db: AsyncSession,
+    current_user: TokenUser,
+    logger: logging.Logger,
+    not_found_detail: str | None = None,
+    authorization_detail: str | None = None,
+) -> DBCar:
+    """Return the car if it exists and belongs to the current user; raise 404 or 403 otherwise."""
+    car, owner_id = await _lookup(
+        db,
+        "car",
+        car_id,
+        select(DBCar, DBCar.user_id).where(DBCar.id == car_id),
+    )
+    return _check(
+        "Car",
+        car_id,
+        car,
+        owner_id,
+        current_user,
+        logger,
+        not_found_detail,
+        authorization_detail,
+    )
+
+
+async def verify_build_list_ownership(
+    build_list_id: int,
+    db: AsyncSession,
+    current_user: TokenUser,
+    logger: logging.Logger,
+    not_found_detail: str | None = None,
+    authorization_detail: str | None = None,
+) -> DBBuildList:
+    """Return the build list if it belongs to the current user; raise 404 or 403 otherwise."""
+    build_list, owner_id = await _lookup(
+        db,
+        "build_list",
+        build_list_id,
+        select(DBBuildList, DBBuildList.owner_id).where(
+            DBBuildList.id == build_list_id
+        ),
+    )
+    return _check(
+        "Build List",
+        build_list_id,
+        build_list,
+        owner_id,
+        current_user,
+        logger,
+        not_found_detail,
+        authorization_detail,
+    )
+
+
+async def verify_part_ownership(
+    part_id: int,
+    db: AsyncSession,
+    current_user: TokenUser,
+    logger: logging.Logger,
+    not_found_detail: str | None = None,
+    authorization_detail: str | None = None,
+) -> DBPart:
+    """Return the part if it belongs to the current user; raise 404 or 403 otherwise."""
+    part, owner_id = await _lookup(
+        db,
+        "part",
+        part_id,
+        select(DBPart, DBPart.owner_id).where(DBPart.id == part_id),
+    )
+    return _check(
+        "Part",
+        part_id,
+        part,
+        owner_id,
+        current_user,
+        logger,
+        not_found_detail,
+        authorization_detail,
+    )
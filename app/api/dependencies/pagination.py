@@ -0,0 +1,176 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.config import settings
+
+# Keyset pagination for the listing routes. Rows come back in id order and the
+# cursor carries the last id served, so every page is an index range scan
+# (WHERE <parent> = :x AND id > :after ORDER BY id LIMIT n), however deep the
+# client pages. Listings sorted by another column page on (column, id) the same
+# way (see paginate_sorted). Bodies stay plain lists; the cursor and the
+# optional total travel in response headers.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+@dataclass
+class PageParams:
+    limit: int
+    after_id: Optional[int] = None
+    include_total: bool = False
+    # Everything the cursor carries, for orderings other than by id
+    position: Dict[str, Any] = field(default_factory=dict)
+
+
+def encode_cursor(last_id: int, **position: Any) -> str:
+    """
+    Opaque cursor for the page after the row with id `last_id`. Orderings
+    other than by id pass the last row's sort key in `position`.
+    """
+    payload = json.dumps({"after": last_id, **position}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor_position(cursor: str) -> Dict[str, Any]:
+    """Everything encode_cursor stored; raises 400 if the cursor was not made by it."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        position = None
+    if not isinstance(position, dict) or not isinstance(position.get("after"), int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+
+def decode_cursor(cursor: str) -> int:
+    """Id to continue after; raises 400 if the cursor was not made by encode_cursor."""
+    return decode_cursor_position(cursor)["after"]
+
+
+def page_params(
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = Query(
+        None, description=f"The previous page's {NEXT_CURSOR_HEADER} header"
+    ),
+    include_total: bool = Query(
+        False, description=f"Add an approximate {TOTAL_COUNT_HEADER} header"
+    ),
+) -> PageParams:
+    position = decode_cursor_position(cursor) if cursor else {}
+    return PageParams(
+        limit=limit,
+        after_id=position.get("after"),
+        include_total=include_total,
+        position=position,
+    )
+
+
+async def approximate_count(db: AsyncSession, stmt: Select) -> int:
+    """
+    Number of rows `stmt` returns: the planner's estimate on Postgres, which
+    costs no scan, and an exact count elsewhere.
+    """
+    connection = await db.connection()
+    if connection.dialect.name == "postgresql":
+        compiled = stmt.compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+        plan = (
+            await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return await db.scalar(
+        select(func.count()).select_from(stmt.order_by(None).subquery())
+    )
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    id_column: InstrumentedAttribute,
+    page: PageParams,
+    response: Response,
+) -> Sequence[Any]:
+    """Run one page of `stmt` in `id_column` order and set the paging headers."""
+    if page.include_total:
+        response.headers[TOTAL_COUNT_HEADER] = str(await approximate_count(db, stmt))
+    if page.after_id is not None:
+        stmt = stmt.where(id_column > page.after_id)
+    # One row beyond the page tells whether another page follows
+    rows = (await db.scalars(stmt.order_by(id_column).limit(page.limit + 1))).all()
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            getattr(rows[-1], id_column.key)
+        )
+    return rows
+
+
+async def paginate_sorted(
+    db: AsyncSession,
+    stmt: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    page: PageParams,
+    response: Response,
+    descending: bool = False,
+) -> Sequence[Any]:
+    """
+    Run one page of `stmt` ordered by the nullable `sort_column`, ties broken
+    by `id_column` in the same direction, and set the paging headers. Rows
+    without a value come last, in id order, in either direction. Each query is
+    a range scan of an index on (<parent>, sort_column, id): one over the
+    values, then, once those run out, one over the NULLs.
+    """
+    sort_key = sort_column.key
+    if page.after_id is not None and (
+        sort_key not in page.position
+        or not isinstance(page.position[sort_key], (int, float, type(None)))
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.include_total:
+        response.headers[TOTAL_COUNT_HEADER] = str(await approximate_count(db, stmt))
+
+    rows = []
+    after_value = page.position.get(sort_key)
+    if page.after_id is None or after_value is not None:
+        values = stmt.where(sort_column.is_not(None))
+        position = tuple_(sort_column, id_column)
+        if page.after_id is not None:
+            after = tuple_(after_value, page.after_id)
+            values = values.where(position < after if descending else position > after)
+        order = (
+            (sort_column.desc(), id_column.desc())
+            if descending
+            else (sort_column, id_column)
+        )
+        # One row beyond the page tells whether another page follows
+        rows = (await db.scalars(values.order_by(*order).limit(page.limit + 1))).all()
+    if len(rows) <= page.limit:
+        nulls = stmt.where(sort_column.is_(None))
+        if page.after_id is not None and after_value is None:
+            nulls = nulls.where(id_column > page.after_id)
+        rows += (
+            await db.scalars(
+                nulls.order_by(id_column).limit(page.limit + 1 - len(rows))
+            )
+        ).all()
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            getattr(rows[-1], id_column.key),
+            **{sort_key: getattr(rows[-1], sort_key)},
+        )
+    return rows
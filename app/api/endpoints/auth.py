@@ -1,37 +1,121 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response, Body, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    Response,
+    Body,
+    Query,
+    Cookie,
+    Request,
+)
 from fastapi.responses import RedirectResponse  # Add this import
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from jose import JWTError, jwt
+from typing import Optional
+import ipaddress
+import logging
+from jose import JWTError
 
 from app.db.session import get_db
 from app.api.models.user import User as DBUser
 from app.api.schemas.user import UserRead
 from app.api.schemas.auth import NewPassword  # Added this import
 from app.api.dependencies.auth import (
-    verify_password,
+    ACCESS_TOKEN_TYPE,
+    REFRESH_TOKEN_TYPE,
+    clear_auth_cookies,
     create_access_token,
-    get_password_hash,
-)  # Added get_password_hash
+    decode_token,
+    read_token,
+    set_auth_cookies,
+)
+from app.api.services.email_outbox import enqueue_email
+from app.api.services.password_hashing import password_hasher
+from app.api.services.rate_limiting import rate_limiter
+from app.api.services.token_revocation import revocation_store
+from app.api.services.user_cache import user_cache
 from app.core.config import settings
-from app.core.email import send_email
+from app.core.logging import get_logger
 
 router = APIRouter()
 
 
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(
+        ip in ipaddress.ip_network(cidr) for cidr in settings.TRUSTED_PROXY_CIDRS
+    )
+
+
+def _client_ip(request: Request) -> str:
+    """
+    The address per-IP rate limits are keyed on. Behind the ingress every peer
+    is the ingress itself, so X-Forwarded-For is read right to left past the
+    trusted proxies; anything left of the first other address is client-supplied.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(peer):
+        return peer
+    forwarded = ",".join(request.headers.getlist("x-forwarded-for"))
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+async def _enforce_email_rate_limit(purpose: str, email: str, request: Request):
+    """Throttle endpoints that send email, per address and per client IP."""
+    window = settings.EMAIL_RATE_LIMIT_WINDOW_SECONDS
+    await rate_limiter.enforce(
+        (
+            f"{purpose}:email:{email.lower()}",
+            settings.EMAIL_RATE_LIMIT_PER_ADDRESS,
+            window,
+        ),
+        (
+            f"{purpose}:ip:{_client_ip(request)}",
+            settings.EMAIL_RATE_LIMIT_PER_IP,
+            window,
+        ),
+    )
+
+
 @router.post("/token", response_model=UserRead)
 async def login_for_access_token(
+    request: Request,
     response: Response,  # Inject the Response object
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
-    Authenticate user, set JWT token in an HTTP-only cookie, and return user details.
+    Authenticate user, set access and refresh JWTs in HTTP-only cookies, and return user details.
     Takes form data: username and password.
     """
-    user = db.query(DBUser).filter(DBUser.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # Throttle before any database or bcrypt work
+    window = settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS
+    await rate_limiter.enforce(
+        (
+            f"login:user:{form_data.username.lower()}",
+            settings.LOGIN_RATE_LIMIT_PER_USERNAME,
+            window,
+        ),
+        (f"login:ip:{_client_ip(request)}", settings.LOGIN_RATE_LIMIT_PER_IP, window),
+    )
+    user = await db.scalar(
+        select(DBUser)
+        .where(DBUser.username == form_data.username)
+        .execution_options(populate_existing=True)  # never a cached, partial user
+    )
+    if not user or not await password_hasher.verify(
+        form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -42,27 +126,62 @@ async def login_for_access_token(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
 
-    access_token_data = {"sub": user.username}
-    access_token = create_access_token(data=access_token_data)
-
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,  # Crucial for security
-        max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # Cookie expiry in seconds
-        path="/",  # Cookie available for all paths
-        samesite="lax",  # Recommended for CSRF protection balance
-        secure=False,  # TODO: Set to True in production if using HTTPS
-    )
+    set_auth_cookies(response, user)
     return user  # Return user information
 
 
+@router.post("/refresh", response_model=UserRead)
+async def refresh_access_token(
+    response: Response,
+    refresh_token: Optional[str] = Cookie(None),  # Read "refresh_token" cookie
+    db: AsyncSession = Depends(get_db),
+    logger: logging.Logger = Depends(get_logger),
+):
+    """
+    Exchange the refresh token cookie for a new access/refresh pair.
+    The refresh token is rotated on every call.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    token_user = read_token(refresh_token, REFRESH_TOKEN_TYPE)
+    user = (
+        await db.get(DBUser, token_user.id, populate_existing=True)
+        if token_user
+        else None
+    )
+    # A token_version mismatch means the password changed or sessions were revoked
+    if user is None or user.token_version != token_user.token_version:
+        raise credentials_exception
+    # Consume the token in the backend itself: of concurrent refreshes on any
+    # replica, only one claims it
+    if not await revocation_store.claim(token_user.jti, token_user.expires_at):
+        # Refresh tokens are single-use; a replay suggests the token leaked,
+        # so sign out every session of this user.
+        logger.warning(f"Reuse of revoked refresh token for user {user.id}")
+        user.token_version += 1
+        await db.commit()
+        user_cache.invalidate_user(user.id)
+        raise credentials_exception
+    if user.disabled:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+        )
+
+    set_auth_cookies(response, user)
+    return user
+
+
 @router.post("/verify-email")
 async def verify_email(
+    request: Request,
     email: str = Body(..., embed=True),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    user = db.query(DBUser).filter(DBUser.email == email).first()
+    await _enforce_email_rate_limit("verify-email", email, request)
+    user = await db.scalar(select(DBUser).where(DBUser.email == email))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user.email_verified:
@@ -72,27 +191,27 @@ async def verify_email(
         expires_delta=timedelta(hours=1),
     )
     verify_url = f"http://localhost:8000/api/auth/verify-email/confirm?token={token}"
-    send_email(
+    enqueue_email(
+        db,
         user.email,
         settings.SENDGRID_VERIFY_EMAIL_TEMPLATE_ID,
         {"verify_email_link": verify_url},
     )
+    await db.commit()
     return {"message": "Verification email sent"}
 
 
 @router.get("/verify-email/confirm")
 async def verify_email_confirm(
     token: str = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     if settings.DEBUG:
         frontend_base_url = "http://localhost:4000/verify-email/confirm"
     else:
         frontend_base_url = "http://carmodpicker.webbpulse.com/verify-email/confirm"  # Replace with your production frontend URL
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.HASH_ALGORITHM]
-        )
+        payload = decode_token(token)
         email = payload.get("sub")
         purpose = payload.get("purpose")
         if not email or purpose != "verify_email":
@@ -108,21 +227,28 @@ async def verify_email_confirm(
         )
         return RedirectResponse(url=redirect_url)
 
-    user = db.query(DBUser).filter(DBUser.email == email).first()
-    if not user:
-        # User not found
-        redirect_url = f"{frontend_base_url}?status=error&message=User+not+found"
-        return RedirectResponse(url=redirect_url)
-
-    if user.email_verified:
-        # Email already verified
-        redirect_url = f"{frontend_base_url}?status=info&message=Email+already+verified"
+    # Proceed with email verification; a single UPDATE in the common case
+    user_id = await db.scalar(
+        update(DBUser)
+        .where(DBUser.email == email, DBUser.email_verified.is_(False))
+        .values(email_verified=True)
+        .returning(DBUser.id)
+    )
+    if user_id is None:
+        already_verified = await db.scalar(
+            select(DBUser.email_verified).where(DBUser.email == email)
+        )
+        if already_verified is None:
+            # User not found
+            redirect_url = f"{frontend_base_url}?status=error&message=User+not+found"
+        else:
+            # Email already verified
+            redirect_url = (
+                f"{frontend_base_url}?status=info&message=Email+already+verified"
+            )
         return RedirectResponse(url=redirect_url)
-
-    # Proceed with email verification
-    user.email_verified = True
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    user_cache.invalidate_user(user_id)
 
     # Successful verification
     redirect_url = (
@@ -133,10 +259,12 @@ async def verify_email_confirm(
 
 @router.post("/forgot-password")
 async def reset_password(
+    request: Request,
     email: str = Body(..., embed=True),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    user = db.query(DBUser).filter(DBUser.email == email).first()
+    await _enforce_email_rate_limit("forgot-password", email, request)
+    user = await db.scalar(select(DBUser).where(DBUser.email == email))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     token = create_access_token(
@@ -150,11 +278,13 @@ async def reset_password(
         frontend_reset_url_base = "https://carmodpicker.webbpulse.com/forgot-password/confirm"  # Replace with your production frontend URL
 
     new_password_frontend_url = f"{frontend_reset_url_base}?token={token}"
-    send_email(
+    enqueue_email(
+        db,
         user.email,
         settings.SENDGRID_RESET_PASSWORD_TEMPLATE_ID,
         {"reset_password_link": new_password_frontend_url},
     )
+    await db.commit()
     return {"message": "Password reset email sent"}
 
 
@@ -162,12 +292,10 @@ async def reset_password(
 async def reset_password_confirm(
     token: str = Query(...),
     new_password_data: NewPassword = Body(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.HASH_ALGORITHM]
-        )
+        payload = decode_token(token)
         email = payload.get("sub")
         purpose = payload.get("purpose")
         if email is None or purpose != "reset_password":
@@ -181,22 +309,40 @@ async def reset_password_confirm(
             detail="Invalid or expired token",
         )
 
-    user = db.query(DBUser).filter(DBUser.email == email).first()
-    if not user:
+    hashed_password = await password_hasher.hash(new_password_data.password)
+    user_id = await db.scalar(
+        update(DBUser)
+        .where(DBUser.email == email)
+        .values(
+            hashed_password=hashed_password,
+            token_version=DBUser.token_version + 1,  # Sign out every existing session
+        )
+        .returning(DBUser.id)
+    )
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-
-    user.hashed_password = get_password_hash(new_password_data.password)
-    db.commit()
+    await db.commit()
+    user_cache.invalidate_user(user_id)
     return {"message": "Password has been reset successfully"}
 
 
 @router.post("/logout")
-async def logout(response: Response):
+async def logout(
+    response: Response,
+    access_token: Optional[str] = Cookie(None),
+    refresh_token: Optional[str] = Cookie(None),
+):
     """
-    Invalidate the user's session by clearing the access token cookie.
+    Invalidate the user's session: revoke both tokens server-side and clear their cookies.
     """
-    response.delete_cookie("access_token", path="/")
+    for token_user in (
+        read_token(access_token, ACCESS_TOKEN_TYPE),
+        read_token(refresh_token, REFRESH_TOKEN_TYPE),
+    ):
+        if token_user is not None:
+            await revocation_store.revoke(token_user.jti, token_user.expires_at)
+    clear_auth_cookies(response)
     return {"message": "Successfully logged out"}
@@ -1,45 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 import logging
 
 from app.core.logging import get_logger
 from app.db.session import get_db
 from app.api.models.build_list import BuildList as DBBuildList
 from app.api.models.car import Car as DBCar
-from app.api.models.user import User as DBUser
-from app.api.schemas.build_list import BuildListCreate, BuildListRead, BuildListUpdate
-from app.api.dependencies.auth import get_current_user
-
-
-# Shared function to verify car ownership
-async def _verify_car_ownership(
-    car_id: int,
-    db: Session,
-    current_user: DBUser,
-    logger: logging.Logger,
-    car_not_found_detail: str | None = None,
-    authorization_detail: str | None = None,
-) -> DBCar:
-    db_car = db.query(DBCar).filter(DBCar.id == car_id).first()
-    if not db_car:
-        detail = car_not_found_detail or f"Car with id {car_id} not found"
-        logger.warning(
-            f"Car ownership verification failed: {detail} (User: {current_user.id if current_user else 'Unknown'})"
-        )
-        raise HTTPException(status_code=404, detail=detail)
-
-    if db_car.user_id != current_user.id:
-        detail = (
-            authorization_detail
-            or "Not authorized to perform this action on the specified car"
-        )
-        logger.warning(
-            f"Car ownership verification failed: {detail} (User: {current_user.id}, Car Owner: {db_car.user_id})"
-        )
-        raise HTTPException(status_code=403, detail=detail)
-
-    return db_car
-
+from app.api.schemas.token import TokenUser
+from app.api.schemas.build_list import (
+    BuildListCreate,
+    BuildListFull,
+    BuildListRead,
+    BuildListUpdate,
+)
+from app.api.dependencies.auth import get_current_token_user
+from app.api.dependencies.ownership import (
+    verify_build_list_ownership,
+    verify_car_ownership,
+)
+from app.api.dependencies.pagination import PageParams, page_params, paginate
 
 router = APIRouter()
 
@@ -54,24 +35,26 @@ router = APIRouter()
 )
 async def create_build_list(
     build_list: BuildListCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_current_token_user),
 ):
     # Verify car ownership
-    db_car = await _verify_car_ownership(
+    db_car = await verify_car_ownership(
         car_id=build_list.car_id,
         db=db,
         current_user=current_user,
         logger=logger,
-        car_not_found_detail="Car not found",
+        not_found_detail="Car not found",
         authorization_detail="Not authorized to create a build list for this car",
     )
 
-    db_build_list = DBBuildList(**build_list.model_dump())
-    db.add(db_build_list)
-    db.commit()
-    db.refresh(db_build_list)
+    db_build_list = await db.scalar(
+        insert(DBBuildList)
+        .values(**build_list.model_dump(), owner_id=db_car.user_id)
+        .returning(DBBuildList)
+    )
+    await db.commit()
     logger.info(msg=f"Build List added to database: {db_build_list}")
     return db_build_list
 
@@ -86,11 +69,11 @@ async def create_build_list(
 )
 async def read_build_list(
     build_list_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
 ):
-    db_build_list = (
-        db.query(DBBuildList).filter(DBBuildList.id == build_list_id).first()
+    db_build_list = await db.scalar(
+        select(DBBuildList).where(DBBuildList.id == build_list_id)
     )  # Query the database
     if db_build_list is None:
         raise HTTPException(status_code=404, detail="Build List not found")
@@ -99,6 +82,38 @@ async def read_build_list(
     return db_build_list
 
 
+@router.get(
+    "/{build_list_id}/full",
+    response_model=BuildListFull,
+    responses={404: {"description": "Build List not found"}},
+)
+async def read_build_list_full(
+    build_list_id: int,
+    db: AsyncSession = Depends(get_db),
+    logger: logging.Logger = Depends(get_logger),
+):
+    """
+    Retrieve a build list with its car and all of its parts in one response.
+    Two queries however many parts there are: the build list joined to its
+    car, then the parts by build list id.
+    """
+    db_build_list = await db.scalar(
+        select(DBBuildList)
+        .where(DBBuildList.id == build_list_id)
+        .options(joinedload(DBBuildList.car), selectinload(DBBuildList.parts))
+        # Reload even objects the session already holds; the rollups and the
+        # parts collection may have changed since they were loaded
+        .execution_options(populate_existing=True)
+    )
+    if db_build_list is None:
+        raise HTTPException(status_code=404, detail="Build List not found")
+
+    logger.info(
+        msg=f"Build List retrieved with {len(db_build_list.parts)} parts: {db_build_list}"
+    )
+    return db_build_list
+
+
 @router.get(
     "/car/{car_id}",
     response_model=list[BuildListRead],
@@ -107,13 +122,22 @@ async def read_build_list(
 )
 async def read_build_lists_by_car(
     car_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
 ):
     """
-    Retrieve all build lists associated with a specific car.
+    Retrieve the build lists of a specific car, one page at a time in id order.
+    Pass the X-Next-Cursor response header back as `cursor` for the next page.
     """
-    build_lists = db.query(DBBuildList).filter(DBBuildList.car_id == car_id).all()
+    build_lists = await paginate(
+        db,
+        select(DBBuildList).where(DBBuildList.car_id == car_id),
+        DBBuildList.id,
+        page,
+        response,
+    )
     if not build_lists:
         logger.info(f"No Build Lists found for car with id {car_id}")
     else:
@@ -134,22 +158,17 @@ async def read_build_lists_by_car(
 async def update_build_list(
     build_list_id: int,
     build_list: BuildListUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_current_token_user),
 ):
-    db_build_list = (
-        db.query(DBBuildList).filter(DBBuildList.id == build_list_id).first()
-    )
-    if db_build_list is None:
-        raise HTTPException(status_code=404, detail="Build List not found")
-
-    # Verify car ownership for the build list
-    await _verify_car_ownership(
-        car_id=int(db_build_list.car_id),
+    # Verify ownership of the build list
+    db_build_list = await verify_build_list_ownership(
+        build_list_id=build_list_id,
         db=db,
         current_user=current_user,
         logger=logger,
+        not_found_detail="Build List not found",
         authorization_detail="Not authorized to update this build list",
     )
 
@@ -157,26 +176,96 @@ async def update_build_list(
     update_data = build_list.model_dump(exclude_unset=True)
     if "car_id" in update_data and update_data["car_id"] != db_build_list.car_id:
         new_car_id = update_data["car_id"]
-        await _verify_car_ownership(
+        # Both cars belong to the caller, so owner_id stays as it is
+        await verify_car_ownership(
             car_id=new_car_id,
             db=db,
             current_user=current_user,
             logger=logger,
-            car_not_found_detail=f"New car with id {new_car_id} not found",
+            not_found_detail=f"New car with id {new_car_id} not found",
             authorization_detail="Not authorized to associate build list with the new car",
         )
 
-    # Update model fields
-    for key, value in update_data.items():
-        setattr(db_build_list, key, value)
-
-    db.add(db_build_list)
-    db.commit()
-    db.refresh(db_build_list)
+    if update_data:
+        db_build_list = await db.scalar(
+            update(DBBuildList)
+            .where(DBBuildList.id == build_list_id)
+            .values(**update_data)
+            .returning(DBBuildList)
+        )
+        await db.commit()
     logger.info(msg=f"Build List updated in database: {db_build_list}")
     return db_build_list
 
 
+@router.patch(
+    "/{build_list_id}",
+    response_model=BuildListRead,
+    responses={
+        404: {"description": "Build List not found or New Car not found"},
+        403: {
+            "description": "Not authorized to update this build list or associate it with the new car"
+        },
+    },
+)
+async def patch_build_list(
+    build_list_id: int,
+    build_list: BuildListUpdate,
+    db: AsyncSession = Depends(get_db),
+    logger: logging.Logger = Depends(get_logger),
+    current_user: TokenUser = Depends(get_current_token_user),
+):
+    """
+    Update the given fields of a build list in one statement. Ownership of
+    the build list, and of the new car when moving it, are conditions of the
+    UPDATE; only a miss costs further queries (to tell 404 from 403).
+    """
+    update_data = build_list.model_dump(exclude_unset=True)
+    db_build_list = None
+    if update_data:
+        stmt = update(DBBuildList).where(
+            DBBuildList.id == build_list_id,
+            DBBuildList.owner_id == current_user.id,
+        )
+        if "car_id" in update_data:
+            # Both cars belong to the caller, so owner_id stays as it is
+            stmt = stmt.where(
+                select(DBCar.id)
+                .where(
+                    DBCar.id == update_data["car_id"],
+                    DBCar.user_id == current_user.id,
+                )
+                .exists()
+            )
+        db_build_list = await db.scalar(
+            stmt.values(**update_data).returning(DBBuildList)
+        )
+    if db_build_list is None:
+        db_build_list = await verify_build_list_ownership(
+            build_list_id=build_list_id,
+            db=db,
+            current_user=current_user,
+            logger=logger,
+            not_found_detail="Build List not found",
+            authorization_detail="Not authorized to update this build list",
+        )
+        if "car_id" in update_data:
+            new_car_id = update_data["car_id"]
+            await verify_car_ownership(
+                car_id=new_car_id,
+                db=db,
+                current_user=current_user,
+                logger=logger,
+                not_found_detail=f"New car with id {new_car_id} not found",
+                authorization_detail="Not authorized to associate build list with the new car",
+            )
+        if update_data:  # the UPDATE missed a row we own: it changed in between
+            raise HTTPException(status_code=404, detail="Build List not found")
+    await db.commit()
+    logger.info(msg=f"Build List patched in database: {db_build_list}")
+    return db_build_list
+
+
 @router.delete(
     "/{build_list_id}",
     response_model=BuildListRead,
@@ -187,30 +276,30 @@ async def update_build_list(
 )
 async def delete_build_list(
     build_list_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_current_token_user),
 ):
-    db_build_list = (
-        db.query(DBBuildList).filter(DBBuildList.id == build_list_id).first()
-    )
-    if db_build_list is None:
-        raise HTTPException(status_code=404, detail="Build List not found")
-
-    # Verify car ownership for the build list
-    await _verify_car_ownership(
-        car_id=int(db_build_list.car_id),
+    # Verify ownership of the build list
+    await verify_build_list_ownership(
+        build_list_id=build_list_id,
         db=db,
         current_user=current_user,
         logger=logger,
+        not_found_detail="Build List not found",
         authorization_detail="Not authorized to delete this build list",
     )
 
-    # Convert the SQLAlchemy model to the Pydantic model *before* deleting
+    # Its parts go with it through ON DELETE CASCADE
+    db_build_list = await db.scalar(
+        delete(DBBuildList)
+        .where(DBBuildList.id == build_list_id)
+        .returning(DBBuildList)
+    )
+    if db_build_list is None:  # deleted by a concurrent request since the check
+        raise HTTPException(status_code=404, detail="Build List not found")
     deleted_build_list_data = BuildListRead.model_validate(db_build_list)
-
-    db.delete(db_build_list)
-    db.commit()
+    await db.commit()
     # Log the deleted build_list data
     logger.info(msg=f"Build List deleted from database: {deleted_build_list_data}")
     return deleted_build_list_data
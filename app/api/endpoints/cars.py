@@ -1,38 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 from typing import List  # Add this import
 
+from app.core.config import settings
 from app.core.logging import get_logger
 from app.db.session import get_db
 from app.api.models.car import Car as DBCar
 from app.api.schemas.car import CarCreate, CarRead, CarUpdate
-from app.api.dependencies.auth import get_current_user
-from app.api.models.user import User as DBUser
-
-
-# Helper function to get and verify car ownership
-async def _verify_car_ownership(
-    car_id: int,
-    db: Session,
-    current_user: DBUser,
-    logger: logging.Logger,
-    not_found_detail: str = "Car not found",
-    authorization_detail: str = "Not authorized to perform this action on this car",
-) -> DBCar:
-    db_car = db.query(DBCar).filter(DBCar.id == car_id).first()
-    if not db_car:
-        logger.warning(f"Car with id {car_id} not found. User: {current_user.id}")
-        raise HTTPException(status_code=404, detail=not_found_detail)
-
-    if db_car.user_id != current_user.id:
-        logger.warning(
-            f"Authorization failed for car id {car_id}. User: {current_user.id}, Car Owner: {db_car.user_id}"
-        )
-        raise HTTPException(status_code=403, detail=authorization_detail)
-
-    return db_car
-
+from app.api.dependencies.auth import get_current_token_user
+from app.api.dependencies.ownership import verify_car_ownership
+from app.api.dependencies.pagination import PageParams, page_params, paginate
+from app.api.services.car_search import car_search_index, search_cars
+from app.api.schemas.token import TokenUser
 
 router = APIRouter()
 
@@ -42,23 +24,57 @@ router = APIRouter()
     response_model=CarRead,
     responses={
         400: {"description": "Car already exists"},
+        401: {"description": "User no longer exists"},
         403: {"description": "Not authorized to create a car"},
     },
 )
 async def create_car(
     car: CarCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_current_token_user),
 ):
-    db_car = DBCar(**car.model_dump(), user_id=current_user.id)
-    db.add(db_car)
-    db.commit()
-    db.refresh(db_car)
+    # INSERT ... RETURNING hands back the stored row; no refresh query needed
+    try:
+        db_car = await db.scalar(
+            insert(DBCar)
+            .values(**car.model_dump(), user_id=current_user.id)
+            .returning(DBCar)
+        )
+        await db.commit()
+    except IntegrityError:
+        # The only foreign key is the owner: the token outlived its user
+        await db.rollback()
+        raise HTTPException(
+            status_code=401,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    car_search_index.invalidate()
     logger.info(msg=f"Car added to database: {db_car}")
     return db_car
 
 
+@router.get(
+    "/search",
+    response_model=List[CarRead],
+    tags=["cars"],
+)
+async def search_cars_route(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_db),
+    logger: logging.Logger = Depends(get_logger),
+):
+    """
+    Search cars by make and model, tolerating typos ("civc" finds Civic),
+    most similar first.
+    """
+    results = await search_cars(db, q, limit)
+    logger.info(f"Car search for {q!r} returned {len(results)} cars")
+    return [car for car, _ in results]
+
+
 @router.get(
     "/{car_id}",
     response_model=CarRead,
@@ -69,11 +85,11 @@ async def create_car(
 )
 async def read_car(
     car_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
 ):
 
-    db_car = db.query(DBCar).filter(DBCar.id == car_id).first()
+    db_car = await db.scalar(select(DBCar).where(DBCar.id == car_id))
     if db_car is None:
         raise HTTPException(status_code=404, detail="Car not found")
 
@@ -88,13 +104,18 @@ async def read_car(
 )
 async def read_cars_by_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
 ):
     """
-    Retrieve all cars owned by a specific user.
+    Retrieve the cars owned by a specific user, one page at a time in id order.
+    Pass the X-Next-Cursor response header back as `cursor` for the next page.
     """
-    cars = db.query(DBCar).filter(DBCar.user_id == user_id).all()
+    cars = await paginate(
+        db, select(DBCar).where(DBCar.user_id == user_id), DBCar.id, page, response
+    )
     if not cars:
         logger.info(f"No cars found for user_id: {user_id}")
     else:
@@ -113,30 +134,79 @@ async def read_cars_by_user(
 async def update_car(
     car_id: int,
     car: CarUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_current_token_user),
 ):
-    db_car = await _verify_car_ownership(
+    db_car = await verify_car_ownership(
         car_id=car_id,
         db=db,
         current_user=current_user,
         logger=logger,
+        not_found_detail="Car not found",
         authorization_detail="Not authorized to update this car",
     )
 
-    # Update model fields
     update_data = car.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_car, key, value)
-
-    db.add(db_car)
-    db.commit()
-    db.refresh(db_car)
+    if update_data:
+        db_car = await db.scalar(
+            update(DBCar)
+            .where(DBCar.id == car_id)
+            .values(**update_data)
+            .returning(DBCar)
+        )
+        await db.commit()
+        car_search_index.invalidate()
     logger.info(msg=f"Car updated in database: {db_car}")
     return db_car
 
 
+@router.patch(
+    "/{car_id}",
+    response_model=CarRead,
+    responses={
+        404: {"description": "Car not found"},
+        403: {"description": "Not authorized to update this car"},
+    },
+)
+async def patch_car(
+    car_id: int,
+    car: CarUpdate,
+    db: AsyncSession = Depends(get_db),
+    logger: logging.Logger = Depends(get_logger),
+    current_user: TokenUser = Depends(get_current_token_user),
+):
+    """
+    Update the given fields of a car in one statement: ownership is part of
+    the UPDATE's WHERE clause, and only a miss costs a second query (to tell
+    404 from 403).
+    """
+    update_data = car.model_dump(exclude_unset=True)
+    db_car = None
+    if update_data:
+        db_car = await db.scalar(
+            update(DBCar)
+            .where(DBCar.id == car_id, DBCar.user_id == current_user.id)
+            .values(**update_data)
+            .returning(DBCar)
+        )
+    if db_car is None:
+        db_car = await verify_car_ownership(
+            car_id=car_id,
+            db=db,
+            current_user=current_user,
+            logger=logger,
+            not_found_detail="Car not found",
+            authorization_detail="Not authorized to update this car",
+        )
+        if update_data:  # the UPDATE missed a row we own: it changed in between
+            raise HTTPException(status_code=404, detail="Car not found")
+    await db.commit()
+    car_search_index.invalidate()
+    logger.info(msg=f"Car patched in database: {db_car}")
+    return db_car
+
+
 @router.delete(
     "/{car_id}",
     response_model=CarRead,
@@ -147,23 +217,26 @@ async def update_car(
 )
 async def delete_car(
     car_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_current_token_user),
 ):
-    db_car = await _verify_car_ownership(
+    await verify_car_ownership(
         car_id=car_id,
         db=db,
         current_user=current_user,
         logger=logger,
+        not_found_detail="Car not found",
         authorization_detail="Not authorized to delete this car",
     )
 
-    # Convert the SQLAlchemy model to the Pydantic model *before* deleting
+    # Build lists and parts go with it through ON DELETE CASCADE
+    db_car = await db.scalar(delete(DBCar).where(DBCar.id == car_id).returning(DBCar))
+    if db_car is None:  # deleted by a concurrent request since the check
+        raise HTTPException(status_code=404, detail="Car not found")
     deleted_car_data = CarRead.model_validate(db_car)
-
-    db.delete(db_car)
-    db.commit()
+    await db.commit()
+    car_search_index.invalidate()
     # Log the deleted car data
     logger.info(msg=f"car deleted from database: {deleted_car_data}")
     return deleted_car_data
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+
+from app.api.dependencies.auth import verify_internal_token
+from app.core.metrics import collect_metrics
+
+# Not for the public: the ingress routes these paths like any other /api path
+router = APIRouter(dependencies=[Depends(verify_internal_token)])
+
+
+@router.get("/metrics")
+async def read_metrics():
+    """
+    Report in-process counters (queues, caches, pools) for the worker that serves the request.
+    """
+    return collect_metrics()
@@ -1,66 +1,95 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
+from typing import List, Literal
 
+from app.core.config import settings
 from app.core.logging import get_logger
 from app.db.session import get_db
-from app.api.models.part import Part as DBPart
-from app.api.models.car import Car as DBCar
-from app.api.models.user import User as DBUser
 from app.api.models.build_list import BuildList as DBBuildList
-from app.api.schemas.part import PartCreate, PartRead, PartUpdate
-from app.api.dependencies.auth import get_current_user
+from app.api.models.part import Part as DBPart
+from app.api.schemas.token import TokenUser
+from app.api.schemas.part import (
+    PartBulkCreateResult,
+    PartBulkError,
+    PartBulkSelection,
+    PartBulkSummary,
+    PartBulkUpdate,
+    PartCreate,
+    PartRead,
+    PartUpdate,
+)
+from app.api.dependencies.auth import get_current_token_user
+from app.api.dependencies.ownership import (
+    verify_build_list_ownership,
+    verify_part_ownership,
+)
+from app.api.dependencies.pagination import (
+    NEXT_CURSOR_HEADER,
+    PageParams,
+    decode_cursor_position,
+    encode_cursor,
+    page_params,
+    paginate,
+    paginate_sorted,
+)
+from app.api.services.part_search import search_parts
 
+router = APIRouter()
 
-# Shared function to verify build list ownership (via car)
-async def _verify_build_list_ownership(
-    build_list_id: int,
-    db: Session,
-    current_user: DBUser,
-    logger: logging.Logger,
-    build_list_not_found_detail: str | None = None,
-    authorization_detail: str | None = None,
-) -> DBBuildList:
-    db_build_list = (
-        db.query(DBBuildList).filter(DBBuildList.id == build_list_id).first()
-    )
+# Sort orders the part listing accepts: (column, descending), ties broken by id.
+# Each is served by a composite index starting with build_list_id:
+# ix_parts_build_list_id_id for "id", ix_parts_build_list_id_price_id for price.
+PART_SORTS = {
+    "id": (DBPart.id, False),
+    "price": (DBPart.price, False),
+    "-price": (DBPart.price, True),
+}
 
-    if not db_build_list:
-        detail = (
-            build_list_not_found_detail
-            or f"Build List with id {build_list_id} not found"
-        )
-        logger.warning(
-            f"Build list ownership verification failed: {detail} (User: {current_user.id if current_user else 'Unknown'})"
-        )
-        raise HTTPException(status_code=404, detail=detail)
-
-    # Assuming DBBuildList has a relationship 'car' which has a 'user_id'
-    if not hasattr(db_build_list, "car") or db_build_list.car is None:
-        # This case might indicate a data integrity issue or a build list not linked to a car
-        detail = f"Build List with id {build_list_id} is not associated with a car."
-        logger.error(
-            f"Build list ownership verification failed: {detail} (User: {current_user.id if current_user else 'Unknown'}, BuildListID: {build_list_id})"
-        )
-        raise HTTPException(
-            status_code=500,
-            detail="Internal server error: Build list data is inconsistent.",
-        )
 
-    if db_build_list.car.user_id != current_user.id:
-        detail = (
-            authorization_detail
-            or "Not authorized to perform this action on this build list"
-        )
-        logger.warning(
-            f"Build list ownership verification failed: {detail} (User: {current_user.id}, Car Owner: {db_build_list.car.user_id})"
-        )
-        raise HTTPException(status_code=403, detail=detail)
+def _part_filters(
+    part_type: str | None,
+    manufacturer: str | None,
+    min_price: int | None,
+    max_price: int | None,
+) -> list:
+    """WHERE clauses for the part filters the listing and bulk routes share."""
+    clauses = []
+    if part_type is not None:
+        clauses.append(DBPart.part_type == part_type)
+    if manufacturer is not None:
+        clauses.append(DBPart.manufacturer == manufacturer)
+    if min_price is not None:
+        clauses.append(DBPart.price >= min_price)
+    if max_price is not None:
+        clauses.append(DBPart.price <= max_price)
+    return clauses
 
-    return db_build_list
 
+def _bulk_selection(selection: PartBulkSelection, current_user: TokenUser) -> list:
+    """WHERE clauses for the caller's parts that `selection` picks."""
+    clauses = [
+        DBPart.owner_id == current_user.id,
+        *_part_filters(
+            selection.part_type,
+            selection.manufacturer,
+            selection.min_price,
+            selection.max_price,
+        ),
+    ]
+    if selection.ids is not None:
+        clauses.append(DBPart.id.in_(selection.ids))
+    if selection.build_list_id is not None:
+        clauses.append(DBPart.build_list_id == selection.build_list_id)
+    return clauses
 
-router = APIRouter()
+
+def _bulk_summary(selection: PartBulkSelection, ids: List[int]) -> PartBulkSummary:
+    missing = set(selection.ids or ()) - set(ids)
+    return PartBulkSummary(
+        affected=len(ids), ids=sorted(ids), missing_ids=sorted(missing)
+    )
 
 
 @router.post(
@@ -73,28 +102,221 @@ router = APIRouter()
 )
 async def create_part(
     part: PartCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_current_token_user),
 ):
-    # Verify ownership of the build list (via the car)
-    db_build_list = await _verify_build_list_ownership(
+    # Verify ownership of the build list
+    db_build_list = await verify_build_list_ownership(
         build_list_id=part.build_list_id,
         db=db,
         current_user=current_user,
         logger=logger,
-        build_list_not_found_detail="Build List not found",
+        not_found_detail="Build List not found",
         authorization_detail="Not authorized to add a part to this build list",
     )
 
-    db_part = DBPart(**part.model_dump())
-    db.add(db_part)
-    db.commit()
-    db.refresh(db_part)
+    db_part = await db.scalar(
+        insert(DBPart)
+        .values(**part.model_dump(), owner_id=db_build_list.owner_id)
+        .returning(DBPart)
+    )
+    await db.commit()
     logger.info(msg=f"part added to database: {db_part}")
     return db_part
 
 
+@router.post(
+    "/bulk",
+    response_model=PartBulkCreateResult,
+    tags=["parts"],
+)
+async def create_parts_bulk(
+    items: List[PartCreate] = Body(
+        ..., min_length=1, max_length=settings.PARTS_BULK_MAX_ITEMS
+    ),
+    db: AsyncSession = Depends(get_db),
+    logger: logging.Logger = Depends(get_logger),
+    current_user: TokenUser = Depends(get_current_token_user),
+):
+    """
+    Create many parts at once. Each item is a part as for POST /parts/, and
+    an invalid item fails the whole request. The items on the caller's build
+    lists are inserted together in one statement and returned in id order;
+    the others are reported in `errors` by their index in the request.
+    """
+    errors: List[PartBulkError] = []
+    parts = dict(enumerate(items))
+
+    # One ownership query for every build list the request mentions
+    build_list_ids = {part.build_list_id for part in parts.values()}
+    owners = {}
+    if build_list_ids:
+        owners = dict(
+            (
+                await db.execute(
+                    select(DBBuildList.id, DBBuildList.owner_id).where(
+                        DBBuildList.id.in_(build_list_ids)
+                    )
+                )
+            ).all()
+        )
+    rows = []
+    for index, part in parts.items():
+        owner_id = owners.get(part.build_list_id)
+        if owner_id is None:
+            errors.append(
+                PartBulkError(
+                    index=index, status_code=404, detail="Build List not found"
+                )
+            )
+        elif owner_id != current_user.id:
+            errors.append(
+                PartBulkError(
+                    index=index,
+                    status_code=403,
+                    detail="Not authorized to add a part to this build list",
+                )
+            )
+        else:
+            rows.append({**part.model_dump(), "owner_id": owner_id})
+
+    created = []
+    if rows:
+        # One multi-row INSERT ... RETURNING (asking for the rows back in
+        # parameter order would make SQLite insert them one at a time)
+        created = sorted(
+            await db.scalars(insert(DBPart).returning(DBPart), rows),
+            key=lambda part: part.id,
+        )
+        await db.commit()
+    logger.info(
+        msg=f"Bulk part create by user {current_user.id}: "
+        f"{len(created)} created, {len(errors)} rejected"
+    )
+    return {"created": created, "errors": errors}
+
+
+@router.patch(
+    "/bulk",
+    response_model=PartBulkSummary,
+    tags=["parts"],
+    responses={
+        404: {"description": "New Build List not found"},
+        403: {"description": "Not authorized to move parts to the new build list"},
+    },
+)
+async def update_parts_bulk(
+    request: PartBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    logger: logging.Logger = Depends(get_logger),
+    current_user: TokenUser = Depends(get_current_token_user),
+):
+    """
+    Apply the same changes to many of the caller's parts in one UPDATE: the
+    parts listed in `ids` and/or matching the filters. Setting build_list_id
+    in `changes` moves them; like PATCH /parts/{id}, ownership of the new
+    build list is a condition of the UPDATE, checked separately only on a miss.
+    """
+    changes = request.changes.model_dump(exclude_unset=True)
+    stmt = update(DBPart).where(*_bulk_selection(request, current_user))
+    if "build_list_id" in changes:
+        stmt = stmt.where(
+            select(DBBuildList.id)
+            .where(
+                DBBuildList.id == changes["build_list_id"],
+                DBBuildList.owner_id == current_user.id,
+            )
+            .exists()
+        )
+    ids = (await db.scalars(stmt.values(**changes).returning(DBPart.id))).all()
+    if not ids and "build_list_id" in changes:
+        new_build_list_id = changes["build_list_id"]
+        await verify_build_list_ownership(
+            build_list_id=new_build_list_id,
+            db=db,
+            current_user=current_user,
+            logger=logger,
+            not_found_detail=f"New Build List with id {new_build_list_id} not found",
+            authorization_detail="Not authorized to move parts to the new build list",
+        )
+    await db.commit()
+    logger.info(
+        msg=f"Bulk part update by user {current_user.id}: {len(ids)} parts updated"
+    )
+    return _bulk_summary(request, ids)
+
+
+@router.post(
+    "/bulk/delete",
+    response_model=PartBulkSummary,
+    tags=["parts"],
+)
+async def delete_parts_bulk(
+    selection: PartBulkSelection,
+    db: AsyncSession = Depends(get_db),
+    logger: logging.Logger = Depends(get_logger),
+    current_user: TokenUser = Depends(get_current_token_user),
+):
+    """
+    Delete many of the caller's parts in one DELETE: the parts listed in
+    `ids` and/or matching the filters.
+    """
+    ids = (
+        await db.scalars(
+            delete(DBPart)
+            .where(*_bulk_selection(selection, current_user))
+            .returning(DBPart.id)
+        )
+    ).all()
+    await db.commit()
+    logger.info(
+        msg=f"Bulk part delete by user {current_user.id}: {len(ids)} parts deleted"
+    )
+    return _bulk_summary(selection, ids)
+
+
+@router.get(
+    "/search",
+    response_model=list[PartRead],
+    tags=["parts"],
+    responses={400: {"description": "Invalid cursor"}},
+)
+async def search_parts_route(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    build_list_id: int | None = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: str | None = Query(
+        None, description=f"The previous page's {NEXT_CURSOR_HEADER} header"
+    ),
+    db: AsyncSession = Depends(get_db),
+    logger: logging.Logger = Depends(get_logger),
+):
+    """
+    Search parts by name, manufacturer, part number and description, best
+    matches first. Pass the X-Next-Cursor response header back as `cursor`
+    for the next page.
+    """
+    after = None
+    if cursor:
+        position = decode_cursor_position(cursor)
+        if not isinstance(position.get("score"), (int, float)):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = (position["score"], position["after"])
+
+    # One row beyond the page tells whether another page follows
+    results = await search_parts(db, q, limit + 1, after, build_list_id)
+    if len(results) > limit:
+        results = results[:limit]
+        last_part, last_score = results[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            last_part.id, score=last_score
+        )
+    logger.info(f"Part search for {q!r} returned {len(results)} parts")
+    return [part for part, _ in results]
+
+
 @router.get(
     "/{part_id}",
     response_model=PartRead,
@@ -105,11 +327,11 @@ async def create_part(
 )
 async def read_part(
     part_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
 ):
-    db_part = (
-        db.query(DBPart).filter(DBPart.id == part_id).first()
+    db_part = await db.scalar(
+        select(DBPart).where(DBPart.id == part_id)
     )  # Query the database
     if db_part is None:
         raise HTTPException(status_code=404, detail="part not found")
@@ -125,13 +347,36 @@ async def read_part(
 )
 async def read_parts_by_build_list(
     build_list_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    part_type: str | None = None,
+    manufacturer: str | None = None,
+    min_price: int | None = Query(None, ge=0),
+    max_price: int | None = Query(None, ge=0),
+    sort: Literal["id", "price", "-price"] = Query(
+        "id", description="id, price, or -price for most expensive first"
+    ),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
 ):
     """
-    Retrieve all parts for a specific build list by its ID.
+    Retrieve the parts of a specific build list, one page at a time, optionally
+    filtered by type, manufacturer and price range. Sorted by price, parts
+    without one come last. Pass the X-Next-Cursor response header back as
+    `cursor` for the next page, with the same filters and sort.
     """
-    parts = db.query(DBPart).filter(DBPart.build_list_id == build_list_id).all()
+    stmt = select(DBPart).where(
+        DBPart.build_list_id == build_list_id,
+        *_part_filters(part_type, manufacturer, min_price, max_price),
+    )
+
+    sort_column, descending = PART_SORTS[sort]
+    if sort_column is DBPart.id:
+        parts = await paginate(db, stmt, DBPart.id, page, response)
+    else:
+        parts = await paginate_sorted(
+            db, stmt, sort_column, DBPart.id, page, response, descending
+        )
     if not parts:
         logger.info(f"No parts found for Build List ID {build_list_id}")
     else:
@@ -152,20 +397,17 @@ async def read_parts_by_build_list(
 async def update_part(
     part_id: int,
     part: PartUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_current_token_user),
 ):
-    db_part = db.query(DBPart).filter(DBPart.id == part_id).first()
-    if db_part is None:
-        raise HTTPException(status_code=404, detail="part not found")
-
-    # Verify ownership of the current build list (via the car)
-    await _verify_build_list_ownership(
-        build_list_id=db_part.build_list_id,
+    # Verify ownership of the part
+    db_part = await verify_part_ownership(
+        part_id=part_id,
         db=db,
         current_user=current_user,
         logger=logger,
+        not_found_detail="part not found",
         authorization_detail="Not authorized to update this part",
     )
 
@@ -177,26 +419,94 @@ async def update_part(
         and update_data["build_list_id"] != db_part.build_list_id
     ):
         new_build_list_id = update_data["build_list_id"]
-        await _verify_build_list_ownership(
+        new_build_list = await verify_build_list_ownership(
             build_list_id=new_build_list_id,
             db=db,
             current_user=current_user,
             logger=logger,
-            build_list_not_found_detail=f"New Build List with id {new_build_list_id} not found",
+            not_found_detail=f"New Build List with id {new_build_list_id} not found",
             authorization_detail="Not authorized to move part to the new build list",
         )
+        # Keep the denormalized owner in step with the build list
+        update_data["owner_id"] = new_build_list.owner_id
 
-    # Update model fields
-    for key, value in update_data.items():
-        setattr(db_part, key, value)
-
-    db.add(db_part)
-    db.commit()
-    db.refresh(db_part)
+    if update_data:
+        db_part = await db.scalar(
+            update(DBPart)
+            .where(DBPart.id == part_id)
+            .values(**update_data)
+            .returning(DBPart)
+        )
+        await db.commit()
     logger.info(msg=f"part updated in database: {db_part}")
     return db_part
 
 
+@router.patch(
+    "/{part_id}",
+    response_model=PartRead,
+    responses={
+        404: {"description": "Part not found or New Build List not found"},
+        403: {
+            "description": "Not authorized to update this part or move part to the new build list"
+        },
+    },
+)
+async def patch_part(
+    part_id: int,
+    part: PartUpdate,
+    db: AsyncSession = Depends(get_db),
+    logger: logging.Logger = Depends(get_logger),
+    current_user: TokenUser = Depends(get_current_token_user),
+):
+    """
+    Update the given fields of a part in one statement. Ownership of the
+    part, and of the new build list when moving it, are conditions of the
+    UPDATE; only a miss costs further queries (to tell 404 from 403).
+    """
+    update_data = part.model_dump(exclude_unset=True)
+    db_part = None
+    if update_data:
+        stmt = update(DBPart).where(
+            DBPart.id == part_id, DBPart.owner_id == current_user.id
+        )
+        if "build_list_id" in update_data:
+            # Both build lists belong to the caller, so owner_id stays as it is
+            stmt = stmt.where(
+                select(DBBuildList.id)
+                .where(
+                    DBBuildList.id == update_data["build_list_id"],
+                    DBBuildList.owner_id == current_user.id,
+                )
+                .exists()
+            )
+        db_part = await db.scalar(stmt.values(**update_data).returning(DBPart))
+    if db_part is None:
+        db_part = await verify_part_ownership(
+            part_id=part_id,
+            db=db,
+            current_user=current_user,
+            logger=logger,
+            not_found_detail="part not found",
+            authorization_detail="Not authorized to update this part",
+        )
+        if "build_list_id" in update_data:
+            new_build_list_id = update_data["build_list_id"]
+            await verify_build_list_ownership(
+                build_list_id=new_build_list_id,
+                db=db,
+                current_user=current_user,
+                logger=logger,
+                not_found_detail=f"New Build List with id {new_build_list_id} not found",
+                authorization_detail="Not authorized to move part to the new build list",
+            )
+        if update_data:  # the UPDATE missed a row we own: it changed in between
+            raise HTTPException(status_code=404, detail="part not found")
+    await db.commit()
+    logger.info(msg=f"part patched in database: {db_part}")
+    return db_part
+
+
 @router.delete(
     "/{part_id}",
     response_model=PartRead,
@@ -207,28 +517,27 @@ async def update_part(
 )
 async def delete_part(
     part_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_current_token_user),
 ):
-    db_part = db.query(DBPart).filter(DBPart.id == part_id).first()
-    if db_part is None:
-        raise HTTPException(status_code=404, detail="part not found")
-
-    # Verify ownership of the build list (via the car)
-    await _verify_build_list_ownership(
-        build_list_id=db_part.build_list_id,
+    # Verify ownership of the part
+    await verify_part_ownership(
+        part_id=part_id,
         db=db,
         current_user=current_user,
         logger=logger,
+        not_found_detail="part not found",
         authorization_detail="Not authorized to delete this part",
     )
 
-    # Convert the SQLAlchemy model to the Pydantic model *before* deleting
+    db_part = await db.scalar(
+        delete(DBPart).where(DBPart.id == part_id).returning(DBPart)
+    )
+    if db_part is None:  # deleted by a concurrent request since the check
+        raise HTTPException(status_code=404, detail="part not found")
     deleted_part_data = PartRead.model_validate(db_part)
-
-    db.delete(db_part)
-    db.commit()
+    await db.commit()
     # Log the deleted part data
     logger.info(msg=f"part deleted from database: {deleted_part_data}")
     return deleted_part_data
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError  # Import IntegrityError
 import logging
+from typing import Optional, Sequence, Tuple
 
 from app.core.logging import get_logger
-from app.core.config import settings
 from app.db.session import get_db
 from app.api.models.user import User as DBUser
 from app.api.schemas.user import (
@@ -13,12 +14,25 @@ from app.api.schemas.user import (
     UserUpdate,
 )  # Ensure UserUpdate in app/api/schemas/user.py includes 'current_password: str'
 
+from app.api.schemas.garage import Garage
+from app.api.schemas.token import TokenUser
 from app.api.dependencies.auth import (
-    get_password_hash,
+    clear_auth_cookies,
     get_current_user,
-    verify_password,
-    create_access_token,
+    get_current_token_user,
+    set_auth_cookies,
 )
+from app.api.services.password_hashing import password_hasher
+from app.api.services.car_search import car_search_index
+from app.api.services.garage import (
+    BUILD_LIST_FIELDS,
+    CAR_FIELDS,
+    MAX_DEPTH,
+    PART_FIELDS,
+    load_garage,
+)
+from app.api.services.token_revocation import revocation_store
+from app.api.services.user_cache import user_cache
 
 router = APIRouter()
 
@@ -41,42 +55,46 @@ async def read_users_me_route(current_user: DBUser = Depends(get_current_user)):
 )
 async def create_user(
     user: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
 ):
     """
     Creates a new user in the database.
     """
 
-    # Checked if the user already exists
-    db_user_by_username = (
-        db.query(DBUser).filter(DBUser.username == user.username).first()
-    )
-    if db_user_by_username:
+    # Check if the user already exists, by username or email in one query
+    existing = (
+        await db.execute(
+            select(DBUser.username, DBUser.email).where(
+                or_(DBUser.username == user.username, DBUser.email == user.email)
+            )
+        )
+    ).all()
+    if any(row.username == user.username for row in existing):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered",
         )
-    db_user_by_email = db.query(DBUser).filter(DBUser.email == user.email).first()
-    if db_user_by_email:
+    if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
     # Hash the received password
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await password_hasher.hash(user.password)
 
-    # Create DBUser instance (excluding plain password)
-    db_user = DBUser(
-        username=user.username,
-        email=user.email,
-        hashed_password=hashed_password,
+    # Insert the user (excluding plain password) and read it back in one statement
+    db_user = await db.scalar(
+        insert(DBUser)
+        .values(
+            username=user.username,
+            email=user.email,
+            hashed_password=hashed_password,
+        )
+        .returning(DBUser)
     )
-
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
     logger.info(msg=f"User added to database: {db_user}")
     return db_user
 
@@ -91,11 +109,11 @@ async def create_user(
 )
 async def read_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
 ):
-    db_user = (
-        db.query(DBUser).filter(DBUser.id == user_id).first()
+    db_user = await db.scalar(
+        select(DBUser).where(DBUser.id == user_id)
     )  # Query the database
     if db_user is None:
         raise HTTPException(
@@ -106,6 +124,75 @@ async def read_user(
     return db_user
 
 
+def _fields(
+    value: Optional[str], allowed: Sequence[str], level: str
+) -> Tuple[str, ...]:
+    """Comma-separated field names from a query parameter; all of `allowed` if absent."""
+    if value is None:
+        return tuple(allowed)
+    fields = tuple(dict.fromkeys(f.strip() for f in value.split(",") if f.strip()))
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown {level} fields: {', '.join(unknown)}",
+        )
+    return fields
+
+
+@router.get(
+    "/{user_id}/garage",
+    response_model=Garage,
+    response_model_exclude_unset=True,
+    responses={
+        400: {"description": "Unknown field"},
+        404: {"description": "User not found"},
+    },
+)
+async def read_user_garage(
+    user_id: int,
+    depth: int = Query(
+        MAX_DEPTH,
+        ge=1,
+        le=MAX_DEPTH,
+        description="1: cars only, 2: with their build lists, 3: with their parts",
+    ),
+    car_fields: Optional[str] = Query(
+        None, description="Comma-separated car fields to return; all by default"
+    ),
+    build_list_fields: Optional[str] = Query(
+        None, description="Comma-separated build list fields; all by default"
+    ),
+    part_fields: Optional[str] = Query(
+        None, description="Comma-separated part fields; all by default"
+    ),
+    db: AsyncSession = Depends(get_db),
+    logger: logging.Logger = Depends(get_logger),
+):
+    """
+    Retrieve a user's cars with their build lists and parts in one response,
+    in a fixed number of queries (one per level). `depth` and the *_fields
+    parameters bound the payload; ids are always included.
+    """
+    snapshot = await load_garage(
+        db,
+        user_id,
+        depth,
+        car_fields=_fields(car_fields, CAR_FIELDS, "car"),
+        build_list_fields=_fields(build_list_fields, BUILD_LIST_FIELDS, "build list"),
+        part_fields=_fields(part_fields, PART_FIELDS, "part"),
+    )
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    logger.info(
+        msg=f"Garage retrieved for user {user_id}: {len(snapshot['cars'])} cars"
+    )
+    return snapshot
+
+
 @router.put(
     "/{user_id}",
     response_model=UserRead,
@@ -121,11 +208,16 @@ async def update_user(
     user_id: int,
     user: UserUpdate,  # Assume UserUpdate requires current_password if sensitive fields are changed
     response: Response,  # Inject the FastAPI Response object
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_current_token_user),
 ):
-    db_user = db.query(DBUser).filter(DBUser.id == user_id).first()
+    # populate_existing: hashed_password is never in the user cache
+    db_user = await db.scalar(
+        select(DBUser)
+        .where(DBUser.id == user_id)
+        .execution_options(populate_existing=True)
+    )
 
     if not db_user:
         logger.warning(f"Attempt to update non-existent user {user_id}.")
@@ -148,7 +240,7 @@ async def update_user(
 
     # current_password should be part of UserUpdate schema and validated by Pydantic if required
     # If current_password is in the payload, it MUST be correct.
-    if user.current_password and not verify_password(
+    if user.current_password and not await password_hasher.verify(
         user.current_password, db_user.hashed_password
     ):
         logger.warning(
@@ -162,54 +254,45 @@ async def update_user(
     update_data = user.model_dump(
         exclude_unset=True, exclude={"current_password"}
     )  # Exclude current_password from data to be saved
-    username_changed = False
-
-    if (
-        "username" in update_data
-        and update_data["username"] is not None
-        and update_data["username"] != db_user.username
-    ):
-        username_changed = True
-        # Note: IntegrityError handling below will catch duplicate usernames if the DB enforces it.
-        # For a more proactive check, you could query here, but it might be redundant.
+    # Password or account-status changes sign out the user's other sessions
+    revoke_sessions = False
 
     if "password" in update_data and update_data["password"]:
-        hashed_password = get_password_hash(update_data["password"])
-        db_user.hashed_password = hashed_password
+        hashed_password = await password_hasher.hash(update_data["password"])
         # Remove password from update_data to prevent trying to set it directly if not a model field
         del update_data["password"]
+        update_data["hashed_password"] = hashed_password
+        revoke_sessions = True
 
-    for field, value in update_data.items():
-        if value is not None:  # Ensure we only set fields that are explicitly provided
-            setattr(db_user, field, value)
+    if (
+        update_data.get("disabled") is not None
+        and update_data["disabled"] != db_user.disabled
+    ):
+        revoke_sessions = True
 
-    try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        logger.info(f"User {user_id} updated successfully by user {current_user.id}.")
+    # Ensure we only set fields that are explicitly provided
+    values = {field: value for field, value in update_data.items() if value is not None}
+    if revoke_sessions:
+        values["token_version"] = DBUser.token_version + 1
 
-        if username_changed:
-            logger.info(
-                f"Username for user {user_id} changed to '{db_user.username}'. Issuing new access token."
+    try:
+        if values:
+            db_user = await db.scalar(
+                update(DBUser)
+                .where(DBUser.id == user_id)
+                .values(**values)
+                .returning(DBUser)
             )
-            # Create a new access token with the new username
-            new_access_token_data = {"sub": db_user.username}
-            new_access_token = create_access_token(data=new_access_token_data)
+            await db.commit()
+        user_cache.invalidate_user(user_id)
+        logger.info(f"User {user_id} updated successfully by user {current_user.id}.")
 
-            # Set the new token in an HTTP-only cookie
-            response.set_cookie(
-                key="access_token",
-                value=new_access_token,
-                httponly=True,
-                max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-                path="/",
-                samesite="lax",  # Or your configured SameSite policy
-                secure=False,  # TODO: Change to True in production if served over HTTPS (e.g., settings.SECURE_COOKIES)
-            )
+        if revoke_sessions:
+            # Keep the caller signed in with tokens carrying the new version and status
+            set_auth_cookies(response, db_user)
 
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         logger.warning(
             f"IntegrityError during user update for user {user_id}: {e.orig}"
         )
@@ -256,9 +339,10 @@ async def update_user(
 )
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_db),
     logger: logging.Logger = Depends(get_logger),
-    current_user: DBUser = Depends(get_current_user),
+    current_user: TokenUser = Depends(get_current_token_user),
 ):
     # Authorization check
     if current_user.id != user_id:
@@ -267,18 +351,24 @@ async def delete_user(
             detail="Not authorized to delete this user",
         )
 
-    db_user = db.query(DBUser).filter(DBUser.id == user_id).first()
+    # Cars, build lists and parts go with the user through ON DELETE CASCADE
+    db_user = await db.scalar(
+        delete(DBUser).where(DBUser.id == user_id).returning(DBUser)
+    )
     if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-
-    # Convert the SQLAlchemy model to the Pydantic model *before* deleting
     deleted_user_data = UserRead.model_validate(db_user)
-
-    db.delete(db_user)
-    db.commit()
+    await db.commit()
+    user_cache.invalidate_user(user_id)
+    car_search_index.invalidate()  # the user's cars went with them
+    # Access tokens are trusted without a database lookup, so end this session
+    # now rather than let it write for a user that no longer exists. (The
+    # refresh token already fails: /auth/refresh loads the user.)
+    await revocation_store.revoke(current_user.jti, current_user.expires_at)
+    clear_auth_cookies(response)
     # Log the deleted user data
     logger.info(msg=f"User deleted from database: {deleted_user_data.id}")
     return deleted_user_data
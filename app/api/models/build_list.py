@@ -1,19 +1,35 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from typing import List, Optional
 from app.db.base_class import Base
+from app.db.rollups import BUILD_LIST_ROLLUP, listen_for_create
 
 
 class BuildList(Base):
     __tablename__ = "build_lists"
+    # Keyset pagination of a car's build lists: WHERE car_id = ? AND id > ? ORDER BY id
+    __table_args__ = (Index("ix_build_lists_car_id_id", "car_id", "id"),)
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(index=True, nullable=False)
-    description: Mapped[Optional[str]] = mapped_column(index=True, nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(nullable=True)
     image_url: Mapped[Optional[str]] = mapped_column(nullable=True)
-    car_id: Mapped[int] = mapped_column(ForeignKey("cars.id"), nullable=False)
+    # Rollups of the build list's parts, kept by database triggers (app.db.rollups)
+    part_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    total_price: Mapped[int] = mapped_column(default=0, server_default="0")
+    car_id: Mapped[int] = mapped_column(
+        ForeignKey("cars.id", ondelete="CASCADE"), nullable=False
+    )
+    # Copy of cars.user_id, so ownership checks and per-user queries need no join
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False
+    )
 
     # owner
     car: Mapped["Car"] = relationship("Car", back_populates="build_lists")  # type: ignore
     # children
-    parts: Mapped[List["Part"]] = relationship("Part", back_populates="build_list", cascade="all, delete-orphan")  # type: ignore
+    parts: Mapped[List["Part"]] = relationship("Part", back_populates="build_list", cascade="all, delete-orphan", passive_deletes=True, order_by="Part.id")  # type: ignore
+
+
+# Cars' build_list_count and total_spend
+listen_for_create(BuildList.__table__, BUILD_LIST_ROLLUP)
@@ -1,22 +1,47 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import DDL, ForeignKey, Index, event
 from typing import List, Optional
 from app.db.base_class import Base
 
 
 class Car(Base):
     __tablename__ = "cars"
+    # Keyset pagination of a user's cars: WHERE user_id = ? AND id > ? ORDER BY id
+    __table_args__ = (
+        Index("ix_cars_user_id_id", "user_id", "id"),
+        # Created by the fuzzy search DDL below rather than from a model column
+        {"info": {"ddl_indexes": ["ix_cars_make_model_trgm"]}},
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     make: Mapped[str] = mapped_column(index=True, nullable=False)
     model: Mapped[str] = mapped_column(index=True, nullable=False)
     year: Mapped[int] = mapped_column(index=True, nullable=False)
-    trim: Mapped[Optional[str]] = mapped_column(index=True, nullable=True)
+    trim: Mapped[Optional[str]] = mapped_column(nullable=True)
     vin: Mapped[Optional[str]] = mapped_column(index=True, nullable=True)
     image_url: Mapped[Optional[str]] = mapped_column(nullable=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    # Rollups of the car's build lists, kept by database triggers (app.db.rollups)
+    build_list_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    total_spend: Mapped[int] = mapped_column(default=0, server_default="0")
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
 
     # owner
     user: Mapped["User"] = relationship("User", back_populates="cars")  # type: ignore
     # children
-    build_lists: Mapped[List["BuildList"]] = relationship("BuildList", back_populates="car", cascade="all, delete-orphan")  # type: ignore
+    build_lists: Mapped[List["BuildList"]] = relationship("BuildList", back_populates="car", cascade="all, delete-orphan", passive_deletes=True, order_by="BuildList.id")  # type: ignore
+
+
+# Fuzzy make/model search (app.api.services.car_search) on Postgres: a GIN
+# trigram index over this expression, which queries must repeat verbatim
+CAR_SEARCH_DOCUMENT = "(make || ' ' || model)"
+
+for statement in (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_cars_make_model_trgm ON cars "
+    f"USING gin ({CAR_SEARCH_DOCUMENT} gin_trgm_ops)",
+):
+    event.listen(
+        Car.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
@@ -0,0 +1,25 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, Index
+from typing import Optional
+from app.db.base_class import Base
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    # The dispatcher polls for due pending messages
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    to_email: Mapped[str] = mapped_column(nullable=False)
+    template_id: Mapped[str] = mapped_column(nullable=False)
+    template_data: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # pending -> sent, or pending -> dead once retries are exhausted
+    status: Mapped[str] = mapped_column(default="pending", nullable=False)
+    attempts: Mapped[int] = mapped_column(default=0, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(nullable=True)
+    # Unix timestamps
+    created_at: Mapped[int] = mapped_column(nullable=False)
+    next_attempt_at: Mapped[int] = mapped_column(nullable=False)
+    sent_at: Mapped[Optional[int]] = mapped_column(nullable=True)
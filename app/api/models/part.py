@@ -1,23 +1,95 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import DDL, ForeignKey, Index, event
 from typing import Optional
 from app.db.base_class import Base
+from app.db.rollups import PART_ROLLUP, listen_for_create
 
 
 class Part(Base):
     __tablename__ = "parts"
+    # Keyset pagination of a build list's parts: WHERE build_list_id = ? AND id > ? ORDER BY id
+    __table_args__ = (
+        Index("ix_parts_build_list_id_id", "build_list_id", "id"),
+        # The same, sorted by price (see read_parts_by_build_list's sort orders)
+        Index("ix_parts_build_list_id_price_id", "build_list_id", "price", "id"),
+        # Created by the full-text search DDL below rather than from a model column
+        {"info": {"ddl_indexes": ["ix_parts_search_vector"]}},
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(index=True, nullable=False)
     part_type: Mapped[Optional[str]] = mapped_column(index=True, nullable=True)
     part_number: Mapped[Optional[str]] = mapped_column(index=True, nullable=True)
     manufacturer: Mapped[Optional[str]] = mapped_column(index=True, nullable=True)
-    description: Mapped[Optional[str]] = mapped_column(index=True, nullable=True)
-    price: Mapped[Optional[int]] = mapped_column(index=True, nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(nullable=True)
+    price: Mapped[Optional[int]] = mapped_column(nullable=True)
     image_url: Mapped[Optional[str]] = mapped_column(nullable=True)
     build_list_id: Mapped[int] = mapped_column(
-        ForeignKey("build_lists.id"), nullable=False
+        ForeignKey("build_lists.id", ondelete="CASCADE"), nullable=False
+    )
+    # Copy of the build list's owner_id (cars.user_id), so ownership checks and
+    # per-user queries need no join
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False
     )
 
     # owner
     build_list: Mapped["BuildList"] = relationship("BuildList", back_populates="parts")  # type: ignore
+
+
+# Full-text search index, kept up to date by the database itself and queried
+# by app.api.services.part_search. Postgres: a generated, weighted tsvector
+# column (name > manufacturer and part number > description) with a GIN index.
+# SQLite: an external-content FTS5 table maintained by triggers.
+PART_SEARCH_CONFIG = "english"
+
+_POSTGRES_SEARCH_DOCUMENT = " || ".join(
+    f"setweight(to_tsvector('{PART_SEARCH_CONFIG}', {document}), '{weight}')"
+    for document, weight in (
+        ("coalesce(name, '')", "A"),
+        ("coalesce(manufacturer, '') || ' ' || coalesce(part_number, '')", "B"),
+        ("coalesce(description, '')", "C"),
+    )
+)
+_POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE parts ADD COLUMN search_vector tsvector "
+    f"GENERATED ALWAYS AS ({_POSTGRES_SEARCH_DOCUMENT}) STORED",
+    "CREATE INDEX ix_parts_search_vector ON parts USING gin (search_vector)",
+]
+
+_FTS5_COLUMNS = "name, manufacturer, part_number, description"
+_FTS5_NEW_ROW = "new.id, new.name, new.manufacturer, new.part_number, new.description"
+_FTS5_OLD_ROW = (
+    "'delete', old.id, old.name, old.manufacturer, old.part_number, old.description"
+)
+_SQLITE_SEARCH_DDL = [
+    f"CREATE VIRTUAL TABLE parts_fts USING fts5({_FTS5_COLUMNS}, "
+    "content='parts', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER parts_fts_insert AFTER INSERT ON parts BEGIN "
+    f"INSERT INTO parts_fts(rowid, {_FTS5_COLUMNS}) VALUES ({_FTS5_NEW_ROW}); END",
+    "CREATE TRIGGER parts_fts_delete AFTER DELETE ON parts BEGIN "
+    f"INSERT INTO parts_fts(parts_fts, rowid, {_FTS5_COLUMNS}) "
+    f"VALUES ({_FTS5_OLD_ROW}); END",
+    "CREATE TRIGGER parts_fts_update AFTER UPDATE ON parts BEGIN "
+    f"INSERT INTO parts_fts(parts_fts, rowid, {_FTS5_COLUMNS}) "
+    f"VALUES ({_FTS5_OLD_ROW}); "
+    f"INSERT INTO parts_fts(rowid, {_FTS5_COLUMNS}) VALUES ({_FTS5_NEW_ROW}); END",
+]
+
+for statement in _POSTGRES_SEARCH_DDL:
+    event.listen(
+        Part.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
+for statement in _SQLITE_SEARCH_DDL:
+    event.listen(
+        Part.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Part.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS parts_fts").execute_if(dialect="sqlite"),
+)
+
+
+# Build lists' part_count and total_price
+listen_for_create(Part.__table__, PART_ROLLUP)
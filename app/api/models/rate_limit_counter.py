@@ -0,0 +1,12 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base_class import Base
+
+
+class RateLimitCounter(Base):
+    __tablename__ = "rate_limit_counters"
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    # Start of the fixed window (Unix timestamp) this count belongs to
+    window_start: Mapped[int] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(default=0, nullable=False)
+    expires_at: Mapped[int] = mapped_column(index=True, nullable=False)
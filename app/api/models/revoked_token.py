@@ -0,0 +1,10 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base_class import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti: Mapped[str] = mapped_column(primary_key=True)
+    # Unix timestamp of the token's own expiry; the row is useless after that
+    expires_at: Mapped[int] = mapped_column(index=True, nullable=False)
@@ -1,5 +1,8 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import List, Optional
+
+from app.api.schemas.car import CarRead
+from app.api.schemas.part import PartRead
 
 
 # Schema for request body when creating/updating a build list
@@ -17,6 +20,14 @@ class BuildListUpdate(BaseModel):
     car_id: Optional[int] = None
     image_url: Optional[str] = None
 
+    # Omitted fields are left alone, but these columns cannot be set to null
+    @field_validator("name", "car_id")
+    @classmethod
+    def not_null(cls, value):
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 
 # Schema for response body when reading a build list
 class BuildListRead(BaseModel):
@@ -25,5 +36,13 @@ class BuildListRead(BaseModel):
     description: Optional[str] = None
     car_id: int
     image_url: Optional[str] = None
+    part_count: int = 0
+    total_price: int = 0
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# Schema for response body when reading a build list with its car and parts
+class BuildListFull(BuildListRead):
+    car: CarRead
+    parts: List[PartRead]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import Optional
 
 
@@ -21,6 +21,14 @@ class CarUpdate(BaseModel):
     vin: Optional[str] = None
     image_url: Optional[str] = None
 
+    # Omitted fields are left alone, but these columns cannot be set to null
+    @field_validator("make", "model", "year")
+    @classmethod
+    def not_null(cls, value):
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 
 # Schema for response body when reading a car
 class CarRead(BaseModel):
@@ -32,5 +40,7 @@ class CarRead(BaseModel):
     vin: Optional[str] = None
     image_url: Optional[str] = None
     user_id: int
+    build_list_count: int = 0
+    total_spend: int = 0
 
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+# Schemas for the garage snapshot (GET /users/{id}/garage). Fields the client
+# did not ask for are left out of the response, so all but the ids are optional;
+# parent ids are implied by the nesting.
+class GaragePart(BaseModel):
+    id: int
+    name: Optional[str] = None
+    part_type: Optional[str] = None
+    part_number: Optional[str] = None
+    manufacturer: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[int] = None
+    image_url: Optional[str] = None
+
+
+class GarageBuildList(BaseModel):
+    id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    part_count: Optional[int] = None
+    total_price: Optional[int] = None
+    parts: Optional[List[GaragePart]] = None
+
+
+class GarageCar(BaseModel):
+    id: int
+    make: Optional[str] = None
+    model: Optional[str] = None
+    year: Optional[int] = None
+    trim: Optional[str] = None
+    vin: Optional[str] = None
+    image_url: Optional[str] = None
+    build_list_count: Optional[int] = None
+    total_spend: Optional[int] = None
+    build_lists: Optional[List[GarageBuildList]] = None
+
+
+class Garage(BaseModel):
+    id: int
+    username: str
+    cars: List[GarageCar]
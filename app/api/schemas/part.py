@@ -1,5 +1,7 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from typing import List, Optional
+
+from app.core.config import settings
 
 
 # Schema for request body when creating/updating a part
@@ -25,6 +27,14 @@ class PartUpdate(BaseModel):
     image_url: Optional[str] = None
     build_list_id: Optional[int] = None
 
+    # Omitted fields are left alone, but these columns cannot be set to null
+    @field_validator("name", "build_list_id")
+    @classmethod
+    def not_null(cls, value):
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 
 # Schema for response body when reading a part
 class PartRead(BaseModel):
@@ -39,3 +49,59 @@ class PartRead(BaseModel):
     build_list_id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# One item of a bulk request that was not applied, by its position in the request
+class PartBulkError(BaseModel):
+    index: int
+    status_code: int
+    detail: str
+
+
+# Schema for response body of POST /parts/bulk: the created parts in id order,
+# and the items that were rejected
+class PartBulkCreateResult(BaseModel):
+    created: List[PartRead]
+    errors: List[PartBulkError]
+
+
+# Schema for request body of the bulk part routes: which of the caller's parts
+# to change, by id, by filter (every given filter applies), or both
+class PartBulkSelection(BaseModel):
+    ids: Optional[List[int]] = Field(
+        None, min_length=1, max_length=settings.PARTS_BULK_MAX_ITEMS
+    )
+    build_list_id: Optional[int] = None
+    part_type: Optional[str] = None
+    manufacturer: Optional[str] = None
+    min_price: Optional[int] = Field(None, ge=0)
+    max_price: Optional[int] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def require_selection(self):
+        # An empty selection would mean every part the caller owns
+        if all(getattr(self, name) is None for name in PartBulkSelection.model_fields):
+            raise ValueError("Select parts by ids or at least one filter")
+        return self
+
+
+# Schema for request body of PATCH /parts/bulk; build_list_id in `changes` moves the
+# parts. `changes` is validated as for PATCH /parts/{id}: name and build_list_id
+# may be omitted but not null
+class PartBulkUpdate(PartBulkSelection):
+    changes: PartUpdate
+
+    @model_validator(mode="after")
+    def require_changes(self):
+        if not self.changes.model_fields_set:
+            raise ValueError("No changes given")
+        return self
+
+
+# Schema for response body of the bulk update and delete routes
+class PartBulkSummary(BaseModel):
+    affected: int
+    # The parts updated or deleted
+    ids: List[int]
+    # Requested ids left alone: not the caller's parts, or not matching the filters
+    missing_ids: List[int]
@@ -5,5 +5,10 @@ class Token(BaseModel):
     access_token: str
     token_type: str
 
-class TokenData(BaseModel):
-    username: Optional[str] = None
\ No newline at end of file
+# Identity carried by a verified token; trusted without a database lookup until it expires
+class TokenUser(BaseModel):
+    id: int
+    disabled: bool = False
+    token_version: int = 0
+    jti: Optional[str] = None
+    expires_at: Optional[int] = None
@@ -0,0 +1,125 @@
+import re
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import String, func, literal, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.api.models.car import CAR_SEARCH_DOCUMENT, Car
+
+# Typo-tolerant search over "make model" using trigram similarity. Postgres
+# matches with pg_trgm's word similarity (`query <% document`) through a GIN
+# trigram index (see app.api.models.car). Elsewhere (SQLite in development and
+# tests) a per-process trigram index answers the same question; it is rebuilt
+# from the cars table when a car changes in this process, or when it is older
+# than CAR_SEARCH_INDEX_TTL_SECONDS (a change made by another process).
+
+
+def trigrams(text: str) -> Set[str]:
+    """pg_trgm-style trigrams: lowercased alphanumeric words, padded "  w" ... "w "."""
+    result = set()
+    for word in re.findall(r"[^\W_]+", text.lower()):
+        padded = f"  {word} "
+        result.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class TrigramIndex:
+    """
+    Inverted index from trigram to document ids. Scores a document by the
+    share of the query's trigrams it contains, which is what word similarity
+    measures when the best matching words are adjacent.
+    """
+
+    def __init__(self, documents: Iterable[Tuple[int, str]] = ()):
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        for document_id, text in documents:
+            for trigram in trigrams(text):
+                self._postings[trigram].add(document_id)
+
+    def search(
+        self, query: str, limit: int, threshold: float
+    ) -> List[Tuple[int, float]]:
+        """(document id, score) pairs scoring at least `threshold`, best first."""
+        query_trigrams = trigrams(query)
+        if not query_trigrams:
+            return []
+        hits: Dict[int, int] = defaultdict(int)
+        for trigram in query_trigrams:
+            for document_id in self._postings.get(trigram, ()):
+                hits[document_id] += 1
+        scored = [
+            (document_id, count / len(query_trigrams))
+            for document_id, count in hits.items()
+        ]
+        scored = [(i, score) for i, score in scored if score >= threshold]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+
+class CarSearchIndex:
+    """Lazily built, per-process TrigramIndex over every car's make and model."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._index: Optional[TrigramIndex] = None
+        self._built_at = 0.0
+
+    def invalidate(self):
+        """Rebuild on the next search; car write handlers call this."""
+        self._index = None
+
+    async def get(self, db: AsyncSession) -> TrigramIndex:
+        # Concurrent rebuilds are harmless; the last one to finish is kept
+        if self._index is None or time.monotonic() - self._built_at > self.ttl:
+            rows = await db.execute(select(Car.id, Car.make, Car.model))
+            index = TrigramIndex(
+                (car_id, f"{make} {model}") for car_id, make, model in rows
+            )
+            self._index, self._built_at = index, time.monotonic()
+        return self._index
+
+
+car_search_index = CarSearchIndex(ttl=settings.CAR_SEARCH_INDEX_TTL_SECONDS)
+
+
+async def search_cars(
+    db: AsyncSession, query: str, limit: int, threshold: Optional[float] = None
+) -> List[Tuple[Car, float]]:
+    """Up to `limit` (car, similarity) pairs whose make and model resemble `query`, best first."""
+    if threshold is None:
+        threshold = settings.CAR_SEARCH_SIMILARITY_THRESHOLD
+
+    connection = await db.connection()
+    if connection.dialect.name == "postgresql":
+        # `<%` uses the GIN index, filtering on this threshold (for this transaction only)
+        await db.execute(
+            select(
+                func.set_config(
+                    "pg_trgm.word_similarity_threshold", str(threshold), True
+                )
+            )
+        )
+        document = literal_column(CAR_SEARCH_DOCUMENT)
+        score = func.word_similarity(query, document)
+        rows = await db.execute(
+            select(Car, score.label("score"))
+            .where(literal(query, String).op("<%")(document))
+            .order_by(score.desc(), Car.id)
+            .limit(limit)
+        )
+        return [(car, car_score) for car, car_score in rows]
+
+    matches = (await car_search_index.get(db)).search(query, limit, threshold)
+    if not matches:
+        return []
+    cars = {
+        car.id: car
+        for car in await db.scalars(
+            select(Car).where(Car.id.in_([car_id for car_id, _ in matches]))
+        )
+    }
+    # A car deleted since the index was built is simply skipped
+    return [(cars[car_id], score) for car_id, score in matches if car_id in cars]
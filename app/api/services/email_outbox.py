@@ -0,0 +1,200 @@
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import Row, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.email import EmailProvider, email_provider
+from app.core.logging import logger
+from app.core.metrics import register_metrics_source
+from app.db.session import AsyncSessionLocal
+from app.api.models.email_outbox import EmailOutbox
+
+PENDING = "pending"
+SENT = "sent"
+DEAD = "dead"
+
+
+def enqueue_email(
+    db: AsyncSession, to_email: str, template_id: str, template_data: dict
+) -> EmailOutbox:
+    """
+    Add an email to the outbox as part of the caller's transaction.
+    Nothing is sent until the caller commits and the dispatcher picks it up.
+    """
+    now = int(time.time())
+    message = EmailOutbox(
+        to_email=to_email,
+        template_id=template_id,
+        template_data=template_data,
+        status=PENDING,
+        attempts=0,
+        created_at=now,
+        next_attempt_at=now,
+    )
+    db.add(message)
+    return message
+
+
+class EmailDispatcher:
+    """
+    Drains the email outbox in the background.
+
+    Failed sends are retried with exponential backoff; after `max_attempts`
+    the message is dead-lettered (status "dead") and kept for inspection.
+    Each batch is leased in one short transaction (FOR UPDATE SKIP LOCKED,
+    then next_attempt_at moved `lease` seconds ahead), so several replicas
+    can run a dispatcher without sending a message twice. Each outcome is
+    then recorded in its own transaction; a crash re-sends at most the
+    message in flight. Sent messages keep no template data.
+    """
+
+    def __init__(
+        self,
+        provider: EmailProvider,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        batch_size: int = 50,
+        poll_interval: float = 2.0,
+        max_attempts: int = 5,
+        base_backoff: float = 30.0,
+        max_backoff: float = 3600.0,
+        lease: float = 300.0,
+    ):
+        self.provider = provider
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self._sent = 0
+        self._failed_attempts = 0
+        self._dead_lettered = 0
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before retry number `attempts` (1-based)."""
+        return min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+
+    async def claim(self) -> List[Row]:
+        """
+        Lease a batch of due messages and commit, so no row lock is held while
+        sending. Claiming counts as an attempt; a message its dispatcher never
+        reports on (a crash) is due again once the lease runs out.
+        """
+        now = int(time.time())
+        due = (
+            select(EmailOutbox.id)
+            .where(
+                EmailOutbox.status == PENDING,
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self._session_factory() as db:
+            # Plain rows: they stay readable after the session is gone
+            messages = (
+                await db.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id.in_(due))
+                    .values(
+                        next_attempt_at=now + int(self.lease),
+                        attempts=EmailOutbox.attempts + 1,
+                    )
+                    .returning(
+                        EmailOutbox.id,
+                        EmailOutbox.to_email,
+                        EmailOutbox.template_id,
+                        EmailOutbox.template_data,
+                        EmailOutbox.attempts,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            ).all()
+            await db.commit()
+        return sorted(messages, key=lambda m: m.id)
+
+    async def _record(self, message_id: int, **values):
+        async with self._session_factory() as db:
+            await db.execute(
+                update(EmailOutbox).where(EmailOutbox.id == message_id).values(**values)
+            )
+            await db.commit()
+
+    async def dispatch_once(self) -> int:
+        """Send one batch of due messages; returns how many were claimed."""
+        messages = await self.claim()
+        lease_ends = time.monotonic() + self.lease
+        for message in messages:
+            if time.monotonic() >= lease_ends:
+                # Another dispatcher may claim the rest now; leave them to it
+                break
+            try:
+                # Provider calls are blocking HTTP requests, so keep them off the event loop
+                await asyncio.to_thread(
+                    self.provider.send,
+                    message.to_email,
+                    message.template_id,
+                    message.template_data,
+                )
+            except Exception as e:
+                self._failed_attempts += 1
+                if message.attempts >= self.max_attempts:
+                    await self._record(message.id, status=DEAD, last_error=str(e)[:500])
+                    self._dead_lettered += 1
+                    logger.error(
+                        f"Email {message.id} to {message.to_email} dead-lettered after {message.attempts} attempts: {e}"
+                    )
+                else:
+                    await self._record(
+                        message.id,
+                        next_attempt_at=int(
+                            time.time() + self.backoff(message.attempts)
+                        ),
+                        last_error=str(e)[:500],
+                    )
+                    logger.warning(
+                        f"Email {message.id} attempt {message.attempts} failed, retrying: {e}"
+                    )
+                continue
+            # Template data holds live verification and reset links; drop it once delivered
+            await self._record(
+                message.id, status=SENT, sent_at=int(time.time()), template_data={}
+            )
+            self._sent += 1
+        return len(messages)
+
+    async def run(self):
+        """Poll the outbox until cancelled; started from the app lifespan."""
+        while True:
+            try:
+                processed = await self.dispatch_once()
+            except Exception as e:
+                logger.error(f"Email dispatch failed: {e}")
+                processed = 0
+            # A full batch means there is probably more waiting
+            if processed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "provider": type(self.provider).__name__,
+            "sent": self._sent,
+            "failed_attempts": self._failed_attempts,
+            "dead_lettered": self._dead_lettered,
+        }
+
+
+email_dispatcher = EmailDispatcher(
+    provider=email_provider,
+    batch_size=settings.EMAIL_DISPATCH_BATCH_SIZE,
+    poll_interval=settings.EMAIL_DISPATCH_POLL_SECONDS,
+    max_attempts=settings.EMAIL_DISPATCH_MAX_ATTEMPTS,
+    base_backoff=settings.EMAIL_DISPATCH_BACKOFF_SECONDS,
+    lease=settings.EMAIL_DISPATCH_LEASE_SECONDS,
+)
+register_metrics_source("email_dispatcher", email_dispatcher.stats)
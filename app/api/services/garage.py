@@ -0,0 +1,100 @@
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+
+from app.api.models.build_list import BuildList
+from app.api.models.car import Car
+from app.api.models.part import Part
+from app.api.models.user import User
+
+# A user's whole garage (cars, their build lists, their parts) in one query
+# per level: the cars by user id, then each deeper level with one IN-list
+# query over the ids of the level above (selectinload). Only the requested
+# columns are read. Depth 1 stops at the cars, 2 at the build lists.
+
+MAX_DEPTH = 3
+
+# Columns a client may ask for at each level; ids are always included
+CAR_FIELDS = (
+    "make",
+    "model",
+    "year",
+    "trim",
+    "vin",
+    "image_url",
+    "build_list_count",
+    "total_spend",
+)
+BUILD_LIST_FIELDS = ("name", "description", "image_url", "part_count", "total_price")
+PART_FIELDS = (
+    "name",
+    "part_type",
+    "part_number",
+    "manufacturer",
+    "description",
+    "price",
+    "image_url",
+)
+
+
+def _columns(model, fields: Sequence[str]):
+    return load_only(model.id, *(getattr(model, field) for field in fields))
+
+
+def _row(obj, fields: Sequence[str]) -> Dict[str, Any]:
+    # Only loaded attributes are read; anything else would need a lazy load
+    return {"id": obj.id, **{field: getattr(obj, field) for field in fields}}
+
+
+async def load_garage(
+    db: AsyncSession,
+    user_id: int,
+    depth: int = MAX_DEPTH,
+    car_fields: Sequence[str] = CAR_FIELDS,
+    build_list_fields: Sequence[str] = BUILD_LIST_FIELDS,
+    part_fields: Sequence[str] = PART_FIELDS,
+) -> Optional[Dict[str, Any]]:
+    """
+    The user's garage as nested dicts, or None if there is no such user.
+    Costs 1 + `depth` queries however many cars, build lists and parts.
+    """
+    user = (
+        await db.execute(select(User.id, User.username).where(User.id == user_id))
+    ).first()
+    if user is None:
+        return None
+
+    stmt = (
+        select(Car)
+        .where(Car.user_id == user_id)
+        .order_by(Car.id)
+        .options(_columns(Car, car_fields))
+        # Objects the session already holds may have stale rollups or collections
+        .execution_options(populate_existing=True)
+    )
+    if depth >= 2:
+        build_lists = selectinload(Car.build_lists).options(
+            _columns(BuildList, build_list_fields)
+        )
+        if depth >= 3:
+            build_lists = build_lists.selectinload(BuildList.parts).options(
+                _columns(Part, part_fields)
+            )
+        stmt = stmt.options(build_lists)
+
+    cars = []
+    for car in await db.scalars(stmt):
+        car_row = _row(car, car_fields)
+        if depth >= 2:
+            car_row["build_lists"] = []
+            for build_list in car.build_lists:
+                build_list_row = _row(build_list, build_list_fields)
+                if depth >= 3:
+                    build_list_row["parts"] = [
+                        _row(part, part_fields) for part in build_list.parts
+                    ]
+                car_row["build_lists"].append(build_list_row)
+        cars.append(car_row)
+    return {"id": user.id, "username": user.username, "cars": cars}
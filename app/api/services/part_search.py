@@ -0,0 +1,73 @@
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, column, func, literal_column, or_, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.models.part import PART_SEARCH_CONFIG, Part
+
+# Full-text search over parts' name, manufacturer, part number and description,
+# using the index the database keeps for it (see app.api.models.part): a
+# weighted tsvector with a GIN index on Postgres, an FTS5 table on SQLite.
+# Results are ordered by relevance, best first, then by id, and paged by keyset
+# on that pair.
+
+# bm25 weights for parts_fts's columns (name, manufacturer, part_number, description)
+_FTS5_WEIGHTS = (10.0, 4.0, 4.0, 1.0)
+
+_parts_fts = table("parts_fts", column("rowid"))
+
+
+def fts5_query(query: str) -> Optional[str]:
+    """
+    Quote each word of free-text input as an FTS5 string, so punctuation and
+    operators in user input cannot produce a syntax error; words are ANDed.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return " ".join('"' + word + '"' for word in words)
+
+
+async def search_parts(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    after: Optional[Tuple[float, int]] = None,
+    build_list_id: Optional[int] = None,
+) -> List[Tuple[Part, float]]:
+    """
+    Up to `limit` (part, score) pairs matching `query`, best first. Scores
+    are only comparable within one backend. `after` is the (score, id) of the
+    last row of the previous page.
+    """
+    if (await db.connection()).dialect.name == "postgresql":
+        ts_query = func.websearch_to_tsquery(
+            literal_column(f"'{PART_SEARCH_CONFIG}'::regconfig"), query
+        )
+        search_vector = literal_column("parts.search_vector")
+        score = func.ts_rank_cd(search_vector, ts_query)
+        stmt = select(Part, score.label("score")).where(
+            search_vector.op("@@")(ts_query)
+        )
+    else:
+        match = fts5_query(query)
+        if match is None:
+            return []
+        # bm25 is lower for better matches; negate it so higher is better on both backends
+        score = -func.bm25(literal_column("parts_fts"), *_FTS5_WEIGHTS)
+        stmt = (
+            select(Part, score.label("score"))
+            .join(_parts_fts, _parts_fts.c.rowid == Part.id)
+            .where(text("parts_fts MATCH :match").bindparams(match=match))
+        )
+
+    if build_list_id is not None:
+        stmt = stmt.where(Part.build_list_id == build_list_id)
+    if after is not None:
+        after_score, after_id = after
+        stmt = stmt.where(
+            or_(score < after_score, and_(score == after_score, Part.id > after_id))
+        )
+    rows = await db.execute(stmt.order_by(score.desc(), Part.id).limit(limit))
+    return [(part, part_score) for part, part_score in rows]
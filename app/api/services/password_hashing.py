@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import register_metrics_source
+from app.api.utils.security import get_password_hash, verify_password
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded thread pool so it never blocks the event loop.
+
+    At most `max_workers` hashes run at once; up to `max_queue` more may wait
+    for a worker. Anything beyond that is rejected immediately with a 503, and
+    a call that does not finish within `timeout` seconds is abandoned.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, timeout: float):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hasher"
+        )
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._total_wait_seconds = 0.0
+        self._total_run_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        """Hash a plain password without blocking the event loop."""
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a plain password without blocking the event loop."""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "in_flight": self._in_flight,
+                "max_queue_depth": self._max_queue_depth,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "avg_wait_ms": (
+                    self._total_wait_seconds / self._completed * 1000
+                    if self._completed
+                    else 0.0
+                ),
+                "avg_run_ms": (
+                    self._total_run_seconds / self._completed * 1000
+                    if self._completed
+                    else 0.0
+                ),
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                logger.warning(
+                    f"Password hashing queue full ({self._queued} waiting), rejecting request"
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server is busy, please try again shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+
+        submitted_at = time.perf_counter()
+        future = self._executor.submit(self._call, submitted_at, func, *args)
+        future.add_done_callback(self._on_done)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            # Cancelling the wrapper also cancels the pool future if it has not started yet
+            with self._lock:
+                self._timed_out += 1
+            logger.warning(f"Password hashing timed out after {self.timeout}s")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": "1"},
+            )
+
+    def _call(self, submitted_at: float, func: Callable[..., T], *args: Any) -> T:
+        started_at = time.perf_counter()
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+            self._total_wait_seconds += started_at - submitted_at
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._total_run_seconds += time.perf_counter() - started_at
+
+    def _on_done(self, future: Future):
+        # A future cancelled while still queued never reaches _call
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
+register_metrics_source("password_hasher", password_hasher.stats)
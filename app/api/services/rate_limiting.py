@@ -0,0 +1,188 @@
+import asyncio
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import register_metrics_source
+from app.db.session import AsyncSessionLocal
+from app.api.models.rate_limit_counter import RateLimitCounter
+
+# --- Backends ---
+
+
+class RateLimitBackend(ABC):
+    """
+    Counter store for fixed windows. Replicas that share a backend enforce
+    one combined budget.
+    """
+
+    @abstractmethod
+    async def increment(self, key: str, window_start: int, expires_at: int) -> int:
+        """Add one hit to the window and return its new count."""
+
+    @abstractmethod
+    async def get(self, key: str, window_start: int) -> int:
+        ...
+
+    @abstractmethod
+    async def purge_expired(self, now: int) -> int:
+        ...
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Process-local backend; each replica gets its own budget."""
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, int], Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    async def increment(self, key: str, window_start: int, expires_at: int) -> int:
+        with self._lock:
+            count, _ = self._counters.get((key, window_start), (0, expires_at))
+            self._counters[(key, window_start)] = (count + 1, expires_at)
+            return count + 1
+
+    async def get(self, key: str, window_start: int) -> int:
+        return self._counters.get((key, window_start), (0, 0))[0]
+
+    async def purge_expired(self, now: int) -> int:
+        with self._lock:
+            expired = [k for k, (_, exp) in self._counters.items() if exp <= now]
+            for k in expired:
+                del self._counters[k]
+        return len(expired)
+
+
+class DatabaseRateLimitBackend(RateLimitBackend):
+    """Backend on the rate_limit_counters table, shared by every replica."""
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal):
+        # Short-lived sessions of our own; never the request's session
+        self._session_factory = session_factory
+
+    async def increment(self, key: str, window_start: int, expires_at: int) -> int:
+        async with self._session_factory() as db:
+            dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+            stmt = dialect.insert(RateLimitCounter).values(
+                key=key, window_start=window_start, count=1, expires_at=expires_at
+            )
+            # Atomic across replicas: one upsert, no read-modify-write race
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[RateLimitCounter.key, RateLimitCounter.window_start],
+                set_={"count": RateLimitCounter.count + 1},
+            ).returning(RateLimitCounter.count)
+            count = (await db.execute(stmt)).scalar_one()
+            await db.commit()
+            return count
+
+    async def get(self, key: str, window_start: int) -> int:
+        async with self._session_factory() as db:
+            count = await db.scalar(
+                select(RateLimitCounter.count).where(
+                    RateLimitCounter.key == key,
+                    RateLimitCounter.window_start == window_start,
+                )
+            )
+            return count or 0
+
+    async def purge_expired(self, now: int) -> int:
+        async with self._session_factory() as db:
+            result = await db.execute(
+                delete(RateLimitCounter).where(RateLimitCounter.expires_at <= now)
+            )
+            await db.commit()
+            return result.rowcount
+
+
+# --- Limiter ---
+
+
+class RateLimiter:
+    """
+    Sliding-window rate limiter.
+
+    Each key keeps one counter per fixed window; the current rate is the
+    current window's count plus the previous window's count weighted by how
+    much of it still overlaps the sliding window. This needs two counters
+    per key regardless of traffic, and both fit any atomic-increment store.
+    """
+
+    def __init__(self, backend: RateLimitBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self._allowed = 0
+        self._rejected = 0
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> float:
+        """
+        Record one request against `key`. Returns 0 if it is within `limit`
+        per `window_seconds`, otherwise the seconds to wait before retrying.
+        """
+        now = time.time()
+        window_start = int(now // window_seconds) * window_seconds
+        current = await self.backend.increment(
+            key, window_start, expires_at=window_start + 2 * window_seconds
+        )
+        previous = await self.backend.get(key, window_start - window_seconds)
+        overlap = 1 - (now - window_start) / window_seconds
+        if previous * overlap + current <= limit:
+            return 0.0
+        return window_start + window_seconds - now
+
+    async def enforce(self, *rules: Tuple[str, int, int]):
+        """
+        Apply every (key, limit, window_seconds) rule to this request and
+        raise 429 if any of them is exceeded.
+        """
+        if not self.enabled:
+            return
+        retry_after = 0.0
+        for key, limit, window_seconds in rules:
+            retry_after = max(retry_after, await self.hit(key, limit, window_seconds))
+        if retry_after:
+            self._rejected += 1
+            logger.warning(f"Rate limit exceeded for {[rule[0] for rule in rules]}")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+        self._allowed += 1
+
+    async def run_purge_loop(self, interval: float = 60.0):
+        """Periodically drop expired counters until cancelled; started from the app lifespan."""
+        while True:
+            try:
+                await self.backend.purge_expired(int(time.time()))
+            except Exception as e:
+                logger.error(f"Rate limit counter purge failed: {e}")
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "enabled": self.enabled,
+            "allowed": self._allowed,
+            "rejected": self._rejected,
+        }
+
+
+def _create_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "database":
+        return DatabaseRateLimitBackend()
+    return InMemoryRateLimitBackend()
+
+
+rate_limiter = RateLimiter(
+    backend=_create_backend(), enabled=settings.RATE_LIMIT_ENABLED
+)
+register_metrics_source("rate_limiter", rate_limiter.stats)
@@ -0,0 +1,295 @@
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import register_metrics_source
+from app.db.session import AsyncSessionLocal
+from app.api.models.revoked_token import RevokedToken
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    `in` never returns a false negative; false positives occur at roughly
+    `error_rate` while no more than `capacity` keys have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+# --- Backends ---
+
+
+class RevocationBackend(ABC):
+    """
+    Authoritative denylist of token ids. Every replica that shares a backend
+    sees the same revocations (after its next sync).
+    """
+
+    @abstractmethod
+    async def revoke(self, jti: str, expires_at: int):
+        ...
+
+    @abstractmethod
+    async def claim(self, jti: str, expires_at: int) -> bool:
+        """
+        Revoke `jti` atomically unless it is already revoked. Returns False if
+        it was, so of two concurrent claims on any replica exactly one wins.
+        """
+
+    @abstractmethod
+    async def is_revoked(self, jti: str, now: int) -> bool:
+        ...
+
+    @abstractmethod
+    async def active_ids(self, now: int) -> List[str]:
+        """Ids of revoked tokens that have not expired yet."""
+
+    @abstractmethod
+    async def purge_expired(self, now: int) -> int:
+        """Forget revoked tokens that have expired anyway; returns how many."""
+
+
+class InMemoryRevocationBackend(RevocationBackend):
+    """Process-local backend, for a single worker or for tests."""
+
+    def __init__(self):
+        self._expiry_by_jti: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    async def revoke(self, jti: str, expires_at: int):
+        with self._lock:
+            self._expiry_by_jti[jti] = expires_at
+
+    async def claim(self, jti: str, expires_at: int) -> bool:
+        with self._lock:
+            if jti in self._expiry_by_jti:
+                return False
+            self._expiry_by_jti[jti] = expires_at
+            return True
+
+    async def is_revoked(self, jti: str, now: int) -> bool:
+        return self._expiry_by_jti.get(jti, 0) > now
+
+    async def active_ids(self, now: int) -> List[str]:
+        with self._lock:
+            return [jti for jti, exp in self._expiry_by_jti.items() if exp > now]
+
+    async def purge_expired(self, now: int) -> int:
+        with self._lock:
+            expired = [jti for jti, exp in self._expiry_by_jti.items() if exp <= now]
+            for jti in expired:
+                del self._expiry_by_jti[jti]
+        return len(expired)
+
+
+class DatabaseRevocationBackend(RevocationBackend):
+    """Backend on the revoked_tokens table, shared by every replica."""
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal):
+        # Short-lived sessions of our own; never the request's session
+        self._session_factory = session_factory
+
+    async def revoke(self, jti: str, expires_at: int):
+        async with self._session_factory() as db:
+            await db.merge(RevokedToken(jti=jti, expires_at=expires_at))
+            await db.commit()
+
+    async def claim(self, jti: str, expires_at: int) -> bool:
+        async with self._session_factory() as db:
+            dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+            # The primary key decides between concurrent claims from any replica
+            stmt = (
+                dialect.insert(RevokedToken)
+                .values(jti=jti, expires_at=expires_at)
+                .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+                .returning(RevokedToken.jti)
+            )
+            claimed = (await db.execute(stmt)).scalar_one_or_none() is not None
+            await db.commit()
+            return claimed
+
+    async def is_revoked(self, jti: str, now: int) -> bool:
+        async with self._session_factory() as db:
+            row = await db.get(RevokedToken, jti)
+            return row is not None and row.expires_at > now
+
+    async def active_ids(self, now: int) -> List[str]:
+        async with self._session_factory() as db:
+            return list(
+                await db.scalars(
+                    select(RevokedToken.jti).where(RevokedToken.expires_at > now)
+                )
+            )
+
+    async def purge_expired(self, now: int) -> int:
+        async with self._session_factory() as db:
+            result = await db.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at <= now)
+            )
+            await db.commit()
+            return result.rowcount
+
+
+# --- Store ---
+
+
+class TokenRevocationStore:
+    """
+    Denylist of token ids with a Bloom-filter front.
+
+    A token that is not in the filter is definitely not revoked, so the
+    common case is answered in memory without touching the backend. Filter
+    hits (real revocations and rare false positives) are confirmed against
+    the backend. `sync` purges expired entries and rebuilds the filter from
+    the backend so revocations made by other replicas are picked up; until
+    then, those are missed. Single-use tokens are consumed with `claim`,
+    which asks the backend directly.
+    """
+
+    def __init__(
+        self,
+        backend: RevocationBackend,
+        capacity: int,
+        error_rate: float,
+        sync_interval: float,
+    ):
+        self.backend = backend
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._entries = 0
+        # Ids revoked here while `sync` rebuilds the filter; None when not syncing
+        self._added_during_sync: Optional[List[str]] = None
+        self._last_sync: Optional[float] = None
+        self._checks = 0
+        self._backend_lookups = 0
+        self._false_positives = 0
+
+    async def revoke(self, jti: Optional[str], expires_at: Optional[int]):
+        if not jti or expires_at is None or expires_at <= time.time():
+            return  # Nothing to do for tokens that are already unusable
+        await self.backend.revoke(jti, expires_at)
+        self._add(jti)
+
+    async def claim(self, jti: Optional[str], expires_at: Optional[int]) -> bool:
+        """
+        Consume a single-use token: revoke it and return True, or return False
+        if it was already revoked on any replica (or cannot be identified).
+        """
+        if not jti or expires_at is None:
+            return False
+        claimed = await self.backend.claim(jti, expires_at)
+        self._add(jti)
+        return claimed
+
+    def _add(self, jti: str):
+        self._bloom.add(jti)
+        self._entries += 1
+        if self._added_during_sync is not None:
+            self._added_during_sync.append(jti)
+
+    async def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        self._checks += 1
+        if jti not in self._bloom:
+            return False
+        self._backend_lookups += 1
+        revoked = await self.backend.is_revoked(jti, int(time.time()))
+        if not revoked:
+            self._false_positives += 1
+        return revoked
+
+    async def sync(self):
+        now = int(time.time())
+        self._added_during_sync = []
+        try:
+            purged = await self.backend.purge_expired(now)
+            active = await self.backend.active_ids(now)
+            # Revocations made here while active_ids ran may be missing from it
+            active.extend(self._added_during_sync)
+        finally:
+            self._added_during_sync = None
+        # Grow the filter rather than let the false-positive rate climb
+        bloom = BloomFilter(max(self.capacity, 2 * len(active)), self.error_rate)
+        for jti in active:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._entries = len(active)
+        self._last_sync = time.monotonic()
+        if purged:
+            logger.info(f"Purged {purged} expired revoked tokens")
+
+    async def run_sync_loop(self):
+        """Periodically sync until cancelled; started from the app lifespan."""
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error(f"Token revocation sync failed: {e}")
+            await asyncio.sleep(self.sync_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": self._entries,
+            "bloom_bits": self._bloom.num_bits,
+            "bloom_hashes": self._bloom.num_hashes,
+            "checks": self._checks,
+            "backend_lookups": self._backend_lookups,
+            "false_positives": self._false_positives,
+            "seconds_since_sync": (
+                time.monotonic() - self._last_sync if self._last_sync else None
+            ),
+        }
+
+
+def _create_backend() -> RevocationBackend:
+    if settings.TOKEN_REVOCATION_BACKEND == "database":
+        return DatabaseRevocationBackend()
+    return InMemoryRevocationBackend()
+
+
+revocation_store = TokenRevocationStore(
+    backend=_create_backend(),
+    capacity=settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+    sync_interval=settings.TOKEN_REVOCATION_SYNC_SECONDS,
+)
+register_metrics_source("token_revocation", revocation_store.stats)
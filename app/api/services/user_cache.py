@@ -0,0 +1,64 @@
+from typing import Any, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.core.metrics import register_metrics_source
+from app.api.models.user import User as DBUser
+from app.api.utils.cache import TTLCache
+
+# Columns kept in the cache. hashed_password is deliberately left out; a handler
+# that needs it must load it with populate_existing (async sessions cannot
+# lazy-load on access, and a plain get returns the cached instance as is).
+_CACHED_COLUMNS = (
+    "id",
+    "username",
+    "email",
+    "image_url",
+    "email_verified",
+    "disabled",
+    "token_version",
+)
+
+
+class UserCache:
+    """
+    Per-process TTL cache of authenticated users, keyed by user id (the token subject).
+
+    Only plain column values are stored, never ORM instances, so a cached
+    entry can be attached to whichever session is serving the request.
+    Handlers that change a user must call `invalidate_user`.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+
+    async def get(self, db: AsyncSession, user_id: int) -> Optional[DBUser]:
+        """Return the cached user attached to `db`, without a query, or None."""
+        snapshot = self._cache.get(user_id)
+        if snapshot is None:
+            return None
+        user = DBUser(**snapshot)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    def set(self, user: DBUser):
+        self._cache.set(
+            user.id, {column: getattr(user, column) for column in _CACHED_COLUMNS}
+        )
+
+    def invalidate_user(self, user_id: int):
+        self._cache.pop(user_id)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+register_metrics_source("user_cache", user_cache.stats)
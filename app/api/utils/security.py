@@ -1 +1,24 @@
-#maybe pull stuff out of auth.py later
\ No newline at end of file
+import bcrypt
+
+from app.core.config import settings
+
+# --- Password Utilities ---
+# These are blocking (bcrypt is deliberately slow). Request handlers should go
+# through app.api.services.password_hashing instead of calling them directly.
+
+
+def verify_password(plain_password: str, hashed_password_str: str) -> bool:
+    """Verifies a plain password against a hashed password."""
+    # Ensure hashed_password_str is bytes, as bcrypt expects
+    hashed_password_bytes = hashed_password_str.encode("utf-8")
+    plain_password_bytes = plain_password.encode("utf-8")
+    return bcrypt.checkpw(plain_password_bytes, hashed_password_bytes)
+
+
+def get_password_hash(password: str) -> str:
+    """Hashes a plain password."""
+    password_bytes = password.encode("utf-8")
+    salt = bcrypt.gensalt(rounds=settings.PASSWORD_HASH_ROUNDS)
+    hashed_bytes = bcrypt.hashpw(password_bytes, salt)
+    # Store as string
+    return hashed_bytes.decode("utf-8")
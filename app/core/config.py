@@ -13,10 +13,70 @@ class Settings(BaseSettings):
     DATABASE_URL: str = (
         "sqlite:///./test.db"  # will load url from env but will fallback to this if not found
     )
+    # Read replicas (same URL format). GET requests read from a random replica,
+    # except for clients that wrote within READ_YOUR_WRITES_SECONDS.
+    DATABASE_REPLICA_URLS: list[str] = []
+    READ_YOUR_WRITES_SECONDS: int = 5
+    # Connection pool, per worker process. Every replica and worker can open up to
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW connections; keep the total under Postgres max_connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Replace connections older than this, before the server or a proxy drops them
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # Test each connection with a cheap round trip on checkout
+    DB_POOL_PRE_PING: bool = True
+
+    # Keyset pagination for listing routes
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+
+    # Fuzzy car search: minimum pg_trgm word similarity (0-1) for a match, and how
+    # long the in-process trigram index (non-Postgres databases) may serve
+    # before it is rebuilt to pick up other processes' changes
+    CAR_SEARCH_SIMILARITY_THRESHOLD: float = 0.5
+    CAR_SEARCH_INDEX_TTL_SECONDS: float = 60.0
+
+    # Most items one bulk parts request may carry
+    PARTS_BULK_MAX_ITEMS: int = 500
 
     # JWT Auth
     SECRET_KEY: str = Field(...)
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # Access tokens are trusted without a database lookup, so keep them short-lived
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+
+    # Shared secret for the /internal endpoints, sent as the X-Internal-Token header.
+    # The ingress routes every /api path publicly, so they answer 404 while it is unset.
+    INTERNAL_API_TOKEN: str = ""
+
+    # Token revocation: "memory" is per process, "database" is shared by all replicas
+    TOKEN_REVOCATION_BACKEND: str = "memory"
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 30.0
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100_000
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+
+    # Rate limiting for login and email endpoints: "memory" is per process,
+    # "database" gives all replicas one combined budget
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    LOGIN_RATE_LIMIT_PER_USERNAME: int = 10
+    LOGIN_RATE_LIMIT_PER_IP: int = 50
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 300
+    EMAIL_RATE_LIMIT_PER_ADDRESS: int = 3
+    EMAIL_RATE_LIMIT_PER_IP: int = 20
+    EMAIL_RATE_LIMIT_WINDOW_SECONDS: int = 3600
+    # Networks of the proxies in front of the app (the ingress). Requests from them
+    # are attributed to the client in X-Forwarded-For; others to the peer address.
+    TRUSTED_PROXY_CIDRS: list[str] = []
+
+    # Verified-token cache (per worker process); entries never outlive the token's exp
+    TOKEN_CACHE_TTL_SECONDS: float = 300.0
+    TOKEN_CACHE_MAX_SIZE: int = 4096
+
+    # Authenticated-user cache (per worker process)
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    USER_CACHE_MAX_SIZE: int = 1024
 
     # CORS settings
     ALLOWED_ORIGINS: list[str] = ["http://localhost"]
@@ -26,8 +86,26 @@ class Settings(BaseSettings):
     EMAIL_FROM: str
     SENDGRID_VERIFY_EMAIL_TEMPLATE_ID: str
     SENDGRID_RESET_PASSWORD_TEMPLATE_ID: str
+    # "sendgrid", or "fake" to keep messages in memory (local development, tests)
+    EMAIL_PROVIDER: str = "sendgrid"
+    # Outbox dispatcher: endpoints enqueue, a background task sends with retries
+    EMAIL_DISPATCHER_ENABLED: bool = True
+    EMAIL_DISPATCH_BATCH_SIZE: int = 50
+    EMAIL_DISPATCH_POLL_SECONDS: float = 2.0
+    EMAIL_DISPATCH_MAX_ATTEMPTS: int = 5
+    EMAIL_DISPATCH_BACKOFF_SECONDS: float = 30.0
+    # How long a claimed batch is reserved for its dispatcher; keep it above the
+    # time one batch of provider calls can take
+    EMAIL_DISPATCH_LEASE_SECONDS: float = 300.0
+    # Recipients per provider request for bulk sends (SendGrid allows up to 1000)
+    EMAIL_BULK_BATCH_SIZE: int = 500
     # Hashing settings
     HASH_ALGORITHM: str = "HS256"
+    PASSWORD_HASH_ROUNDS: int = 12
+    # bcrypt runs on a dedicated thread pool; these bound how much of it a worker takes on
+    PASSWORD_HASH_MAX_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10.0
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=True, extra="ignore"
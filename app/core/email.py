@@ -1,13 +1,145 @@
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, From, To
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+from sendgrid.helpers.mail import Mail, From, To, Personalization
 from app.core.logging import logger
 
 from app.core.config import settings
 
 
-def send_email(to_email: str, template_id: str, dynamic_template_data: dict):
+class EmailProvider(ABC):
+    """
+    Delivers templated emails. Implementations raise on failure so callers
+    (the outbox dispatcher) can retry.
+    """
+
+    # SendGrid accepts at most 1000 personalizations per request
+    max_batch_size = 1000
+
+    @abstractmethod
+    def send(self, to_email: str, template_id: str, dynamic_template_data: dict):
+        ...
+
+    @abstractmethod
+    def send_batch(self, template_id: str, recipients: Sequence[Tuple[str, dict]]):
+        """Send one template to many (email, template data) pairs in a single request."""
+
+
+class SendGridEmailProvider(EmailProvider):
+    """
+    Posts to SendGrid's v3 mail/send endpoint through one pooled HTTP client,
+    so consecutive sends (and the dispatcher's threads) reuse keep-alive
+    connections. The sendgrid helpers only build the request bodies; their
+    own client opens a new connection per request.
+    """
+
+    url = "https://api.sendgrid.com/v3/mail/send"
+
+    def __init__(self, api_key: str, from_email: str, timeout: float = 10.0):
+        self.api_key = api_key
+        self.from_email = from_email
+        self._client = httpx.Client(
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=10),
+        )
+
+    def _post(self, message: Mail) -> int:
+        response = self._client.post(self.url, json=message.get())
+        if response.status_code >= 300:
+            raise RuntimeError(f"SendGrid responded with {response.status_code}")
+        return response.status_code
+
+    def send(self, to_email: str, template_id: str, dynamic_template_data: dict):
+        message = Mail(
+            from_email=From(self.from_email),
+            to_emails=To(to_email),
+        )
+        message.template_id = template_id
+        message.dynamic_template_data = dynamic_template_data
+        return self._post(message)
+
+    def send_batch(self, template_id: str, recipients: Sequence[Tuple[str, dict]]):
+        message = Mail(from_email=From(self.from_email))
+        message.template_id = template_id
+        # Each personalization is delivered separately, so recipients never see each other
+        for to_email, dynamic_template_data in recipients:
+            personalization = Personalization()
+            personalization.add_to(To(to_email))
+            personalization.dynamic_template_data = dynamic_template_data
+            message.add_personalization(personalization)
+        return self._post(message)
+
+
+class FakeEmailProvider(EmailProvider):
+    """
+    Keeps messages in memory instead of sending them, for local development,
+    tests and benchmarks. `fail_next` makes the next N sends raise and
+    `latency` simulates the provider's round trip.
+    """
+
+    def __init__(self, fail_next: int = 0, latency: float = 0.0):
+        self.sent: List[dict] = []
+        self.requests = 0
+        self.fail_next = fail_next
+        self.latency = latency
+        self._lock = threading.Lock()
+
+    def send(self, to_email: str, template_id: str, dynamic_template_data: dict):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.requests += 1
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                raise RuntimeError("Simulated provider failure")
+            self.sent.append(
+                {
+                    "to_email": to_email,
+                    "template_id": template_id,
+                    "dynamic_template_data": dynamic_template_data,
+                }
+            )
+        return 202
+
+    def send_batch(self, template_id: str, recipients: Sequence[Tuple[str, dict]]):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.requests += 1
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                raise RuntimeError("Simulated provider failure")
+            self.sent.extend(
+                {
+                    "to_email": to_email,
+                    "template_id": template_id,
+                    "dynamic_template_data": dynamic_template_data,
+                }
+                for to_email, dynamic_template_data in recipients
+            )
+        return 202
+
+
+def get_email_provider() -> EmailProvider:
+    if settings.EMAIL_PROVIDER == "fake":
+        return FakeEmailProvider()
+    return SendGridEmailProvider(settings.SENDGRID_API_KEY, settings.EMAIL_FROM)
+
+
+email_provider = get_email_provider()
+
+
+def send_email(
+    to_email: str, template_id: str, dynamic_template_data: dict
+) -> Optional[int]:
     """
-    Send an email using SendGrid.
+    Send an email immediately through the configured provider.
+    Request handlers should enqueue through the email outbox instead.
     Args:
         to_email (str): Recipient's email address.
         template_id (str): ID of the email template to use.
@@ -15,18 +147,87 @@ def send_email(to_email: str, template_id: str, dynamic_template_data: dict):
     Returns:
         int: HTTP status code of the response if successful, None if an error occurs.
     """
-    message = Mail(
-        from_email=From(settings.EMAIL_FROM),
-        to_emails=To(to_email),
-    )
-    message.template_id = template_id
-    message.dynamic_template_data = dynamic_template_data
-
     try:
-        sg = SendGridAPIClient(settings.SENDGRID_API_KEY)
-        response = sg.send(message)
-        return response.status_code
+        return email_provider.send(to_email, template_id, dynamic_template_data)
     except Exception as e:
         # Log or handle error as needed
         logger.error(f"Failed to send email: {e}")
         return None
+
+
+@dataclass
+class BatchResult:
+    recipients: int
+    seconds: float
+    error: Optional[str] = None
+
+    @property
+    def recipients_per_second(self) -> float:
+        return self.recipients / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class BulkSendReport:
+    batches: List[BatchResult] = field(default_factory=list)
+
+    @property
+    def sent(self) -> int:
+        return sum(b.recipients for b in self.batches if b.error is None)
+
+    @property
+    def failed(self) -> int:
+        return sum(b.recipients for b in self.batches if b.error is not None)
+
+    @property
+    def seconds(self) -> float:
+        return sum(b.seconds for b in self.batches)
+
+
+def send_bulk_email(
+    template_id: str,
+    recipients: Iterable[Tuple[str, dict]],
+    batch_size: Optional[int] = None,
+    provider: Optional[EmailProvider] = None,
+) -> BulkSendReport:
+    """
+    Send one template to many recipients, grouping them into multi-recipient
+    provider requests of at most `batch_size` (capped by the provider's limit).
+    A failed batch is recorded in the report and does not stop later batches.
+    Args:
+        template_id (str): ID of the email template to use.
+        recipients: (email, dynamic template data) pairs; may be a generator.
+        batch_size (int): Recipients per request; defaults to EMAIL_BULK_BATCH_SIZE.
+        provider (EmailProvider): Defaults to the configured provider.
+    Returns:
+        BulkSendReport: Per-batch recipient counts, timings and errors.
+    """
+    provider = provider or email_provider
+    batch_size = min(
+        batch_size or settings.EMAIL_BULK_BATCH_SIZE, provider.max_batch_size
+    )
+    report = BulkSendReport()
+
+    def flush(batch: List[Tuple[str, dict]]):
+        started = time.perf_counter()
+        try:
+            provider.send_batch(template_id, batch)
+            error = None
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Bulk email batch of {len(batch)} failed: {e}")
+        result = BatchResult(len(batch), time.perf_counter() - started, error)
+        report.batches.append(result)
+        logger.info(
+            f"Bulk email batch {len(report.batches)}: {result.recipients} recipients "
+            f"in {result.seconds:.3f}s ({result.recipients_per_second:.0f}/s)"
+        )
+
+    batch: List[Tuple[str, dict]] = []
+    for recipient in recipients:
+        batch.append(recipient)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    return report
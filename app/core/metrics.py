@@ -0,0 +1,16 @@
+from typing import Any, Callable, Dict
+
+# In-process metrics registry. Components register a callable that returns a
+# snapshot of their counters; the internal metrics endpoint reports them all.
+# Values are per worker process, not aggregated across replicas.
+_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_metrics_source(name: str, collector: Callable[[], Dict[str, Any]]):
+    """Register (or replace) a named metrics collector."""
+    _sources[name] = collector
+
+
+def collect_metrics() -> Dict[str, Dict[str, Any]]:
+    """Return a snapshot from every registered collector."""
+    return {name: collector() for name, collector in _sources.items()}
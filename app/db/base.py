@@ -7,3 +7,6 @@ from app.api.models.user import User
 from app.api.models.car import Car
 from app.api.models.build_list import BuildList
 from app.api.models.part import Part
+from app.api.models.revoked_token import RevokedToken
+from app.api.models.rate_limit_counter import RateLimitCounter
+from app.api.models.email_outbox import EmailOutbox
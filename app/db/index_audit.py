@@ -0,0 +1,162 @@
+"""
+Compare the indexes in a Postgres database with the SQLAlchemy models, using
+the server's own usage statistics (pg_stat_user_indexes).
+
+    python -m app.db.index_audit [database_url]
+
+Reports indexes no query has used since the statistics were last reset,
+indexes the models declare but the database lacks (a missed migration),
+indexes the database has but the models do not declare, and foreign keys
+no model index starts with (every lookup by parent scans the table).
+Unique and primary-key indexes are never reported as unused: they enforce
+constraints whether or not anything reads them.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import MetaData, create_engine, text
+from sqlalchemy.engine import Connection
+
+
+@dataclass
+class IndexUsage:
+    table: str
+    name: str
+    scans: int
+    size_bytes: int
+    # Backs a primary key or unique constraint
+    enforces_constraint: bool
+
+
+@dataclass
+class IndexAudit:
+    unused: List[IndexUsage] = field(default_factory=list)
+    missing: List[Tuple[str, str]] = field(default_factory=list)
+    undeclared: List[IndexUsage] = field(default_factory=list)
+    unindexed_foreign_keys: List[Tuple[str, Tuple[str, ...]]] = field(
+        default_factory=list
+    )
+
+    @property
+    def clean(self) -> bool:
+        return not (
+            self.unused
+            or self.missing
+            or self.undeclared
+            or self.unindexed_foreign_keys
+        )
+
+
+USAGE_QUERY = text("""
+    SELECT s.relname AS table_name,
+           s.indexrelname AS index_name,
+           s.idx_scan AS scans,
+           pg_relation_size(s.indexrelid) AS size_bytes,
+           i.indisunique OR i.indisprimary AS enforces_constraint
+    FROM pg_stat_user_indexes AS s
+    JOIN pg_index AS i ON i.indexrelid = s.indexrelid
+    WHERE s.schemaname = current_schema()
+    ORDER BY s.relname, s.indexrelname
+    """)
+
+
+def fetch_index_usage(connection: Connection) -> List[IndexUsage]:
+    """Every index in the current schema with its scan count since the last stats reset."""
+    return [
+        IndexUsage(
+            table=row.table_name,
+            name=row.index_name,
+            scans=row.scans,
+            size_bytes=row.size_bytes,
+            enforces_constraint=row.enforces_constraint,
+        )
+        for row in connection.execute(USAGE_QUERY)
+    ]
+
+
+def unindexed_foreign_keys(metadata: MetaData) -> List[Tuple[str, Tuple[str, ...]]]:
+    """(table, columns) of each foreign key that no declared index or primary key leads with."""
+    result = []
+    for table in metadata.sorted_tables:
+        leading = [tuple(c.name for c in index.columns) for index in table.indexes]
+        leading.append(tuple(c.name for c in table.primary_key.columns))
+        for constraint in table.foreign_key_constraints:
+            columns = tuple(constraint.column_keys)
+            if not any(cols[: len(columns)] == columns for cols in leading):
+                result.append((table.name, columns))
+    return result
+
+
+def audit(metadata: MetaData, usage: Iterable[IndexUsage]) -> IndexAudit:
+    """Classify the database's indexes (`usage`) against the models' `metadata`."""
+    declared = {
+        (table.name, index.name)
+        for table in metadata.sorted_tables
+        for index in table.indexes
+    }
+    # Indexes a model creates with its own DDL (e.g. full-text search)
+    declared |= {
+        (table.name, name)
+        for table in metadata.sorted_tables
+        for name in table.info.get("ddl_indexes", ())
+    }
+    tables = {table.name for table in metadata.sorted_tables}
+    report = IndexAudit(unindexed_foreign_keys=unindexed_foreign_keys(metadata))
+    present = set()
+    for index in usage:
+        if index.table not in tables:  # e.g. alembic_version
+            continue
+        present.add((index.table, index.name))
+        if index.scans == 0 and not index.enforces_constraint:
+            report.unused.append(index)
+        if (index.table, index.name) not in declared and not index.enforces_constraint:
+            report.undeclared.append(index)
+    report.missing = sorted(declared - present)
+    return report
+
+
+def format_report(report: IndexAudit) -> str:
+    lines = []
+    if report.unused:
+        lines.append("Unused indexes (no scans since the statistics were reset):")
+        lines += [
+            f"  {i.table}.{i.name} ({i.size_bytes / 1024:.0f} KiB)"
+            for i in report.unused
+        ]
+    if report.missing:
+        lines.append("Declared in the models but missing from the database:")
+        lines += [f"  {table}.{name}" for table, name in report.missing]
+    if report.undeclared:
+        lines.append("In the database but not declared in the models:")
+        lines += [f"  {i.table}.{i.name} ({i.scans} scans)" for i in report.undeclared]
+    if report.unindexed_foreign_keys:
+        lines.append("Foreign keys without an index leading with their columns:")
+        lines += [
+            f"  {table}({', '.join(columns)})"
+            for table, columns in report.unindexed_foreign_keys
+        ]
+    return "\n".join(lines) or "No index problems found."
+
+
+def main(database_url: Optional[str] = None) -> int:
+    # Imported here so the module can be used without application settings
+    from app.core.config import settings
+    from app.db.base import Base
+
+    engine = create_engine(database_url or settings.DATABASE_URL)
+    if engine.dialect.name != "postgresql":
+        print(
+            "The index audit reads Postgres statistics; DATABASE_URL is not Postgres."
+        )
+        return 2
+    with engine.connect() as connection:
+        report = audit(Base.metadata, fetch_index_usage(connection))
+    engine.dispose()
+    print(format_report(report))
+    return 0 if report.clean else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,84 @@
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class _CheckoutStats:
+    def __init__(self):
+        self.checkouts = 0
+        # Checkouts that found the pool at size + max_overflow and had to queue
+        self.contended = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, seconds: float, contended: bool, timed_out: bool):
+        with self.lock:
+            self.checkouts += 1
+            self.contended += contended
+            self.timeouts += timed_out
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout from the pool, including waits for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = _CheckoutStats()
+
+    def _do_get(self):
+        contended = self.checkedin() == 0 and self.overflow() >= self._max_overflow
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.checkout_stats.record(
+                time.perf_counter() - started, contended, timed_out
+            )
+
+    def recreate(self):
+        # Engine.dispose() swaps in a new pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.checkout_stats = self.checkout_stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """Snapshot of a pool's occupancy and, for instrumented pools, checkout waits."""
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # Connections beyond `size`; negative while the pool is still filling up
+            overflow=pool.overflow(),
+        )
+    checkout_stats = getattr(pool, "checkout_stats", None)
+    if checkout_stats is not None:
+        stats.update(
+            checkouts=checkout_stats.checkouts,
+            contended_checkouts=checkout_stats.contended,
+            timeouts=checkout_stats.timeouts,
+            wait_seconds_total=round(checkout_stats.wait_seconds_total, 6),
+            wait_seconds_max=round(checkout_stats.wait_seconds_max, 6),
+        )
+    return stats
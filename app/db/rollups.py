@@ -0,0 +1,242 @@
+"""
+Per-parent rollups (a count of child rows and a sum over them) that the
+database keeps current with triggers, so reading a build list's part count and
+total price, or a car's build list count and total spend, needs no scan of
+its children. Every write path (the API's RETURNING statements, bulk
+statements, ON DELETE CASCADE) goes through the triggers; the application
+never writes these columns.
+
+Postgres uses statement-level triggers with transition tables, so a statement
+touching many rows applies one aggregated UPDATE per parent. SQLite has only
+row-level triggers. Rollups chain: a part's price changes its build list's
+total_price, whose trigger carries the change to the car's total_spend.
+
+Drift (from writes made with the triggers disabled, or restored backups) is
+repaired in batches by the reconciliation job:
+
+    python -m app.db.rollups [batch_size]
+"""
+
+import asyncio
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    DDL,
+    MetaData,
+    Table,
+    bindparam,
+    event,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+@dataclass(frozen=True)
+class Rollup:
+    child: str
+    parent: str
+    # The child's foreign key to parent.id
+    foreign_key: str
+    # The parent's count of children, and its sum of the child's `value` (NULL counts as 0)
+    count_column: str
+    value: str
+    sum_column: str
+
+
+PART_ROLLUP = Rollup(
+    child="parts",
+    parent="build_lists",
+    foreign_key="build_list_id",
+    count_column="part_count",
+    value="price",
+    sum_column="total_price",
+)
+BUILD_LIST_ROLLUP = Rollup(
+    child="build_lists",
+    parent="cars",
+    foreign_key="car_id",
+    count_column="build_list_count",
+    value="total_price",
+    sum_column="total_spend",
+)
+# Reconciled in this order: cars sum their build lists' (repaired) totals
+ROLLUPS = (PART_ROLLUP, BUILD_LIST_ROLLUP)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _postgres_ddl(rollup: Rollup) -> List[str]:
+    r = rollup
+    changes = {
+        "insert": f"SELECT {r.foreign_key}, 1 AS n, coalesce({r.value}, 0) AS total "
+        "FROM new_rows",
+        "delete": f"SELECT {r.foreign_key}, -1 AS n, -coalesce({r.value}, 0) AS total "
+        "FROM old_rows",
+    }
+    changes["update"] = f"{changes['insert']} UNION ALL {changes['delete']}"
+    transition_tables = {
+        "insert": "NEW TABLE AS new_rows",
+        "delete": "OLD TABLE AS old_rows",
+        "update": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    }
+    statements = []
+    for operation, rows in changes.items():
+        name = f"{r.child}_rollup_{operation}"
+        statements.append(
+            f"CREATE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "
+            f"UPDATE {r.parent} AS p SET {r.count_column} = p.{r.count_column} + d.n, "
+            f"{r.sum_column} = p.{r.sum_column} + d.total "
+            f"FROM (SELECT {r.foreign_key} AS id, sum(n) AS n, sum(total) AS total "
+            f"FROM ({rows}) AS c GROUP BY {r.foreign_key}) AS d "
+            "WHERE p.id = d.id AND (d.n <> 0 OR d.total <> 0); "
+            "RETURN NULL; END $$"
+        )
+        statements.append(
+            f"CREATE TRIGGER {name} AFTER {operation.upper()} ON {r.child} "
+            f"REFERENCING {transition_tables[operation]} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {name}()"
+        )
+    return statements
+
+
+def _sqlite_ddl(rollup: Rollup) -> List[str]:
+    r = rollup
+
+    def apply(row: str, sign: str) -> str:
+        return (
+            f"UPDATE {r.parent} SET {r.count_column} = {r.count_column} {sign} 1, "
+            f"{r.sum_column} = {r.sum_column} {sign} coalesce({row}.{r.value}, 0) "
+            f"WHERE id = {row}.{r.foreign_key};"
+        )
+
+    return [
+        f"CREATE TRIGGER {r.child}_rollup_insert AFTER INSERT ON {r.child} "
+        f"BEGIN {apply('new', '+')} END",
+        f"CREATE TRIGGER {r.child}_rollup_delete AFTER DELETE ON {r.child} "
+        f"BEGIN {apply('old', '-')} END",
+        f"CREATE TRIGGER {r.child}_rollup_update "
+        f"AFTER UPDATE OF {r.value}, {r.foreign_key} ON {r.child} "
+        f"WHEN old.{r.value} IS NOT new.{r.value} "
+        f"OR old.{r.foreign_key} != new.{r.foreign_key} "
+        f"BEGIN {apply('old', '-')} {apply('new', '+')} END",
+    ]
+
+
+def listen_for_create(table: Table, rollup: Rollup):
+    """Create `rollup`'s triggers whenever `table` (its child) is created."""
+    for statement in _postgres_ddl(rollup):
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
+    for statement in _sqlite_ddl(rollup):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    # Postgres keeps trigger functions when the table is dropped
+    for operation in ("insert", "delete", "update"):
+        event.listen(
+            table,
+            "after_drop",
+            DDL(
+                f"DROP FUNCTION IF EXISTS {rollup.child}_rollup_{operation}()"
+            ).execute_if(dialect="postgresql"),
+        )
+
+
+async def reconcile_batch(
+    db: AsyncSession, metadata: MetaData, rollup: Rollup, after_id: int, limit: int
+) -> Tuple[Optional[int], int]:
+    """
+    Recompute `rollup` for up to `limit` parents with id > `after_id` and
+    repair those that drifted. Returns (last parent id, or None when there
+    are no more parents; number repaired). Call within a transaction.
+    """
+    parent, child = metadata.tables[rollup.parent], metadata.tables[rollup.child]
+    count_column = parent.c[rollup.count_column]
+    sum_column = parent.c[rollup.sum_column]
+    # Lock the batch first: a concurrent child write then waits for this
+    # transaction and applies its change on top of the recomputed value
+    ids = (
+        await db.scalars(
+            select(parent.c.id)
+            .where(parent.c.id > after_id)
+            .order_by(parent.c.id)
+            .limit(limit)
+            .with_for_update()
+        )
+    ).all()
+    if not ids:
+        return None, 0
+
+    foreign_key = child.c[rollup.foreign_key]
+    actual = (
+        select(
+            foreign_key.label("id"),
+            func.count().label("n"),
+            func.coalesce(func.sum(child.c[rollup.value]), 0).label("total"),
+        )
+        .where(foreign_key.in_(ids))
+        .group_by(foreign_key)
+        .subquery()
+    )
+    n = func.coalesce(actual.c.n, 0)
+    total = func.coalesce(actual.c.total, 0)
+    drifted = (
+        await db.execute(
+            select(parent.c.id, n, total)
+            .outerjoin(actual, actual.c.id == parent.c.id)
+            .where(parent.c.id.in_(ids))
+            .where(or_(count_column != n, sum_column != total))
+        )
+    ).all()
+    if drifted:
+        await db.execute(
+            update(parent)
+            .where(parent.c.id == bindparam("parent_id"))
+            .values({count_column: bindparam("n"), sum_column: bindparam("total")}),
+            [
+                {"parent_id": parent_id, "n": count, "total": value}
+                for parent_id, count, value in drifted
+            ],
+        )
+    return ids[-1], len(drifted)
+
+
+async def reconcile(
+    session_factory: async_sessionmaker,
+    metadata: MetaData,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, int]:
+    """
+    Repair every rollup, `batch_size` parents per transaction so locks are
+    short. Returns the number of rows repaired per parent table.
+    """
+    repaired = {}
+    for rollup in ROLLUPS:
+        repaired[rollup.parent], after_id = 0, 0
+        while after_id is not None:
+            async with session_factory() as db:
+                after_id, count = await reconcile_batch(
+                    db, metadata, rollup, after_id, batch_size
+                )
+                await db.commit()
+            repaired[rollup.parent] += count
+    return repaired
+
+
+def main(batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    # Imported here so the DDL helpers can be used while the models are defined
+    from app.db.base import Base
+    from app.db.session import AsyncSessionLocal
+
+    repaired = asyncio.run(reconcile(AsyncSessionLocal, Base.metadata, batch_size))
+    for table, count in repaired.items():
+        print(f"{table}: {count} rows repaired")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BATCH_SIZE))
@@ -1,24 +1,138 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import random
+from typing import Any, Dict
+
+from fastapi import Request, Response
+from sqlalchemy import Delete, Insert, Select, Update, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 from app.core.config import get_settings
+from app.core.metrics import register_metrics_source
+from app.db.pool import InstrumentedAsyncQueuePool, pool_stats
 
 # Get settings using the function (which could be overridden in tests)
 settings = get_settings()
 
+# Async drivers for each backend. DATABASE_URL keeps its sync driver (psycopg2)
+# so Alembic can keep using it unchanged.
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """Swap the driver in a database URL for its asyncio equivalent."""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(
+        drivername=f"{parsed.get_backend_name()}+{driver}"
+    ).render_as_string(hide_password=False)
+
+
+def pool_options(url: str) -> Dict[str, Any]:
+    """Engine pool arguments from settings, for every database except in-memory SQLite."""
+    parsed = make_url(url)
+    in_memory = parsed.database in (None, "", ":memory:")
+    if parsed.get_backend_name() == "sqlite" and in_memory:
+        return {}  # one shared connection (StaticPool); there is nothing to size
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def enable_sqlite_foreign_keys(engine: AsyncEngine) -> AsyncEngine:
+    """
+    Turn on foreign key enforcement for every SQLite connection of `engine`
+    (SQLite leaves it off by default), so ON DELETE CASCADE behaves as on
+    Postgres. Other backends are returned unchanged.
+    """
+    if engine.dialect.name == "sqlite":
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _foreign_keys_on(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+    return engine
+
+
 # Create the SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    # pool_pre_ping=True # Optional: helps manage connections
+engine = enable_sqlite_foreign_keys(
+    create_async_engine(
+        async_database_url(settings.DATABASE_URL),
+        **pool_options(settings.DATABASE_URL),
+    )
+)
+register_metrics_source("db_pool", lambda: pool_stats(engine.pool))
+
+# Read replicas; GET requests read from one of these when any are configured
+replica_engines = [
+    enable_sqlite_foreign_keys(
+        create_async_engine(async_database_url(url), **pool_options(url))
+    )
+    for url in settings.DATABASE_REPLICA_URLS
+]
+for index, replica_engine in enumerate(replica_engines):
+    register_metrics_source(
+        f"db_pool_replica_{index}",
+        lambda replica_engine=replica_engine: pool_stats(replica_engine.pool),
+    )
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica when `info["replica_reads"]` is set.
+
+    Writes, flushes and SELECT ... FOR UPDATE always go to the primary (the
+    session's own bind), and the first of them pins the rest of the session to
+    the primary so it reads its own writes. Sessions without the flag (the
+    default) never touch a replica.
+    """
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        if self.info.get("replica_reads") and self.info.get("replicas"):
+            writes = self._flushing or isinstance(clause, (Insert, Update, Delete))
+            locks = isinstance(clause, Select) and clause._for_update_arg is not None
+            if not (writes or locks):
+                return random.choice(self.info["replicas"])
+            self.info["replica_reads"] = False
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+# Create a configured "Session" class. Objects stay loaded after commit:
+# an expired attribute would need a lazy load, which async sessions cannot do
+# implicitly (e.g. while FastAPI serializes the response).
+AsyncSessionLocal = async_sessionmaker(
+    bind=engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    info={"replicas": [replica.sync_engine for replica in replica_engines]},
 )
 
-# Create a configured "Session" class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Set after a write so the same client reads from the primary until replicas catch up
+PRIMARY_COOKIE = "db_read_primary"
+READ_METHODS = ("GET", "HEAD")
 
 
 # Dependency to get a DB session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db(request: Request, response: Response):
+    async with AsyncSessionLocal() as db:
+        if db.sync_session.info["replicas"]:
+            if request.method not in READ_METHODS:
+                response.set_cookie(
+                    key=PRIMARY_COOKIE,
+                    value="1",
+                    max_age=settings.READ_YOUR_WRITES_SECONDS,
+                    httponly=True,
+                    samesite="lax",
+                )
+            elif PRIMARY_COOKIE not in request.cookies:
+                db.sync_session.info["replica_reads"] = True
         yield db
-    finally:
-        db.close()
@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from .core.config import settings
 from .api.endpoints import auth
@@ -5,14 +8,35 @@ from .api.endpoints import users
 from .api.endpoints import cars
 from .api.endpoints import parts
 from .api.endpoints import build_lists
+from .api.endpoints import internal
+from .api.services.email_outbox import email_dispatcher
+from .api.services.rate_limiting import rate_limiter
+from .api.services.token_revocation import revocation_store
 
 # Create database tables (For PoC, use Alembic for production)
 # Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background tasks owned by this worker process
+    background_tasks = [
+        asyncio.create_task(revocation_store.run_sync_loop()),
+        asyncio.create_task(rate_limiter.run_purge_loop()),
+    ]
+    if settings.EMAIL_DISPATCHER_ENABLED:
+        background_tasks.append(asyncio.create_task(email_dispatcher.run()))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_STR}/openapi.json",
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 app.include_router(users.router, prefix=settings.API_STR + "/users", tags=["users"])
@@ -24,6 +48,9 @@ app.include_router(parts.router, prefix=settings.API_STR + "/parts", tags=["part
 app.include_router(
     auth.router, prefix=settings.API_STR + "/auth", tags=["auth"]
 )  # Add auth router (prefix depends on tokenUrl)
+app.include_router(
+    internal.router, prefix=settings.API_STR + "/internal", tags=["internal"]
+)
 
 
 @app.get("/")
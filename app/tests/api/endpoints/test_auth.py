@@ -1,16 +1,17 @@
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.api.schemas.user import UserRead
 from app.api.models.user import User as DBUser  # For direct DB manipulation if needed
 
 # Helper to create a user directly in the DB for testing login
 # This is an alternative to calling the /users/ endpoint if you want to bypass API validation for setup
-from app.api.dependencies.auth import get_password_hash
+from app.api.dependencies.auth import create_access_token, get_password_hash
+from jose import jwt
 
 
-def create_test_user_direct_db(
-    db: Session, username: str, email: str, password: str, disabled: bool = False
+async def create_test_user_direct_db(
+    db: AsyncSession, username: str, email: str, password: str, disabled: bool = False
 ) -> DBUser:
     hashed_password = get_password_hash(password)
     db_user = DBUser(
@@ -20,12 +21,12 @@ def create_test_user_direct_db(
         disabled=disabled,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
-def test_login_for_access_token_success(client: TestClient, db_session: Session):
+def test_login_for_access_token_success(client: TestClient, db_session: AsyncSession):
     username = "auth_test_user_cookie"  # Ensure unique username for test
     password = "auth_test_password"
     email = "auth_test_cookie@example.com"
@@ -82,7 +83,7 @@ def test_login_for_access_token_incorrect_username(client: TestClient):
 
 
 def test_login_for_access_token_incorrect_password(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     username = "auth_test_user_wrong_pass_cookie"  # Ensure unique username
     password = "correct_password"
@@ -101,7 +102,7 @@ def test_login_for_access_token_incorrect_password(
     assert "access_token" not in response.cookies  # Check no cookie is set
 
 
-def test_login_for_access_token_disabled_user(client: TestClient, db_session: Session):
+def test_login_for_access_token_disabled_user(client: TestClient, db_session: AsyncSession):
     username = "disabled_user_cookie"  # Ensure unique username
     password = "password123"
     email = "disabled_cookie@example.com"
@@ -148,3 +149,135 @@ def test_login_for_access_token_disabled_user(client: TestClient, db_session: Se
     assert response.status_code == 400, response.text
     assert response.json()["detail"] == "Inactive user"
     assert "access_token" not in response.cookies  # Ensure no new cookie is set
+
+
+def _create_and_login(client: TestClient, username: str, password: str = "password123"):
+    user_data = {
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": password,
+    }
+    create_response = client.post(f"{settings.API_STR}/users/", json=user_data)
+    assert create_response.status_code == 200, create_response.text
+    login_response = client.post(
+        f"{settings.API_STR}/auth/token",
+        data={"username": username, "password": password},
+    )
+    assert login_response.status_code == 200, login_response.text
+    return create_response.json()
+
+
+def test_login_sets_refresh_token_cookie(client: TestClient, db_session: AsyncSession):
+    _create_and_login(client, "refresh_cookie_user")
+    assert "refresh_token" in client.cookies
+    # The access token identifies the user by id, not username
+    payload = jwt.decode(
+        client.cookies.get("access_token"),
+        settings.SECRET_KEY,
+        algorithms=[settings.HASH_ALGORITHM],
+    )
+    assert payload["type"] == "access"
+    assert payload["dis"] is False
+    assert "ver" in payload and "jti" in payload
+
+
+def test_refresh_rotates_token_pair(client: TestClient, db_session: AsyncSession):
+    user = _create_and_login(client, "refresh_rotate_user")
+    old_access = client.cookies.get("access_token")
+    old_refresh = client.cookies.get("refresh_token")
+
+    response = client.post(f"{settings.API_STR}/auth/refresh")
+    assert response.status_code == 200, response.text
+    assert response.json()["id"] == user["id"]
+    assert response.cookies.get("access_token") not in (None, old_access)
+    assert response.cookies.get("refresh_token") not in (None, old_refresh)
+
+    me = client.get(f"{settings.API_STR}/users/me")
+    assert me.status_code == 200
+
+
+def test_refresh_without_cookie_unauthorized(client: TestClient):
+    response = client.post(f"{settings.API_STR}/auth/refresh")
+    assert response.status_code == 401
+
+
+def test_refresh_rejects_access_token(client: TestClient, db_session: AsyncSession):
+    _create_and_login(client, "refresh_wrong_type_user")
+    access_token = client.cookies.get("access_token")
+    client.cookies.clear()
+    client.cookies.set("refresh_token", access_token)
+    response = client.post(f"{settings.API_STR}/auth/refresh")
+    assert response.status_code == 401
+
+
+def test_password_change_invalidates_other_refresh_tokens(
+    client: TestClient, db_session: AsyncSession
+):
+    user = _create_and_login(client, "refresh_pw_change_user")
+    stale_refresh = client.cookies.get("refresh_token")
+
+    update_response = client.put(
+        f"{settings.API_STR}/users/{user['id']}",
+        json={"current_password": "password123", "password": "newpassword456"},
+    )
+    assert update_response.status_code == 200, update_response.text
+
+    # The session that changed the password got a fresh pair and can still refresh
+    assert client.post(f"{settings.API_STR}/auth/refresh").status_code == 200
+
+    client.cookies.clear()
+    client.cookies.set("refresh_token", stale_refresh)
+    assert client.post(f"{settings.API_STR}/auth/refresh").status_code == 401
+
+
+def test_email_verification_token_is_not_an_access_token(
+    client: TestClient, db_session: AsyncSession
+):
+    user = _create_and_login(client, "purpose_token_user")
+    client.cookies.clear()
+    token = create_access_token(
+        data={"sub": str(user["id"]), "purpose": "verify_email"}
+    )
+    client.cookies.set("access_token", token)
+    assert client.get(f"{settings.API_STR}/users/me").status_code == 401
+
+
+def test_logout_clears_both_cookies(client: TestClient, db_session: AsyncSession):
+    _create_and_login(client, "logout_cookie_user")
+    response = client.post(f"{settings.API_STR}/auth/logout")
+    assert response.status_code == 200
+    set_cookie_headers = response.headers.get_list("set-cookie")
+    assert any(h.startswith("access_token=") for h in set_cookie_headers)
+    assert any(h.startswith("refresh_token=") for h in set_cookie_headers)
+
+
+def test_logout_revokes_access_token(client: TestClient, db_session: AsyncSession):
+    _create_and_login(client, "logout_revoke_user")
+    access_token = client.cookies.get("access_token")
+
+    assert client.post(f"{settings.API_STR}/auth/logout").status_code == 200
+
+    # Replaying the old cookie after logout must fail
+    client.cookies.clear()
+    client.cookies.set("access_token", access_token)
+    assert client.get(f"{settings.API_STR}/users/me").status_code == 401
+
+
+def test_refresh_token_reuse_signs_out_all_sessions(
+    client: TestClient, db_session: AsyncSession
+):
+    _create_and_login(client, "refresh_reuse_user")
+    first_refresh = client.cookies.get("refresh_token")
+
+    assert client.post(f"{settings.API_STR}/auth/refresh").status_code == 200
+    rotated_refresh = client.cookies.get("refresh_token")
+
+    # Replaying the already-used refresh token is rejected...
+    client.cookies.clear()
+    client.cookies.set("refresh_token", first_refresh)
+    assert client.post(f"{settings.API_STR}/auth/refresh").status_code == 401
+
+    # ...and also invalidates the legitimately rotated one
+    client.cookies.clear()
+    client.cookies.set("refresh_token", rotated_refresh)
+    assert client.post(f"{settings.API_STR}/auth/refresh").status_code == 401
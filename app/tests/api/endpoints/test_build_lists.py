@@ -1,5 +1,5 @@
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.schemas.build_list import (
     BuildListRead,
     BuildListCreate,
@@ -75,7 +75,7 @@ def create_car_for_user_cookie_auth(
     return response.json()["id"]
 
 
-def test_create_build_list_success(client: TestClient, db_session: Session):
+def test_create_build_list_success(client: TestClient, db_session: AsyncSession):
     # User logs in, client gets cookie
     user_id_creator = create_and_login_user(client, "creator_bl")
     # Car is created by the logged-in user (cookie sent automatically)
@@ -96,7 +96,7 @@ def test_create_build_list_success(client: TestClient, db_session: Session):
     assert "id" in created_bl
 
 
-def test_create_build_list_unauthenticated(client: TestClient, db_session: Session):
+def test_create_build_list_unauthenticated(client: TestClient, db_session: AsyncSession):
     # Create a temporary user and car to get a valid car_id.
     # This user's cookie will be set on the client.
     _ = create_and_login_user(client, "temp_owner_bl_unauth")
@@ -111,7 +111,7 @@ def test_create_build_list_unauthenticated(client: TestClient, db_session: Sessi
     assert response.status_code == 401
 
 
-def test_create_build_list_car_not_found(client: TestClient, db_session: Session):
+def test_create_build_list_car_not_found(client: TestClient, db_session: AsyncSession):
     # User logs in, client gets cookie
     _ = create_and_login_user(client, "car_not_found_bl")
     non_existent_car_id = 999999
@@ -125,7 +125,7 @@ def test_create_build_list_car_not_found(client: TestClient, db_session: Session
     assert response.json()["detail"] == "Car not found"
 
 
-def test_create_build_list_for_other_users_car(client: TestClient, db_session: Session):
+def test_create_build_list_for_other_users_car(client: TestClient, db_session: AsyncSession):
     # User A logs in and creates a car
     _ = create_and_login_user(
         client, "userA_car_owner_bl"
@@ -150,7 +150,7 @@ def test_create_build_list_for_other_users_car(client: TestClient, db_session: S
     )
 
 
-def test_read_build_list_success(client: TestClient, db_session: Session):
+def test_read_build_list_success(client: TestClient, db_session: AsyncSession):
     # User logs in to create the build list
     user_id_reader = create_and_login_user(client, "reader_bl")
     car_id = create_car_for_user_cookie_auth(client, "Mazda", "MX-5")
@@ -178,7 +178,7 @@ def test_read_build_list_success(client: TestClient, db_session: Session):
     # assert read_bl_data["owner_id"] == user_id_reader # If owner_id is part of public read
 
 
-def test_read_build_list_not_found(client: TestClient, db_session: Session):
+def test_read_build_list_not_found(client: TestClient, db_session: AsyncSession):
     response = client.get(
         f"{settings.API_STR}/build_lists/999999"
     )  # Assuming this ID won't exist
@@ -186,7 +186,7 @@ def test_read_build_list_not_found(client: TestClient, db_session: Session):
     assert response.json()["detail"] == "Build List not found"
 
 
-def test_update_own_build_list_success(client: TestClient, db_session: Session):
+def test_update_own_build_list_success(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "updater_bl")  # Sets cookie
     car_id = create_car_for_user_cookie_auth(client, "Nissan", "GT-R")  # Uses cookie
     build_list_data_initial = {"name": "Initial GT-R Build", "car_id": car_id}
@@ -211,7 +211,7 @@ def test_update_own_build_list_success(client: TestClient, db_session: Session):
 
 
 def test_update_own_build_list_change_car_success(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     _ = create_and_login_user(client, "car_changer_bl")  # Sets cookie
     car_id_1 = create_car_for_user_cookie_auth(client, "Subaru", "WRX")  # Uses cookie
@@ -236,7 +236,7 @@ def test_update_own_build_list_change_car_success(
     assert updated_bl["name"] == build_list_data_initial["name"]
 
 
-def test_update_build_list_unauthenticated(client: TestClient, db_session: Session):
+def test_update_build_list_unauthenticated(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "owner_for_update_unauth_bl")  # Sets cookie
     car_id = create_car_for_user_cookie_auth(client)  # Uses cookie
     bl_data = {"name": "Some Build", "car_id": car_id}
@@ -255,7 +255,7 @@ def test_update_build_list_unauthenticated(client: TestClient, db_session: Sessi
     assert response.status_code == 401
 
 
-def test_update_build_list_not_found(client: TestClient, db_session: Session):
+def test_update_build_list_not_found(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "updater_bl_notfound")  # Sets cookie
     update_payload = {"name": "Update Non Existent"}
     response = client.put(
@@ -266,7 +266,7 @@ def test_update_build_list_not_found(client: TestClient, db_session: Session):
 
 
 def test_update_other_users_build_list_forbidden(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     # User A logs in and creates a car and a build list
     _ = create_and_login_user(client, "userA_bl_owner")  # Client has User A's cookie
@@ -295,7 +295,7 @@ def test_update_other_users_build_list_forbidden(
 
 
 def test_update_build_list_to_other_users_car_forbidden(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     # User A logs in, creates their own car and build list
     _ = create_and_login_user(
@@ -338,7 +338,7 @@ def test_update_build_list_to_other_users_car_forbidden(
 
 
 def test_update_build_list_to_non_existent_car_not_found(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     _ = create_and_login_user(client, "bl_to_non_car_updater")  # Sets cookie
     car_id_own = create_car_for_user_cookie_auth(
@@ -362,7 +362,7 @@ def test_update_build_list_to_non_existent_car_not_found(
     )
 
 
-def test_delete_own_build_list_success(client: TestClient, db_session: Session):
+def test_delete_own_build_list_success(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "deleter_bl")  # Sets cookie
     car_id = create_car_for_user_cookie_auth(client, "Lexus", "LC500")  # Uses cookie
     bl_data = {"name": "LC500 Project", "car_id": car_id}
@@ -383,7 +383,7 @@ def test_delete_own_build_list_success(client: TestClient, db_session: Session):
     assert get_response.status_code == 404
 
 
-def test_delete_build_list_unauthenticated(client: TestClient, db_session: Session):
+def test_delete_build_list_unauthenticated(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "owner_for_delete_unauth_bl")  # Sets cookie
     car_id = create_car_for_user_cookie_auth(client)  # Uses cookie
     bl_data = {"name": "Build to be deleted unauth", "car_id": car_id}
@@ -400,7 +400,7 @@ def test_delete_build_list_unauthenticated(client: TestClient, db_session: Sessi
     assert response.status_code == 401
 
 
-def test_delete_build_list_not_found(client: TestClient, db_session: Session):
+def test_delete_build_list_not_found(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "deleter_bl_notfound")  # Sets cookie
     response = client.delete(
         f"{settings.API_STR}/build_lists/666666"
@@ -410,7 +410,7 @@ def test_delete_build_list_not_found(client: TestClient, db_session: Session):
 
 
 def test_delete_other_users_build_list_forbidden(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     # User A logs in and creates a car and a build list
     _ = create_and_login_user(
@@ -439,7 +439,7 @@ def test_delete_other_users_build_list_forbidden(
 
 
 # Tests for read_build_lists_by_car
-def test_read_build_lists_by_car_success(client: TestClient, db_session: Session):
+def test_read_build_lists_by_car_success(client: TestClient, db_session: AsyncSession):
     user_id = create_and_login_user(client, "owner_for_bl_by_car")
     car_id = create_car_for_user_cookie_auth(client, "Mazda", "RX-7")
 
@@ -476,7 +476,7 @@ def test_read_build_lists_by_car_success(client: TestClient, db_session: Session
             assert bl["description"] == bl_data2["description"]
 
 
-def test_read_build_lists_by_car_empty(client: TestClient, db_session: Session):
+def test_read_build_lists_by_car_empty(client: TestClient, db_session: AsyncSession):
     user_id = create_and_login_user(client, "owner_for_bl_by_car_empty")
     car_id = create_car_for_user_cookie_auth(client, "Subaru", "BRZ")
 
@@ -491,7 +491,7 @@ def test_read_build_lists_by_car_empty(client: TestClient, db_session: Session):
     assert len(build_lists) == 0
 
 
-def test_read_build_lists_by_car_car_not_found(client: TestClient, db_session: Session):
+def test_read_build_lists_by_car_car_not_found(client: TestClient, db_session: AsyncSession):
     non_existent_car_id = 999888
     
     client.cookies.clear() # Endpoint is public
@@ -501,3 +501,177 @@ def test_read_build_lists_by_car_car_not_found(client: TestClient, db_session: S
     build_lists = response.json()
     assert isinstance(build_lists, list)
     assert len(build_lists) == 0
+
+
+# --- Query counts: each write is a single RETURNING statement ---
+
+
+def _verbs(statements):
+    return [statement.split()[0] for statement in statements]
+
+
+def test_build_list_writes_use_one_statement(
+    client: TestClient, db_session: AsyncSession, sql_statements: list
+):
+    _ = create_and_login_user(client, "bl_query_count")
+    car_id = create_car_for_user_cookie_auth(client, "Mazda", "MX-5")
+    other_car_id = create_car_for_user_cookie_auth(client, "Mazda", "RX-7")
+
+    sql_statements.clear()
+    response = client.post(
+        f"{settings.API_STR}/build-lists/", json={"name": "Roadster", "car_id": car_id}
+    )
+    assert response.status_code == 200, response.text
+    build_list_id = response.json()["id"]
+    # The car ownership check, then the write
+    assert _verbs(sql_statements) == ["SELECT", "INSERT"]
+
+    sql_statements.clear()
+    response = client.put(
+        f"{settings.API_STR}/build-lists/{build_list_id}",
+        json={"name": "Rotary", "car_id": other_car_id},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["car_id"] == other_car_id
+    assert _verbs(sql_statements) == ["SELECT", "SELECT", "UPDATE"]
+
+    sql_statements.clear()
+    response = client.delete(f"{settings.API_STR}/build-lists/{build_list_id}")
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "Rotary"
+    assert _verbs(sql_statements) == ["SELECT", "DELETE"]
+
+
+def test_delete_build_list_cascades_to_parts(
+    client: TestClient, db_session: AsyncSession
+):
+    _ = create_and_login_user(client, "bl_cascade")
+    car_id = create_car_for_user_cookie_auth(client)
+    response = client.post(
+        f"{settings.API_STR}/build-lists/", json={"name": "Doomed", "car_id": car_id}
+    )
+    build_list_id = response.json()["id"]
+    response = client.post(
+        f"{settings.API_STR}/parts/",
+        json={"name": "Seat", "build_list_id": build_list_id},
+    )
+    part_id = response.json()["id"]
+
+    response = client.delete(f"{settings.API_STR}/build-lists/{build_list_id}")
+    assert response.status_code == 200, response.text
+    assert client.get(f"{settings.API_STR}/parts/{part_id}").status_code == 404
+
+
+# --- PATCH: the ownership checks are part of the UPDATE ---
+
+
+def test_patch_build_list_move_is_one_statement(
+    client: TestClient, db_session: AsyncSession, sql_statements: list
+):
+    _ = create_and_login_user(client, "bl_patcher")
+    car_id = create_car_for_user_cookie_auth(client, "Nissan", "Skyline")
+    other_car_id = create_car_for_user_cookie_auth(client, "Nissan", "Silvia")
+    response = client.post(
+        f"{settings.API_STR}/build-lists/", json={"name": "Drift", "car_id": car_id}
+    )
+    build_list_id = response.json()["id"]
+
+    sql_statements.clear()
+    response = client.patch(
+        f"{settings.API_STR}/build-lists/{build_list_id}",
+        json={"car_id": other_car_id},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["car_id"] == other_car_id
+    assert response.json()["name"] == "Drift"
+    assert _verbs(sql_statements) == ["UPDATE"]
+
+
+def test_patch_build_list_to_other_users_car_forbidden(
+    client: TestClient, db_session: AsyncSession
+):
+    _ = create_and_login_user(client, "bl_patch_victim")
+    victim_car_id = create_car_for_user_cookie_auth(client)
+
+    client.cookies.clear()
+    _ = create_and_login_user(client, "bl_patch_mover")
+    car_id = create_car_for_user_cookie_auth(client)
+    response = client.post(
+        f"{settings.API_STR}/build-lists/", json={"name": "Mine", "car_id": car_id}
+    )
+    build_list_id = response.json()["id"]
+
+    response = client.patch(
+        f"{settings.API_STR}/build-lists/{build_list_id}",
+        json={"car_id": victim_car_id},
+    )
+    assert response.status_code == 403
+    assert (
+        response.json()["detail"]
+        == "Not authorized to associate build list with the new car"
+    )
+
+    response = client.patch(
+        f"{settings.API_STR}/build-lists/{build_list_id}", json={"car_id": 555555}
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "New car with id 555555 not found"
+
+
+def test_patch_build_list_rejects_null_for_required_fields(
+    client: TestClient, db_session: AsyncSession
+):
+    _ = create_and_login_user(client, "bl_patch_nulls")
+    car_id = create_car_for_user_cookie_auth(client)
+    response = client.post(
+        f"{settings.API_STR}/build-lists/", json={"name": "Kept", "car_id": car_id}
+    )
+    url = f"{settings.API_STR}/build-lists/{response.json()['id']}"
+
+    for field in ("name", "car_id"):
+        response = client.patch(url, json={field: None})
+        assert response.status_code == 422, response.text
+        assert response.json()["detail"][0]["loc"] == ["body", field]
+    response = client.patch(url, json={"description": None})
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "Kept"
+
+
+# --- Nested read: car, build list and parts in a fixed number of queries ---
+
+
+def test_read_build_list_full_is_two_queries(
+    client: TestClient, db_session: AsyncSession, sql_statements: list
+):
+    _ = create_and_login_user(client, "bl_full_reader")
+    car_id = create_car_for_user_cookie_auth(client, "Toyota", "AE86")
+    build_list_id = client.post(
+        f"{settings.API_STR}/build-lists/", json={"name": "Touge", "car_id": car_id}
+    ).json()["id"]
+    url = f"{settings.API_STR}/build-lists/{build_list_id}/full"
+
+    sql_statements.clear()
+    response = client.get(url)
+    assert response.status_code == 200, response.text
+    assert response.json()["parts"] == []
+    assert _verbs(sql_statements) == ["SELECT", "SELECT"]
+
+    for n in range(12):
+        client.post(
+            f"{settings.API_STR}/parts/",
+            json={"name": f"Part {n}", "price": 10, "build_list_id": build_list_id},
+        )
+    sql_statements.clear()
+    response = client.get(url)
+    assert response.status_code == 200, response.text
+    # The same two queries for twelve parts
+    assert _verbs(sql_statements) == ["SELECT", "SELECT"]
+    full = response.json()
+    assert full["id"] == build_list_id
+    assert full["car"]["id"] == car_id
+    assert full["car"]["model"] == "AE86"
+    assert [part["name"] for part in full["parts"]] == [f"Part {n}" for n in range(12)]
+    # Fresh rollups, though the session already held the build list
+    assert (full["part_count"], full["total_price"]) == (12, 120)
+
+    assert client.get(f"{settings.API_STR}/build-lists/999999/full").status_code == 404
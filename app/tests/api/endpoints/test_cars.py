@@ -1,5 +1,5 @@
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.api.schemas.car import CarRead, CarCreate, CarUpdate
 
@@ -55,7 +55,7 @@ def create_and_login_user(
 # --- Test Cases ---
 
 
-def test_create_car_success(client: TestClient, db_session: Session):
+def test_create_car_success(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "creator_car")  # Logs in user, client gets cookie
 
     car_data = {"make": "Honda", "model": "Civic", "year": 2022, "trim": "Sport"}
@@ -70,14 +70,14 @@ def test_create_car_success(client: TestClient, db_session: Session):
     assert "user_id" in created_car  # Assuming user_id is part of CarRead
 
 
-def test_create_car_unauthenticated(client: TestClient, db_session: Session):
+def test_create_car_unauthenticated(client: TestClient, db_session: AsyncSession):
     client.cookies.clear()  # Ensure no auth cookie
     car_data = {"make": "Toyota", "model": "Corolla", "year": 2021}
     response = client.post(f"{settings.API_STR}/cars/", json=car_data)
     assert response.status_code == 401  # Expect unauthorized
 
 
-def test_read_car_success(client: TestClient, db_session: Session):
+def test_read_car_success(client: TestClient, db_session: AsyncSession):
     user_id = create_and_login_user(client, "reader_car")
     car_data_payload = {"make": "Mazda", "model": "3", "year": 2020}
     create_response = client.post(f"{settings.API_STR}/cars/", json=car_data_payload)
@@ -96,12 +96,12 @@ def test_read_car_success(client: TestClient, db_session: Session):
     assert read_car_data["user_id"] == user_id
 
 
-def test_read_car_not_found(client: TestClient, db_session: Session):
+def test_read_car_not_found(client: TestClient, db_session: AsyncSession):
     response = client.get(f"{settings.API_STR}/cars/999999")  # Non-existent ID
     assert response.status_code == 404
 
 
-def test_update_own_car_success(client: TestClient, db_session: Session):
+def test_update_own_car_success(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "updater_car")  # Logs in, client gets cookie
 
     initial_car_data = {"make": "Nissan", "model": "Altima", "year": 2019}
@@ -120,7 +120,7 @@ def test_update_own_car_success(client: TestClient, db_session: Session):
     assert updated_car["make"] == initial_car_data["make"]  # Make should be unchanged
 
 
-def test_update_car_unauthenticated(client: TestClient, db_session: Session):
+def test_update_car_unauthenticated(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "owner_for_update_unauth_car")
     car_data = {"make": "Subaru", "model": "WRX", "year": 2021}
     create_response = client.post(f"{settings.API_STR}/cars/", json=car_data)
@@ -133,7 +133,7 @@ def test_update_car_unauthenticated(client: TestClient, db_session: Session):
     assert response.status_code == 401
 
 
-def test_update_other_users_car_forbidden(client: TestClient, db_session: Session):
+def test_update_other_users_car_forbidden(client: TestClient, db_session: AsyncSession):
     # User A creates a car
     _ = create_and_login_user(client, "userA_car_owner")  # Client has User A's cookie
     car_data_a = {"make": "Ford", "model": "Focus", "year": 2018}
@@ -153,7 +153,7 @@ def test_update_other_users_car_forbidden(client: TestClient, db_session: Sessio
     assert response.json()["detail"] == "Not authorized to update this car"
 
 
-def test_delete_own_car_success(client: TestClient, db_session: Session):
+def test_delete_own_car_success(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "deleter_car")  # Logs in, client gets cookie
     car_data = {"make": "Kia", "model": "Stinger", "year": 2020}
     create_response = client.post(f"{settings.API_STR}/cars/", json=car_data)
@@ -171,7 +171,7 @@ def test_delete_own_car_success(client: TestClient, db_session: Session):
     assert get_response.status_code == 404
 
 
-def test_delete_car_unauthenticated(client: TestClient, db_session: Session):
+def test_delete_car_unauthenticated(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "owner_for_delete_unauth_car")
     car_data = {"make": "Hyundai", "model": "Elantra", "year": 2019}
     create_response = client.post(f"{settings.API_STR}/cars/", json=car_data)
@@ -183,7 +183,7 @@ def test_delete_car_unauthenticated(client: TestClient, db_session: Session):
     assert response.status_code == 401
 
 
-def test_delete_other_users_car_forbidden(client: TestClient, db_session: Session):
+def test_delete_other_users_car_forbidden(client: TestClient, db_session: AsyncSession):
     # User A creates a car
     _ = create_and_login_user(
         client, "userA_car_owner_del"
@@ -206,7 +206,7 @@ def test_delete_other_users_car_forbidden(client: TestClient, db_session: Sessio
     assert response.json()["detail"] == "Not authorized to delete this car"
 
 
-def test_update_car_not_found(client: TestClient, db_session: Session):
+def test_update_car_not_found(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "updater_car_notfound")  # Sets cookie
     update_payload = {"make": "NonExistent"}
     response = client.put(
@@ -216,7 +216,7 @@ def test_update_car_not_found(client: TestClient, db_session: Session):
     assert response.json()["detail"] == "Car not found"
 
 
-def test_delete_car_not_found(client: TestClient, db_session: Session):
+def test_delete_car_not_found(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "deleter_car_notfound")  # Sets cookie
     response = client.delete(
         f"{settings.API_STR}/cars/777777"
@@ -227,7 +227,7 @@ def test_delete_car_not_found(client: TestClient, db_session: Session):
 
 # --- Tests for read_cars_by_user ---
 
-def test_read_cars_by_user_success(client: TestClient, db_session: Session):
+def test_read_cars_by_user_success(client: TestClient, db_session: AsyncSession):
     # Create a user and log them in to create cars
     user_id = create_and_login_user(client, "car_owner_for_list")
 
@@ -267,7 +267,7 @@ def test_read_cars_by_user_success(client: TestClient, db_session: Session):
             assert car["trim"] == car_data2["trim"]
 
 
-def test_read_cars_by_user_no_cars(client: TestClient, db_session: Session):
+def test_read_cars_by_user_no_cars(client: TestClient, db_session: AsyncSession):
     # Create a user but no cars for them
     user_id = create_and_login_user(client, "car_owner_no_cars")
 
@@ -281,7 +281,7 @@ def test_read_cars_by_user_no_cars(client: TestClient, db_session: Session):
     assert len(cars_list) == 0
 
 
-def test_read_cars_by_user_non_existent_user(client: TestClient, db_session: Session):
+def test_read_cars_by_user_non_existent_user(client: TestClient, db_session: AsyncSession):
     non_existent_user_id = 9999999
 
     # Clear cookies as the endpoint is public
@@ -292,3 +292,89 @@ def test_read_cars_by_user_non_existent_user(client: TestClient, db_session: Ses
     cars_list = response.json()
     assert isinstance(cars_list, list)
     assert len(cars_list) == 0
+
+
+# --- Query counts: each write is a single RETURNING statement ---
+
+
+def _verbs(statements):
+    return [statement.split()[0] for statement in statements]
+
+
+def test_car_writes_use_one_statement(
+    client: TestClient, db_session: AsyncSession, sql_statements: list
+):
+    _ = create_and_login_user(client, "car_query_count")
+
+    sql_statements.clear()
+    response = client.post(
+        f"{settings.API_STR}/cars/", json={"make": "Audi", "model": "S4", "year": 2020}
+    )
+    assert response.status_code == 200, response.text
+    car_id = response.json()["id"]
+    assert _verbs(sql_statements) == ["INSERT"]
+
+    sql_statements.clear()
+    response = client.put(f"{settings.API_STR}/cars/{car_id}", json={"trim": "Prestige"})
+    assert response.status_code == 200, response.text
+    assert response.json()["trim"] == "Prestige"
+    # The ownership check, then the write
+    assert _verbs(sql_statements) == ["SELECT", "UPDATE"]
+
+    sql_statements.clear()
+    response = client.delete(f"{settings.API_STR}/cars/{car_id}")
+    assert response.status_code == 200, response.text
+    assert response.json()["trim"] == "Prestige"
+    assert _verbs(sql_statements) == ["SELECT", "DELETE"]
+
+
+# --- PATCH: the ownership check is part of the UPDATE ---
+
+
+def test_patch_car_is_one_statement(
+    client: TestClient, db_session: AsyncSession, sql_statements: list
+):
+    _ = create_and_login_user(client, "car_patcher")
+    car_data = {"make": "Volvo", "model": "240", "year": 1988}
+    car_id = client.post(f"{settings.API_STR}/cars/", json=car_data).json()["id"]
+
+    sql_statements.clear()
+    response = client.patch(f"{settings.API_STR}/cars/{car_id}", json={"trim": "GL"})
+    assert response.status_code == 200, response.text
+    assert response.json()["trim"] == "GL"
+    assert response.json()["model"] == "240"
+    assert _verbs(sql_statements) == ["UPDATE"]
+
+
+def test_patch_car_not_found_or_forbidden(client: TestClient, db_session: AsyncSession):
+    _ = create_and_login_user(client, "car_patch_owner")
+    car_data = {"make": "Volvo", "model": "740", "year": 1990}
+    car_id = client.post(f"{settings.API_STR}/cars/", json=car_data).json()["id"]
+
+    client.cookies.clear()
+    _ = create_and_login_user(client, "car_patch_attacker")
+    response = client.patch(f"{settings.API_STR}/cars/{car_id}", json={"trim": "GLE"})
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Not authorized to update this car"
+
+    response = client.patch(f"{settings.API_STR}/cars/666666", json={"trim": "GLE"})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Car not found"
+
+
+def test_patch_car_rejects_null_for_required_fields(
+    client: TestClient, db_session: AsyncSession
+):
+    _ = create_and_login_user(client, "car_patch_nulls")
+    car_data = {"make": "Volvo", "model": "940", "year": 1994}
+    car_id = client.post(f"{settings.API_STR}/cars/", json=car_data).json()["id"]
+    url = f"{settings.API_STR}/cars/{car_id}"
+
+    for field in ("make", "model", "year"):
+        response = client.patch(url, json={field: None})
+        assert response.status_code == 422, response.text
+        assert response.json()["detail"][0]["loc"] == ["body", field]
+    # Nullable columns can still be cleared
+    response = client.patch(url, json={"trim": None})
+    assert response.status_code == 200, response.text
+    assert client.get(url).json()["make"] == "Volvo"
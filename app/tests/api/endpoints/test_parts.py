@@ -1,7 +1,8 @@
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.api.schemas.part import PartRead, PartCreate, PartUpdate
+from app.api.dependencies.pagination import NEXT_CURSOR_HEADER
 
 
 # Helper function to create a user and log them in (sets cookie on client)
@@ -86,7 +87,7 @@ def create_build_list_for_car_cookie_auth(
 # --- Test Cases ---
 
 
-def test_create_part_success(client: TestClient, db_session: Session):
+def test_create_part_success(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "creator_part")
     car_id = create_car_for_user_cookie_auth(client)
     build_list_id = create_build_list_for_car_cookie_auth(client, car_id)
@@ -105,7 +106,7 @@ def test_create_part_success(client: TestClient, db_session: Session):
     assert "id" in created_part
 
 
-def test_create_part_unauthenticated(client: TestClient, db_session: Session):
+def test_create_part_unauthenticated(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "temp_owner_part_unauth")
     car_id_temp = create_car_for_user_cookie_auth(client)
     build_list_id_temp = create_build_list_for_car_cookie_auth(client, car_id_temp)
@@ -116,7 +117,7 @@ def test_create_part_unauthenticated(client: TestClient, db_session: Session):
     assert response.status_code == 401
 
 
-def test_create_part_build_list_not_found(client: TestClient, db_session: Session):
+def test_create_part_build_list_not_found(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "part_bl_not_found")
     non_existent_bl_id = 999888
     part_data = {
@@ -129,7 +130,7 @@ def test_create_part_build_list_not_found(client: TestClient, db_session: Sessio
 
 
 def test_create_part_for_other_users_build_list_forbidden(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     # User A creates a car and build list
     _ = create_and_login_user(client, "userA_part_bl_owner")
@@ -150,7 +151,7 @@ def test_create_part_for_other_users_build_list_forbidden(
     )
 
 
-def test_read_part_success(client: TestClient, db_session: Session):
+def test_read_part_success(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "reader_part")
     car_id = create_car_for_user_cookie_auth(client)
     build_list_id = create_build_list_for_car_cookie_auth(client, car_id)
@@ -167,13 +168,13 @@ def test_read_part_success(client: TestClient, db_session: Session):
     assert read_part_data["name"] == part_data_payload["name"]
 
 
-def test_read_part_not_found(client: TestClient, db_session: Session):
+def test_read_part_not_found(client: TestClient, db_session: AsyncSession):
     response = client.get(f"{settings.API_STR}/parts/777666")
     assert response.status_code == 404
     assert response.json()["detail"] == "part not found"  # As per parts.py endpoint
 
 
-def test_update_own_part_success(client: TestClient, db_session: Session):
+def test_update_own_part_success(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "updater_part")
     car_id = create_car_for_user_cookie_auth(client)
     build_list_id = create_build_list_for_car_cookie_auth(client, car_id)
@@ -195,7 +196,7 @@ def test_update_own_part_success(client: TestClient, db_session: Session):
 
 
 def test_update_own_part_change_build_list_success(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     user_id = create_and_login_user(client, "part_bl_changer")
     car_id = create_car_for_user_cookie_auth(client)
@@ -218,7 +219,7 @@ def test_update_own_part_change_build_list_success(
     assert updated_part["build_list_id"] == build_list_id_2
 
 
-def test_update_part_unauthenticated(client: TestClient, db_session: Session):
+def test_update_part_unauthenticated(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "owner_for_update_unauth_part")
     car_id = create_car_for_user_cookie_auth(client)
     build_list_id = create_build_list_for_car_cookie_auth(client, car_id)
@@ -233,7 +234,7 @@ def test_update_part_unauthenticated(client: TestClient, db_session: Session):
     assert response.status_code == 401
 
 
-def test_update_part_not_found(client: TestClient, db_session: Session):
+def test_update_part_not_found(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "updater_part_notfound")
     update_payload = {"name": "Update Non Existent Part"}
     response = client.put(f"{settings.API_STR}/parts/555444", json=update_payload)
@@ -241,7 +242,7 @@ def test_update_part_not_found(client: TestClient, db_session: Session):
     assert response.json()["detail"] == "part not found"
 
 
-def test_update_other_users_part_forbidden(client: TestClient, db_session: Session):
+def test_update_other_users_part_forbidden(client: TestClient, db_session: AsyncSession):
     # User A creates car, build list, and part
     _ = create_and_login_user(client, "userA_part_owner_update")
     car_id_a = create_car_for_user_cookie_auth(client)
@@ -262,7 +263,7 @@ def test_update_other_users_part_forbidden(client: TestClient, db_session: Sessi
 
 
 def test_update_part_to_other_users_build_list_forbidden(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     # User A creates their car, build list, and part
     _ = create_and_login_user(client, "userA_part_bl_switcher")
@@ -298,7 +299,7 @@ def test_update_part_to_other_users_build_list_forbidden(
 
 
 def test_update_part_to_non_existent_build_list_not_found(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     _ = create_and_login_user(client, "part_to_non_bl_updater")
     car_id = create_car_for_user_cookie_auth(client)
@@ -318,7 +319,7 @@ def test_update_part_to_non_existent_build_list_not_found(
     )
 
 
-def test_delete_own_part_success(client: TestClient, db_session: Session):
+def test_delete_own_part_success(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "deleter_part")
     car_id = create_car_for_user_cookie_auth(client)
     build_list_id = create_build_list_for_car_cookie_auth(client, car_id)
@@ -337,7 +338,7 @@ def test_delete_own_part_success(client: TestClient, db_session: Session):
     assert get_response.status_code == 404
 
 
-def test_delete_part_unauthenticated(client: TestClient, db_session: Session):
+def test_delete_part_unauthenticated(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "owner_for_delete_unauth_part")
     car_id = create_car_for_user_cookie_auth(client)
     build_list_id = create_build_list_for_car_cookie_auth(client, car_id)
@@ -351,14 +352,14 @@ def test_delete_part_unauthenticated(client: TestClient, db_session: Session):
     assert response.status_code == 401
 
 
-def test_delete_part_not_found(client: TestClient, db_session: Session):
+def test_delete_part_not_found(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "deleter_part_notfound")
     response = client.delete(f"{settings.API_STR}/parts/333222")
     assert response.status_code == 404
     assert response.json()["detail"] == "part not found"
 
 
-def test_delete_other_users_part_forbidden(client: TestClient, db_session: Session):
+def test_delete_other_users_part_forbidden(client: TestClient, db_session: AsyncSession):
     # User A creates car, build list, and part
     _ = create_and_login_user(client, "userA_part_owner_del")
     car_id_a = create_car_for_user_cookie_auth(client)
@@ -378,7 +379,7 @@ def test_delete_other_users_part_forbidden(client: TestClient, db_session: Sessi
 
 
 # Tests for read_parts_by_build_list
-def test_read_parts_by_build_list_success(client: TestClient, db_session: Session):
+def test_read_parts_by_build_list_success(client: TestClient, db_session: AsyncSession):
     user_id = create_and_login_user(client, "owner_for_parts_by_bl")
     car_id = create_car_for_user_cookie_auth(client)
     build_list_id = create_build_list_for_car_cookie_auth(client, car_id, "BL_for_Parts_Read")
@@ -426,7 +427,7 @@ def test_read_parts_by_build_list_success(client: TestClient, db_session: Sessio
             assert part["manufacturer"] == part_data2["manufacturer"]
 
 
-def test_read_parts_by_build_list_empty(client: TestClient, db_session: Session):
+def test_read_parts_by_build_list_empty(client: TestClient, db_session: AsyncSession):
     user_id = create_and_login_user(client, "owner_for_empty_parts_by_bl")
     car_id = create_car_for_user_cookie_auth(client)
     build_list_id = create_build_list_for_car_cookie_auth(
@@ -445,7 +446,7 @@ def test_read_parts_by_build_list_empty(client: TestClient, db_session: Session)
 
 
 def test_read_parts_by_build_list_build_list_not_found(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     non_existent_build_list_id = 999666
 
@@ -458,3 +459,398 @@ def test_read_parts_by_build_list_build_list_not_found(
     parts_list = response.json()
     assert isinstance(parts_list, list)
     assert len(parts_list) == 0
+
+
+# --- Query counts: each write is a single RETURNING statement ---
+
+
+def _verbs(statements):
+    return [statement.split()[0] for statement in statements]
+
+
+def test_part_writes_use_one_statement(
+    client: TestClient, db_session: AsyncSession, sql_statements: list
+):
+    _ = create_and_login_user(client, "part_query_count")
+    car_id = create_car_for_user_cookie_auth(client)
+    build_list_ids = [
+        client.post(
+            f"{settings.API_STR}/build-lists/", json={"name": name, "car_id": car_id}
+        ).json()["id"]
+        for name in ("Street", "Track")
+    ]
+
+    sql_statements.clear()
+    response = client.post(
+        f"{settings.API_STR}/parts/",
+        json={"name": "Coilovers", "price": 1200, "build_list_id": build_list_ids[0]},
+    )
+    assert response.status_code == 200, response.text
+    part_id = response.json()["id"]
+    # The build list ownership check, then the write
+    assert _verbs(sql_statements) == ["SELECT", "INSERT"]
+
+    sql_statements.clear()
+    response = client.put(
+        f"{settings.API_STR}/parts/{part_id}",
+        json={"price": 1100, "build_list_id": build_list_ids[1]},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["build_list_id"] == build_list_ids[1]
+    assert _verbs(sql_statements) == ["SELECT", "SELECT", "UPDATE"]
+
+    sql_statements.clear()
+    response = client.delete(f"{settings.API_STR}/parts/{part_id}")
+    assert response.status_code == 200, response.text
+    assert response.json()["price"] == 1100
+    assert _verbs(sql_statements) == ["SELECT", "DELETE"]
+
+
+# --- PATCH: the ownership checks are part of the UPDATE ---
+
+
+def test_patch_part_move_is_one_statement(
+    client: TestClient, db_session: AsyncSession, sql_statements: list
+):
+    _ = create_and_login_user(client, "part_patcher")
+    car_id = create_car_for_user_cookie_auth(client)
+    build_list_ids = [
+        client.post(
+            f"{settings.API_STR}/build-lists/", json={"name": name, "car_id": car_id}
+        ).json()["id"]
+        for name in ("Street", "Track")
+    ]
+    part_id = client.post(
+        f"{settings.API_STR}/parts/",
+        json={"name": "Wing", "build_list_id": build_list_ids[0]},
+    ).json()["id"]
+
+    sql_statements.clear()
+    response = client.patch(
+        f"{settings.API_STR}/parts/{part_id}",
+        json={"price": 900, "build_list_id": build_list_ids[1]},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["build_list_id"] == build_list_ids[1]
+    assert response.json()["price"] == 900
+    assert _verbs(sql_statements) == ["UPDATE"]
+
+
+def test_patch_other_users_part_forbidden(client: TestClient, db_session: AsyncSession):
+    _ = create_and_login_user(client, "part_patch_owner")
+    car_id = create_car_for_user_cookie_auth(client)
+    build_list_id = client.post(
+        f"{settings.API_STR}/build-lists/", json={"name": "Owned", "car_id": car_id}
+    ).json()["id"]
+    part_id = client.post(
+        f"{settings.API_STR}/parts/",
+        json={"name": "Spoiler", "build_list_id": build_list_id},
+    ).json()["id"]
+
+    client.cookies.clear()
+    _ = create_and_login_user(client, "part_patch_attacker")
+    response = client.patch(f"{settings.API_STR}/parts/{part_id}", json={"price": 1})
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Not authorized to update this part"
+
+    response = client.patch(f"{settings.API_STR}/parts/444444", json={"price": 1})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "part not found"
+
+
+def test_patch_part_rejects_null_for_required_fields(
+    client: TestClient, db_session: AsyncSession
+):
+    _ = create_and_login_user(client, "part_patch_nulls")
+    car_id = create_car_for_user_cookie_auth(client)
+    build_list_id = client.post(
+        f"{settings.API_STR}/build-lists/", json={"name": "Nulls", "car_id": car_id}
+    ).json()["id"]
+    part_id = client.post(
+        f"{settings.API_STR}/parts/",
+        json={"name": "Diffuser", "price": 300, "build_list_id": build_list_id},
+    ).json()["id"]
+    url = f"{settings.API_STR}/parts/{part_id}"
+
+    for field in ("name", "build_list_id"):
+        response = client.patch(url, json={field: None})
+        assert response.status_code == 422, response.text
+        assert response.json()["detail"][0]["loc"] == ["body", field]
+    response = client.patch(url, json={"price": None})
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "Diffuser"
+
+
+# --- Listing filters and sort orders ---
+
+
+def test_read_parts_by_build_list_filters_and_sorts_by_price(
+    client: TestClient, db_session: AsyncSession
+):
+    _ = create_and_login_user(client, "part_lister")
+    car_id = create_car_for_user_cookie_auth(client)
+    build_list_id = client.post(
+        f"{settings.API_STR}/build-lists/", json={"name": "Sorted", "car_id": car_id}
+    ).json()["id"]
+    for name, part_type, manufacturer, price in (
+        ("Pads", "brakes", "Brembo", 300),
+        ("Rotors", "brakes", "Brembo", 900),
+        ("Lines", "brakes", "Goodridge", 120),
+        ("Plugs", "engine", "NGK", 60),
+        ("Caliper", "brakes", "Brembo", None),
+    ):
+        client.post(
+            f"{settings.API_STR}/parts/",
+            json={
+                "name": name,
+                "part_type": part_type,
+                "manufacturer": manufacturer,
+                "price": price,
+                "build_list_id": build_list_id,
+            },
+        )
+    url = f"{settings.API_STR}/parts/build-list/{build_list_id}"
+
+    def names(**params):
+        response = client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        return [part["name"] for part in response.json()]
+
+    assert names(sort="price") == ["Plugs", "Lines", "Pads", "Rotors", "Caliper"]
+    assert names(sort="-price") == ["Rotors", "Pads", "Lines", "Plugs", "Caliper"]
+    assert names(part_type="brakes", manufacturer="Brembo", sort="-price") == [
+        "Rotors",
+        "Pads",
+        "Caliper",
+    ]
+    assert names(min_price=100, max_price=300, sort="price") == ["Lines", "Pads"]
+
+    # Paging by price carries the last price in the cursor, through to the NULLs
+    seen, params = [], {"sort": "price", "limit": 2}
+    while True:
+        response = client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        seen += [part["name"] for part in response.json()]
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+    assert seen == ["Plugs", "Lines", "Pads", "Rotors", "Caliper"]
+
+    # A cursor from the id order does not say where to resume a price order
+    id_cursor = client.get(url, params={"limit": 1}).headers[NEXT_CURSOR_HEADER]
+    response = client.get(url, params={"sort": "price", "cursor": id_cursor})
+    assert response.status_code == 400
+    assert client.get(url, params={"sort": "name"}).status_code == 422
+    assert client.get(url, params={"min_price": -1}).status_code == 422
+
+
+# --- Bulk create: one ownership query and one INSERT for the whole request ---
+
+
+def test_create_parts_bulk_reports_errors_per_item(
+    client: TestClient, db_session: AsyncSession, sql_statements: list
+):
+    _ = create_and_login_user(client, "bulk_other_owner")
+    other_car_id = create_car_for_user_cookie_auth(client)
+    other_build_list_id = client.post(
+        f"{settings.API_STR}/build-lists/",
+        json={"name": "Not yours", "car_id": other_car_id},
+    ).json()["id"]
+    client.cookies.clear()
+
+    _ = create_and_login_user(client, "bulk_importer")
+    car_id = create_car_for_user_cookie_auth(client)
+    build_list_ids = [
+        client.post(
+            f"{settings.API_STR}/build-lists/", json={"name": name, "car_id": car_id}
+        ).json()["id"]
+        for name in ("Street", "Track")
+    ]
+    items = [
+        {"name": f"Part {n}", "price": 10, "build_list_id": build_list_ids[n % 2]}
+        for n in range(200)
+    ]
+    items[5]["build_list_id"] = other_build_list_id
+    items[7]["build_list_id"] = 999999
+
+    sql_statements.clear()
+    response = client.post(f"{settings.API_STR}/parts/bulk", json=items)
+    assert response.status_code == 200, response.text
+    # One ownership query for both build lists, one INSERT for 198 parts
+    assert _verbs(sql_statements) == ["SELECT", "INSERT"]
+    result = response.json()
+    assert [(e["index"], e["status_code"]) for e in result["errors"]] == [
+        (5, 403),
+        (7, 404),
+    ]
+    created = result["created"]
+    assert len(created) == 198
+    expected = [item["name"] for n, item in enumerate(items) if n not in (5, 7)]
+    assert sorted(part["name"] for part in created) == sorted(expected)
+    ids = [part["id"] for part in created]
+    assert ids == sorted(set(ids))
+
+    listing = client.get(
+        f"{settings.API_STR}/parts/build-list/{build_list_ids[0]}",
+        params={"limit": 200},
+    ).json()
+    assert len(listing) == 100
+
+    # Items are validated as PartCreate up front; one invalid item fails the request
+    invalid = items[:4] + [{"price": 10, "build_list_id": build_list_ids[0]}]
+    response = client.post(f"{settings.API_STR}/parts/bulk", json=invalid)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", 4, "name"]
+    assert client.post(f"{settings.API_STR}/parts/bulk", json=[]).status_code == 422
+    too_many = [items[0]] * (settings.PARTS_BULK_MAX_ITEMS + 1)
+    response = client.post(f"{settings.API_STR}/parts/bulk", json=too_many)
+    assert response.status_code == 422
+    client.cookies.clear()
+    assert (
+        client.post(f"{settings.API_STR}/parts/bulk", json=items[:1]).status_code
+        == 401
+    )
+
+
+# --- Bulk update, move and delete: one set-based statement each ---
+
+
+def test_bulk_move_update_and_delete_are_one_statement(
+    client: TestClient, db_session: AsyncSession, sql_statements: list
+):
+    _ = create_and_login_user(client, "bulk_outsider")
+    outsider_car_id = create_car_for_user_cookie_auth(client)
+    outsider_build_list_id = client.post(
+        f"{settings.API_STR}/build-lists/",
+        json={"name": "Outsider", "car_id": outsider_car_id},
+    ).json()["id"]
+    outsider_part_id = client.post(
+        f"{settings.API_STR}/parts/",
+        json={"name": "Not yours", "build_list_id": outsider_build_list_id},
+    ).json()["id"]
+    client.cookies.clear()
+
+    _ = create_and_login_user(client, "bulk_reorganizer")
+    car_id = create_car_for_user_cookie_auth(client)
+    source_id, target_id = [
+        client.post(
+            f"{settings.API_STR}/build-lists/", json={"name": name, "car_id": car_id}
+        ).json()["id"]
+        for name in ("Source", "Target")
+    ]
+    created = client.post(
+        f"{settings.API_STR}/parts/bulk",
+        json=[
+            {
+                "name": f"Part {n}",
+                "part_type": "brakes" if n % 5 == 0 else "engine",
+                "price": 10,
+                "build_list_id": source_id,
+            }
+            for n in range(60)
+        ],
+    ).json()["created"]
+    part_ids = [part["id"] for part in created]
+
+    # Move 50 parts, one of them someone else's
+    sql_statements.clear()
+    response = client.patch(
+        f"{settings.API_STR}/parts/bulk",
+        json={
+            "ids": part_ids[:50] + [outsider_part_id],
+            "changes": {"build_list_id": target_id},
+        },
+    )
+    assert response.status_code == 200, response.text
+    assert _verbs(sql_statements) == ["UPDATE"]
+    summary = response.json()
+    assert summary["affected"] == 50
+    assert summary["ids"] == sorted(part_ids[:50])
+    assert summary["missing_ids"] == [outsider_part_id]
+
+    # Reprice by filter
+    sql_statements.clear()
+    response = client.patch(
+        f"{settings.API_STR}/parts/bulk",
+        json={
+            "build_list_id": target_id,
+            "part_type": "brakes",
+            "changes": {"price": 25},
+        },
+    )
+    assert response.status_code == 200, response.text
+    assert _verbs(sql_statements) == ["UPDATE"]
+    assert response.json()["affected"] == 10
+
+    # Delete a category
+    sql_statements.clear()
+    response = client.post(
+        f"{settings.API_STR}/parts/bulk/delete", json={"part_type": "brakes"}
+    )
+    assert response.status_code == 200, response.text
+    assert _verbs(sql_statements) == ["DELETE"]
+    assert response.json()["affected"] == 12
+    assert response.json()["missing_ids"] == []
+
+    remaining = {
+        build_list_id: client.get(
+            f"{settings.API_STR}/parts/build-list/{build_list_id}",
+            params={"limit": 100},
+        ).json()
+        for build_list_id in (source_id, target_id)
+    }
+    assert len(remaining[source_id]) == 8
+    assert len(remaining[target_id]) == 40
+    assert {part["part_type"] for part in remaining[target_id]} == {"engine"}
+    # The outsider's part was neither moved nor deleted
+    client.cookies.clear()
+    response = client.get(f"{settings.API_STR}/parts/{outsider_part_id}")
+    assert response.json()["build_list_id"] == outsider_build_list_id
+
+
+def test_bulk_move_to_other_users_build_list_forbidden(
+    client: TestClient, db_session: AsyncSession
+):
+    _ = create_and_login_user(client, "bulk_target_owner")
+    other_car_id = create_car_for_user_cookie_auth(client)
+    other_build_list_id = client.post(
+        f"{settings.API_STR}/build-lists/",
+        json={"name": "Theirs", "car_id": other_car_id},
+    ).json()["id"]
+    client.cookies.clear()
+
+    _ = create_and_login_user(client, "bulk_mover")
+    car_id = create_car_for_user_cookie_auth(client)
+    build_list_id = client.post(
+        f"{settings.API_STR}/build-lists/", json={"name": "Mine", "car_id": car_id}
+    ).json()["id"]
+    part_id = client.post(
+        f"{settings.API_STR}/parts/",
+        json={"name": "Turbo", "build_list_id": build_list_id},
+    ).json()["id"]
+
+    url = f"{settings.API_STR}/parts/bulk"
+    response = client.patch(
+        url, json={"ids": [part_id], "changes": {"build_list_id": other_build_list_id}}
+    )
+    assert response.status_code == 403
+    response = client.patch(
+        url, json={"ids": [part_id], "changes": {"build_list_id": 999999}}
+    )
+    assert response.status_code == 404
+    assert (
+        client.get(f"{settings.API_STR}/parts/{part_id}").json()["build_list_id"]
+        == build_list_id
+    )
+
+    # Neither an empty selection nor empty changes is accepted
+    assert client.patch(url, json={"changes": {"price": 1}}).status_code == 422
+    assert client.patch(url, json={"ids": [part_id], "changes": {}}).status_code == 422
+    response = client.post(f"{settings.API_STR}/parts/bulk/delete", json={})
+    assert response.status_code == 422
+    # Nor null for a NOT NULL column: as for PATCH /parts/{id}, changes is a PartUpdate
+    for changes in ({"name": None}, {"build_list_id": None}):
+        for selection in ({"ids": [part_id]}, {"part_type": "brakes"}):
+            response = client.patch(url, json={**selection, "changes": changes})
+            assert response.status_code == 422, response.text
+            assert response.json()["detail"][0]["loc"][:2] == ["body", "changes"]
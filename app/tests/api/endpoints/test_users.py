@@ -1,5 +1,5 @@
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Optional
 from fastapi import status  # Add this import
 
@@ -67,7 +67,7 @@ def create_and_login_user(
 
 
 # --- Create User Tests ---
-def test_create_user_success(client: TestClient, db_session: Session):
+def test_create_user_success(client: TestClient, db_session: AsyncSession):
     username = "new_unique_user"
     email = "new_unique_user@example.com"
     password = "password123"
@@ -85,7 +85,7 @@ def test_create_user_success(client: TestClient, db_session: Session):
     assert "hashed_password" not in created_user
 
 
-def test_create_user_duplicate_username(client: TestClient, db_session: Session):
+def test_create_user_duplicate_username(client: TestClient, db_session: AsyncSession):
     user_info = create_and_login_user(
         client, "duplicate_username_test"
     )  # Creates and logs in first user
@@ -100,7 +100,7 @@ def test_create_user_duplicate_username(client: TestClient, db_session: Session)
     assert "username already registered" in response.json()["detail"].lower()
 
 
-def test_create_user_duplicate_email(client: TestClient, db_session: Session):
+def test_create_user_duplicate_email(client: TestClient, db_session: AsyncSession):
     user_info = create_and_login_user(
         client, "duplicate_email_test"
     )  # Creates and logs in first user
@@ -116,7 +116,7 @@ def test_create_user_duplicate_email(client: TestClient, db_session: Session):
 
 
 # --- Read User (/me) Tests ---
-def test_read_users_me_success(client: TestClient, db_session: Session):
+def test_read_users_me_success(client: TestClient, db_session: AsyncSession):
     user_info = create_and_login_user(client, "me_test")  # Logs in, client gets cookie
 
     response = client.get(f"{settings.API_STR}/users/me")  # Cookie sent automatically
@@ -127,14 +127,14 @@ def test_read_users_me_success(client: TestClient, db_session: Session):
     assert me_user["id"] == user_info["id"]
 
 
-def test_read_users_me_unauthenticated(client: TestClient, db_session: Session):
+def test_read_users_me_unauthenticated(client: TestClient, db_session: AsyncSession):
     client.cookies.clear()  # Ensure no auth cookie
     response = client.get(f"{settings.API_STR}/users/me")
     assert response.status_code == 401  # Expect unauthorized
 
 
 # --- Read User (/{user_id}) Tests ---
-def test_read_user_by_id_success(client: TestClient, db_session: Session):
+def test_read_user_by_id_success(client: TestClient, db_session: AsyncSession):
     user_info = create_and_login_user(client, "read_by_id_test")
     user_id_to_read = user_info["id"]
 
@@ -146,14 +146,14 @@ def test_read_user_by_id_success(client: TestClient, db_session: Session):
     assert read_user["username"] == user_info["username"]
 
 
-def test_read_user_by_id_not_found(client: TestClient, db_session: Session):
+def test_read_user_by_id_not_found(client: TestClient, db_session: AsyncSession):
     response = client.get(f"{settings.API_STR}/users/9999999")  # Non-existent ID
     assert response.status_code == 404
     assert response.json()["detail"] == "User not found"
 
 
 # --- Update User Tests ---
-def test_update_own_user_success(client: TestClient, db_session: Session):
+def test_update_own_user_success(client: TestClient, db_session: AsyncSession):
     user_info = create_and_login_user(client, "update_self")
     user_id = user_info["id"]
     current_password = "testpassword"  # Default password from create_and_login_user
@@ -172,7 +172,7 @@ def test_update_own_user_success(client: TestClient, db_session: Session):
 
 
 def test_update_own_user_change_password_success(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     username_suffix = "change_pass"
     initial_password = "initialPassword123"
@@ -209,7 +209,7 @@ def test_update_own_user_change_password_success(
 
 
 def test_update_own_user_incorrect_current_password(
-    client: TestClient, db_session: Session
+    client: TestClient, db_session: AsyncSession
 ):
     user_info = create_and_login_user(client, "update_wrong_curr_pass")
     user_id = user_info["id"]
@@ -223,7 +223,7 @@ def test_update_own_user_incorrect_current_password(
     assert "incorrect current password" in response.json()["detail"].lower()
 
 
-def test_update_other_user_forbidden(client: TestClient, db_session: Session):
+def test_update_other_user_forbidden(client: TestClient, db_session: AsyncSession):
     user_a_info = create_and_login_user(
         client, "user_a_update_target"
     )  # User A logged in
@@ -245,7 +245,7 @@ def test_update_other_user_forbidden(client: TestClient, db_session: Session):
     assert response.json()["detail"] == "Not authorized to update this user"
 
 
-def test_update_user_unauthenticated(client: TestClient, db_session: Session):
+def test_update_user_unauthenticated(client: TestClient, db_session: AsyncSession):
     user_info = create_and_login_user(client, "update_unauth_target")
     user_id = user_info["id"]
     client.cookies.clear()  # Ensure unauthenticated
@@ -255,7 +255,7 @@ def test_update_user_unauthenticated(client: TestClient, db_session: Session):
     assert response.status_code == 401
 
 
-def test_update_user_not_found(client: TestClient, db_session: Session):
+def test_update_user_not_found(client: TestClient, db_session: AsyncSession):
     # Logs in a user, assume default password "testpassword"
     logged_in_user_info = create_and_login_user(client, "updater_user_notfound")
     logged_in_user_password = "testpassword"
@@ -272,7 +272,7 @@ def test_update_user_not_found(client: TestClient, db_session: Session):
 
 
 # --- Delete User Tests ---
-def test_delete_own_user_success(client: TestClient, db_session: Session):
+def test_delete_own_user_success(client: TestClient, db_session: AsyncSession):
     user_info = create_and_login_user(client, "delete_self")
     user_id = user_info["id"]
     username = user_info["username"]
@@ -298,7 +298,7 @@ def test_delete_own_user_success(client: TestClient, db_session: Session):
     assert get_response.status_code == 404
 
 
-def test_delete_other_user_forbidden(client: TestClient, db_session: Session):
+def test_delete_other_user_forbidden(client: TestClient, db_session: AsyncSession):
     user_a_info = create_and_login_user(
         client, "user_a_delete_target"
     )  # User A logged in
@@ -314,7 +314,7 @@ def test_delete_other_user_forbidden(client: TestClient, db_session: Session):
     assert response.json()["detail"] == "Not authorized to delete this user"
 
 
-def test_delete_user_unauthenticated(client: TestClient, db_session: Session):
+def test_delete_user_unauthenticated(client: TestClient, db_session: AsyncSession):
     user_info = create_and_login_user(client, "delete_unauth_target")
     user_id = user_info["id"]
     client.cookies.clear()  # Ensure unauthenticated
@@ -323,7 +323,7 @@ def test_delete_user_unauthenticated(client: TestClient, db_session: Session):
     assert response.status_code == 401
 
 
-def test_delete_user_not_found(client: TestClient, db_session: Session):
+def test_delete_user_not_found(client: TestClient, db_session: AsyncSession):
     _ = create_and_login_user(client, "deleter_user_notfound")  # Logs in a user
 
     response = client.delete(f"{settings.API_STR}/users/9999997")  # Non-existent ID
@@ -333,7 +333,7 @@ def test_delete_user_not_found(client: TestClient, db_session: Session):
     )  # Changed detail
 
 
-def test_update_user_conflict_username(client: TestClient, db_session: Session):
+def test_update_user_conflict_username(client: TestClient, db_session: AsyncSession):
     user_a_info = create_and_login_user(client, "conflict_username_A")
     # User B is now logged in, default password is "testpassword"
     user_b_info = create_and_login_user(client, "conflict_username_B")
@@ -349,7 +349,7 @@ def test_update_user_conflict_username(client: TestClient, db_session: Session):
     assert "username already registered" in response.json()["detail"].lower()
 
 
-def test_update_user_conflict_email(client: TestClient, db_session: Session):
+def test_update_user_conflict_email(client: TestClient, db_session: AsyncSession):
     user_a_info = create_and_login_user(client, "conflict_email_A")
     # User B is now logged in, default password is "testpassword"
     user_b_info = create_and_login_user(client, "conflict_email_B")
@@ -363,3 +363,151 @@ def test_update_user_conflict_email(client: TestClient, db_session: Session):
     )
     assert response.status_code == 400
     assert "email already registered" in response.json()["detail"].lower()
+
+
+# --- Query counts: each write is a single RETURNING statement ---
+
+
+def _verbs(statements):
+    return [statement.split()[0] for statement in statements]
+
+
+def test_user_writes_use_one_statement(
+    client: TestClient, db_session: AsyncSession, sql_statements: list
+):
+    user_data = {
+        "username": "user_test_query_count",
+        "email": "user_test_query_count@example.com",
+        "password": "testpassword",
+    }
+    sql_statements.clear()
+    response = client.post(f"{settings.API_STR}/users/", json=user_data)
+    assert response.status_code == 200, response.text
+    user_id = response.json()["id"]
+    # One duplicate check for username and email together, then the write
+    assert _verbs(sql_statements) == ["SELECT", "INSERT"]
+
+    client.post(
+        f"{settings.API_STR}/auth/token",
+        data={"username": user_data["username"], "password": user_data["password"]},
+    )
+    sql_statements.clear()
+    response = client.put(
+        f"{settings.API_STR}/users/{user_id}",
+        json={
+            "image_url": "https://x.test/a.png",
+            "password": "newpassword",
+            "current_password": user_data["password"],
+        },
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["image_url"] == "https://x.test/a.png"
+    # Loading the user for the password check, then the write
+    assert _verbs(sql_statements) == ["SELECT", "UPDATE"]
+
+    sql_statements.clear()
+    response = client.delete(f"{settings.API_STR}/users/{user_id}")
+    assert response.status_code == 200, response.text
+    assert response.json()["username"] == user_data["username"]
+    assert _verbs(sql_statements) == ["DELETE"]
+
+
+def test_delete_user_cascades_to_cars(client: TestClient, db_session: AsyncSession):
+    user = create_and_login_user(client, "cascade_owner")
+    response = client.post(
+        f"{settings.API_STR}/cars/", json={"make": "Saab", "model": "900", "year": 1990}
+    )
+    car_id = response.json()["id"]
+
+    response = client.delete(f"{settings.API_STR}/users/{user['id']}")
+    assert response.status_code == 200, response.text
+    assert client.get(f"{settings.API_STR}/cars/{car_id}").status_code == 404
+
+
+def test_deleted_user_access_tokens_cannot_write(
+    client: TestClient, db_session: AsyncSession
+):
+    user = create_and_login_user(client, "deleted_writer")
+    other_session = client.cookies.get("access_token")
+    # Log in again: this session deletes the account, the other one outlives it
+    response = client.post(
+        f"{settings.API_STR}/auth/token",
+        data={"username": user["username"], "password": "testpassword"},
+    )
+    assert response.status_code == 200, response.text
+    this_session = client.cookies.get("access_token")
+
+    response = client.delete(f"{settings.API_STR}/users/{user['id']}")
+    assert response.status_code == 200, response.text
+    assert client.cookies.get("access_token") is None
+
+    car = {"make": "Saab", "model": "99", "year": 1975}
+    for token in (this_session, other_session):
+        client.cookies.set("access_token", token)
+        response = client.post(f"{settings.API_STR}/cars/", json=car)
+        assert response.status_code == 401, response.text
+
+
+# --- Garage snapshot: the user's whole tree, one query per level ---
+
+
+def test_read_user_garage_fixed_queries_and_projection(
+    client: TestClient, db_session: AsyncSession, sql_statements: list
+):
+    user_id = create_and_login_user(client, "garage_owner", "pw_garage_123")["id"]
+    for make, model in (("Honda", "S2000"), ("Nissan", "Silvia")):
+        car_id = client.post(
+            f"{settings.API_STR}/cars/",
+            json={"make": make, "model": model, "year": 2000},
+        ).json()["id"]
+        for name in ("Street", "Track"):
+            build_list_id = client.post(
+                f"{settings.API_STR}/build-lists/",
+                json={"name": f"{model} {name}", "car_id": car_id},
+            ).json()["id"]
+            for n in range(3):
+                client.post(
+                    f"{settings.API_STR}/parts/",
+                    json={
+                        "name": f"Part {n}",
+                        "price": 100,
+                        "build_list_id": build_list_id,
+                    },
+                )
+    url = f"{settings.API_STR}/users/{user_id}/garage"
+
+    sql_statements.clear()
+    response = client.get(url)
+    assert response.status_code == 200, response.text
+    # The user, then cars, build lists and parts: one query each
+    assert _verbs(sql_statements) == ["SELECT"] * 4
+    garage = response.json()
+    assert garage["username"] == "user_test_garage_owner"
+    assert [car["model"] for car in garage["cars"]] == ["S2000", "Silvia"]
+    build_list = garage["cars"][1]["build_lists"][0]
+    assert build_list["name"] == "Silvia Street"
+    assert (build_list["part_count"], build_list["total_price"]) == (3, 300)
+    assert [part["name"] for part in build_list["parts"]] == [
+        "Part 0",
+        "Part 1",
+        "Part 2",
+    ]
+    assert garage["cars"][0]["total_spend"] == 600
+
+    sql_statements.clear()
+    response = client.get(
+        url, params={"depth": 2, "car_fields": "model", "build_list_fields": ""}
+    )
+    assert response.status_code == 200, response.text
+    assert _verbs(sql_statements) == ["SELECT"] * 3
+    car = response.json()["cars"][0]
+    assert set(car) == {"id", "model", "build_lists"}
+    assert all(set(bl) == {"id"} for bl in car["build_lists"])
+    # Only the requested columns are read
+    assert "make" not in sql_statements[1]
+
+    response = client.get(url, params={"part_fields": "name,weight"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown part fields: weight"
+    assert client.get(url, params={"depth": 4}).status_code == 422
+    assert client.get(f"{settings.API_STR}/users/999999/garage").status_code == 404
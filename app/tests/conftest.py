@@ -1,7 +1,8 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
 import os
 from dotenv import load_dotenv
 import sys
@@ -17,6 +18,12 @@ if os.path.exists(dotenv_path):
 else:
     print(f"Warning: .env.test file not found at {dotenv_path}. Test database URL might not be configured correctly.")
 
+# Tests never talk to SendGrid, and drive the email outbox dispatcher explicitly
+os.environ["EMAIL_PROVIDER"] = "fake"
+os.environ["EMAIL_DISPATCHER_ENABLED"] = "false"
+# Enables the /internal endpoints; tests send it as X-Internal-Token
+os.environ["INTERNAL_API_TOKEN"] = "test-internal-token"
+
 TEST_DATABASE_URL = os.getenv("DATABASE_URL")
 if not TEST_DATABASE_URL:
     print("Warning: DATABASE_URL not found in environment after loading .env.test.")
@@ -38,12 +45,14 @@ app.core.config.get_settings = get_test_settings
 # Only now import the rest of the app
 from app.main import app
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import async_database_url, enable_sqlite_foreign_keys, get_db
+from app.api.services.car_search import car_search_index
+from app.api.services.user_cache import user_cache
+from app.api.services.rate_limiting import InMemoryRateLimitBackend, rate_limiter
 
 engine = create_engine(
-    TEST_DATABASE_URL # This engine is for test setup (creating tables, direct test sessions)
+    TEST_DATABASE_URL # This engine is for test setup (creating tables)
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 @pytest.fixture(scope="session", autouse=True)
 def create_test_tables():
@@ -55,36 +64,81 @@ def create_test_tables():
     # Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_in_process_caches():
+    # Each test rolls its data back, so ids and usernames can be reused by the next one
+    user_cache.clear()
+    car_search_index.invalidate()
+    # Every test client shares one IP, so give each test a fresh budget
+    rate_limiter.backend = InMemoryRateLimitBackend()
+    yield
+
+
+@pytest.fixture(scope="function")
+def test_client():
+    # The app's event loop for this test; async database work has to run on it
+    with TestClient(app) as c:
+        yield c
+
+
 @pytest.fixture(scope="function")
-def db_session(create_test_tables): # This fixture provides the transactional session
-    connection = engine.connect()
-    transaction = connection.begin()
-    # Create a session bound to this specific connection and transaction
-    session = TestingSessionLocal(bind=connection)
+def db_session(create_test_tables, test_client): # This fixture provides the transactional session
+    # NullPool: connections belong to the event loop that opened them, and
+    # every test gets a new loop
+    async_engine = enable_sqlite_foreign_keys(
+        create_async_engine(async_database_url(TEST_DATABASE_URL), poolclass=NullPool)
+    )
+
+    async def begin():
+        connection = await async_engine.connect()
+        transaction = await connection.begin()
+        # Create a session bound to this specific connection and transaction
+        session = AsyncSession(
+            bind=connection, autoflush=False, expire_on_commit=False
+        )
+        return connection, transaction, session
+
+    async def end(connection, transaction, session):
+        await session.close()
+        if transaction.is_active:
+            await transaction.rollback()
+        await connection.close()
+        await async_engine.dispose()
 
+    connection, transaction, session = test_client.portal.call(begin)
     try:
         yield session # provide the session for the test
     finally:
-        session.close()
-        if transaction.is_active:
-            transaction.rollback()
-        connection.close()
+        test_client.portal.call(end, connection, transaction, session)
+
+
+@pytest.fixture(scope="function")
+def sql_statements(db_session):
+    # Every statement the test's connection executes, for query-count assertions
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_connection = db_session.bind.sync_connection
+    event.listen(sync_connection, "before_cursor_execute", record)
+    yield statements
+    event.remove(sync_connection, "before_cursor_execute", record)
 
 
 @pytest.fixture(scope="function") # CHANGED: client scope to "function"
-def client(db_session):  # CHANGED: client now depends on the transactional db_session
+def client(test_client, db_session):  # CHANGED: client now depends on the transactional db_session
     # Define an override_get_db that uses the db_session for the current test
-    def _override_get_db_for_test():
+    async def _override_get_db_for_test():
         yield db_session
 
     # Apply the override for the FastAPI app for the duration of this test
     # Store the original override, if any, to restore it later
     original_override = app.dependency_overrides.get(get_db)
     app.dependency_overrides[get_db] = _override_get_db_for_test
-    
-    with TestClient(app) as c:
-        yield c
-    
+
+    yield test_client
+
     # Clean up the override after the test
     if original_override:
         app.dependency_overrides[get_db] = original_override
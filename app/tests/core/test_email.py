@@ -0,0 +1,112 @@
+import json
+
+import httpx
+import pytest
+
+from app.core.email import (
+    EmailProvider,
+    FakeEmailProvider,
+    SendGridEmailProvider,
+    send_bulk_email,
+)
+
+
+def _recipients(count: int):
+    return ((f"user{i}@example.com", {"n": i}) for i in range(count))
+
+
+def test_send_bulk_email_groups_recipients_into_batches():
+    provider = FakeEmailProvider()
+
+    report = send_bulk_email(
+        "template", _recipients(5), batch_size=2, provider=provider
+    )
+
+    assert provider.requests == 3
+    assert [b.recipients for b in report.batches] == [2, 2, 1]
+    assert report.sent == 5
+    assert report.failed == 0
+    assert [m["to_email"] for m in provider.sent] == [
+        f"user{i}@example.com" for i in range(5)
+    ]
+    assert provider.sent[3]["dynamic_template_data"] == {"n": 3}
+
+
+def test_send_bulk_email_caps_batch_size_at_provider_limit():
+    provider = FakeEmailProvider()
+    provider.max_batch_size = 3
+
+    report = send_bulk_email(
+        "template", _recipients(7), batch_size=100, provider=provider
+    )
+
+    assert [b.recipients for b in report.batches] == [3, 3, 1]
+
+
+def test_send_bulk_email_reports_failed_batches_and_continues():
+    provider = FakeEmailProvider(fail_next=1)
+
+    report = send_bulk_email(
+        "template", _recipients(4), batch_size=2, provider=provider
+    )
+
+    assert report.batches[0].error == "Simulated provider failure"
+    assert report.batches[1].error is None
+    assert report.sent == 2
+    assert report.failed == 2
+    assert len(provider.sent) == 2
+
+
+def test_send_bulk_email_reports_throughput_per_batch():
+    provider = FakeEmailProvider(latency=0.01)
+
+    report = send_bulk_email(
+        "template", _recipients(10), batch_size=5, provider=provider
+    )
+
+    for batch in report.batches:
+        assert batch.seconds >= 0.01
+        assert 0 < batch.recipients_per_second <= 5 / 0.01
+    assert report.seconds >= 0.02
+
+
+def test_incomplete_provider_fails_on_creation():
+    class SingleSendOnly(EmailProvider):
+        def send(self, to_email, template_id, dynamic_template_data):
+            return 202
+
+    with pytest.raises(TypeError):
+        SingleSendOnly()
+
+
+def test_sendgrid_provider_posts_batches_through_one_client():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(202)
+
+    provider = SendGridEmailProvider("sg-key", "noreply@example.com")
+    provider._client = httpx.Client(
+        headers=provider._client.headers, transport=httpx.MockTransport(handler)
+    )
+
+    assert provider.send("a@example.com", "template", {"n": 0}) == 202
+    assert provider.send_batch("template", list(_recipients(3))) == 202
+
+    assert [r.url for r in requests] == [SendGridEmailProvider.url] * 2
+    assert requests[0].headers["authorization"] == "Bearer sg-key"
+    body = json.loads(requests[1].content)
+    assert body["template_id"] == "template"
+    assert sorted(p["to"][0]["email"] for p in body["personalizations"]) == [
+        f"user{i}@example.com" for i in range(3)
+    ]
+
+
+def test_sendgrid_provider_raises_on_error_status():
+    provider = SendGridEmailProvider("sg-key", "noreply@example.com")
+    provider._client = httpx.Client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(429))
+    )
+    with pytest.raises(RuntimeError):
+        provider.send("a@example.com", "template", {})
@@ -0,0 +1,69 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, MetaData, Table
+
+from app.db.base import Base
+from app.db.index_audit import (
+    IndexUsage,
+    audit,
+    format_report,
+    unindexed_foreign_keys,
+)
+
+
+def test_every_model_foreign_key_is_indexed():
+    assert unindexed_foreign_keys(Base.metadata) == []
+
+
+def test_listing_indexes_lead_with_the_parent_key():
+    indexes = {
+        index.name: [column.name for column in index.columns]
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+    }
+    assert indexes["ix_cars_user_id_id"] == ["user_id", "id"]
+    assert indexes["ix_build_lists_car_id_id"] == ["car_id", "id"]
+    assert indexes["ix_parts_build_list_id_id"] == ["build_list_id", "id"]
+    assert indexes["ix_parts_build_list_id_price_id"] == [
+        "build_list_id",
+        "price",
+        "id",
+    ]
+    for dropped in (
+        "ix_parts_description",
+        "ix_parts_price",
+        "ix_cars_trim",
+        "ix_parts_id",
+    ):
+        assert dropped not in indexes
+
+
+def _metadata():
+    metadata = MetaData()
+    Table("parents", metadata, Column("id", Integer, primary_key=True))
+    Table(
+        "children",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("parent_id", ForeignKey("parents.id")),
+        Column("other_parent_id", ForeignKey("parents.id")),
+        Column("rank", Integer),
+        Index("ix_children_parent_id_id", "parent_id", "id"),
+        Index("ix_children_rank", "rank"),
+    )
+    return metadata
+
+
+def test_audit_classifies_indexes():
+    usage = [
+        IndexUsage("children", "children_pkey", 0, 8192, True),
+        IndexUsage("children", "ix_children_parent_id_id", 120, 8192, False),
+        IndexUsage("children", "ix_children_legacy", 0, 8192, False),
+        IndexUsage("alembic_version", "alembic_version_pkc", 0, 8192, True),
+    ]
+    report = audit(_metadata(), usage)
+
+    assert [i.name for i in report.unused] == ["ix_children_legacy"]
+    assert [i.name for i in report.undeclared] == ["ix_children_legacy"]
+    assert report.missing == [("children", "ix_children_rank")]
+    assert report.unindexed_foreign_keys == [("children", ("other_parent_id",))]
+    assert not report.clean
+    assert "children(other_parent_id)" in format_report(report)
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import random
+
+import pytest
+from fastapi import Response
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.api.models.build_list import BuildList as DBBuildList
+from app.api.models.car import Car as DBCar
+from app.api.models.part import Part as DBPart
+from app.api.models.user import User as DBUser
+from app.api.dependencies.pagination import NEXT_CURSOR_HEADER, page_params
+from app.api.endpoints.parts import read_parts_by_build_list
+
+# Enough rows that a full scan or a sort would be the planner's choice if the
+# composite indexes did not fit the listing's queries
+BUILD_LISTS = 200
+PARTS = 20_000
+MANUFACTURERS = ["Brembo", "Bosch", "NGK", "Bilstein", "Eibach"]
+PART_TYPES = ["brakes", "suspension", "engine", "interior"]
+
+
+async def _seed(engine):
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(
+            insert(DBUser).values(
+                id=1, username="u", email="u@example.com", hashed_password="x"
+            )
+        )
+        await connection.execute(
+            insert(DBCar).values(id=1, make="M", model="M", year=2020, user_id=1)
+        )
+        await connection.execute(
+            insert(DBBuildList),
+            [
+                {"id": i, "name": "B", "car_id": 1, "owner_id": 1}
+                for i in range(1, BUILD_LISTS + 1)
+            ],
+        )
+        rng = random.Random(7)
+        await connection.execute(
+            insert(DBPart),
+            [
+                {
+                    "id": i,
+                    "name": f"Part {i}",
+                    "part_type": rng.choice(PART_TYPES),
+                    "manufacturer": rng.choice(MANUFACTURERS),
+                    # Some parts have no price yet
+                    "price": rng.randrange(10, 5000) if rng.random() > 0.05 else None,
+                    # Build list 1 is a big one; the rest have ~75 parts each
+                    "build_list_id": (
+                        1 if rng.random() < 0.25 else rng.randrange(2, BUILD_LISTS + 1)
+                    ),
+                    "owner_id": 1,
+                }
+                for i in range(1, PARTS + 1)
+            ],
+        )
+        await connection.execute(text("ANALYZE"))
+
+
+def _plans(build_list_id=1, limit=20, **params):
+    """
+    List a build list's parts with `params`, reading up to two pages, and
+    return the parts plus SQLite's plan for every query the listing issued.
+    """
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    async def main():
+        await _seed(engine)
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        async with async_sessionmaker(bind=engine)() as db:
+            parts, cursor = [], None
+            for _ in range(2):
+                response = Response()
+                parts += await read_parts_by_build_list(
+                    build_list_id=build_list_id,
+                    response=response,
+                    part_type=params.get("part_type"),
+                    manufacturer=params.get("manufacturer"),
+                    min_price=params.get("min_price"),
+                    max_price=params.get("max_price"),
+                    sort=params.get("sort", "id"),
+                    page=page_params(limit=limit, cursor=cursor, include_total=False),
+                    db=db,
+                    logger=logging.getLogger("test"),
+                )
+                cursor = response.headers.get(NEXT_CURSOR_HEADER)
+                if cursor is None:
+                    break
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        plans = []
+        async with engine.connect() as connection:
+            for statement, parameters in statements:
+                rows = await connection.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+                plans.append(" / ".join(row.detail for row in rows))
+        await engine.dispose()
+        return parts, plans
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    "params, index",
+    [
+        ({"sort": "id"}, "ix_parts_build_list_id_id"),
+        ({"sort": "price"}, "ix_parts_build_list_id_price_id"),
+        ({"sort": "-price"}, "ix_parts_build_list_id_price_id"),
+        (
+            {"sort": "price", "min_price": 1000, "max_price": 3000},
+            "ix_parts_build_list_id_price_id",
+        ),
+    ],
+)
+def test_sorted_listing_pages_are_index_range_scans(params, index):
+    parts, plans = _plans(**params)
+    assert len(parts) == 40
+    for plan in plans:
+        assert f"SEARCH parts USING INDEX {index}" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan  # rows come out of the index in order
+
+
+def test_filtered_listing_never_scans_the_table():
+    parts, plans = _plans(sort="price", manufacturer="Bosch", part_type="brakes")
+    assert {(part.manufacturer, part.part_type) for part in parts} == {
+        ("Bosch", "brakes")
+    }
+    for plan in plans:
+        assert "SEARCH parts USING INDEX" in plan, plan
+        assert "SCAN parts" not in plan, plan
+
+
+def test_price_order_runs_into_parts_without_a_price():
+    # The second page crosses from the priced parts to the unpriced ones
+    parts, plans = _plans(build_list_id=2, limit=50, sort="price")
+    assert 50 < len(parts) < 100
+    priced = [part.price for part in parts if part.price is not None]
+    assert priced == sorted(priced)
+    assert len(priced) < len(parts)
+    unpriced = parts[len(priced) :]
+    assert all(part.price is None for part in unpriced)
+    assert [part.id for part in unpriced] == sorted(part.id for part in unpriced)
+    # Priced page, priced page, then the NULLs: each through the price index
+    assert len(plans) == 3
+    for plan in plans:
+        assert "SEARCH parts USING INDEX ix_parts_build_list_id_price_id" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,77 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+
+from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, pool_stats
+from app.db import session
+from app.db.session import pool_options
+
+
+def _engine(tmp_path, **kwargs):
+    return create_engine(
+        f"sqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        **kwargs,
+    )
+
+
+def test_pool_stats_report_checked_out_connections(tmp_path):
+    engine = _engine(tmp_path)
+
+    with engine.connect():
+        stats = pool_stats(engine.pool)
+        assert stats["size"] == 1
+        assert stats["checked_out"] == 1
+        assert stats["checked_in"] == 0
+        assert stats["checkouts"] == 1
+
+    stats = pool_stats(engine.pool)
+    assert stats["checked_out"] == 0
+    assert stats["checked_in"] == 1
+    assert stats["contended_checkouts"] == 0
+
+
+def test_pool_stats_count_waits_and_timeouts(tmp_path):
+    engine = _engine(tmp_path, pool_timeout=0.2)
+
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = pool_stats(engine.pool)
+    assert stats["checkouts"] == 2
+    assert stats["contended_checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds_max"] >= 0.2
+
+
+def test_pool_stats_survive_dispose(tmp_path):
+    engine = _engine(tmp_path)
+    with engine.connect():
+        pass
+    engine.dispose()
+    assert pool_stats(engine.pool)["checkouts"] == 1
+
+
+def test_pool_options_come_from_settings(monkeypatch):
+    monkeypatch.setattr(session.settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(session.settings, "DB_POOL_PRE_PING", False)
+
+    options = pool_options("postgresql://user:pass@db/carmodpicker")
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["pool_size"] == 3
+    assert options["pool_pre_ping"] is False
+    # In-memory SQLite keeps SQLAlchemy's single shared connection
+    assert pool_options("sqlite://") == {}
+
+
+def test_metrics_report_db_pool(client: TestClient):
+    response = client.get(
+        f"{settings.API_STR}/internal/metrics",
+        headers={"X-Internal-Token": settings.INTERNAL_API_TOKEN},
+    )
+    assert response.status_code == 200
+    assert "checked_out" in response.json()["db_pool"]
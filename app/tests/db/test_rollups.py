@@ -0,0 +1,207 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.rollups import reconcile
+from app.db.session import enable_sqlite_foreign_keys
+from app.api.models.build_list import BuildList as DBBuildList
+from app.api.models.car import Car as DBCar
+from app.api.models.part import Part as DBPart
+from app.api.models.user import User as DBUser
+
+
+def _run(scenario):
+    """Run `scenario(session_factory)` against an in-memory database with two cars."""
+    engine = enable_sqlite_foreign_keys(
+        create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    )
+    session_factory = async_sessionmaker(bind=engine)
+
+    async def main():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with session_factory() as db:
+            await db.execute(
+                insert(DBUser).values(
+                    id=1, username="u", email="u@example.com", hashed_password="x"
+                )
+            )
+            await db.execute(
+                insert(DBCar),
+                [
+                    {"id": id, "make": "M", "model": "M", "year": 2020, "user_id": 1}
+                    for id in (1, 2)
+                ],
+            )
+            await db.commit()
+        return await scenario(session_factory)
+
+    return asyncio.run(main())
+
+
+async def _rollups(db):
+    build_lists = {
+        id: (count, total)
+        for id, count, total in await db.execute(
+            select(DBBuildList.id, DBBuildList.part_count, DBBuildList.total_price)
+        )
+    }
+    cars = {
+        id: (count, total)
+        for id, count, total in await db.execute(
+            select(DBCar.id, DBCar.build_list_count, DBCar.total_spend)
+        )
+    }
+    return build_lists, cars
+
+
+def test_writes_keep_rollups_current():
+    async def scenario(session_factory):
+        async with session_factory() as db:
+            await db.execute(
+                insert(DBBuildList),
+                [
+                    {"id": 1, "name": "A", "car_id": 1, "owner_id": 1},
+                    {"id": 2, "name": "B", "car_id": 1, "owner_id": 1},
+                ],
+            )
+            # One multi-row statement, and a part without a price
+            await db.execute(
+                insert(DBPart),
+                [
+                    {
+                        "id": id,
+                        "name": "p",
+                        "price": price,
+                        "build_list_id": build_list_id,
+                        "owner_id": 1,
+                    }
+                    for id, price, build_list_id in (
+                        (1, 100, 1),
+                        (2, 250, 1),
+                        (3, None, 2),
+                    )
+                ],
+            )
+            steps = [await _rollups(db)]
+
+            await db.execute(update(DBPart).where(DBPart.id == 3).values(price=40))
+            steps.append(await _rollups(db))
+            # Move a part, then a build list to the other car
+            await db.execute(
+                update(DBPart).where(DBPart.id == 2).values(build_list_id=2)
+            )
+            await db.execute(
+                update(DBBuildList).where(DBBuildList.id == 2).values(car_id=2)
+            )
+            steps.append(await _rollups(db))
+            await db.execute(delete(DBPart).where(DBPart.id == 1))
+            # The cascade removes build list 2's parts along with it
+            await db.execute(delete(DBBuildList).where(DBBuildList.id == 2))
+            steps.append(await _rollups(db))
+            return steps
+
+    created, repriced, moved, deleted = _run(scenario)
+    assert created == ({1: (2, 350), 2: (1, 0)}, {1: (2, 350), 2: (0, 0)})
+    assert repriced == ({1: (2, 350), 2: (1, 40)}, {1: (2, 390), 2: (0, 0)})
+    assert moved == ({1: (1, 100), 2: (2, 290)}, {1: (1, 100), 2: (1, 290)})
+    assert deleted == ({1: (0, 0)}, {1: (1, 0), 2: (0, 0)})
+
+
+def test_reconcile_repairs_drift_in_batches():
+    async def scenario(session_factory):
+        async with session_factory() as db:
+            await db.execute(
+                insert(DBBuildList),
+                [
+                    {"id": id, "name": "B", "car_id": 1, "owner_id": 1}
+                    for id in (1, 2, 3)
+                ],
+            )
+            for id, build_list_id in ((1, 1), (2, 1), (3, 3)):
+                await db.execute(
+                    insert(DBPart).values(
+                        id=id,
+                        name="p",
+                        price=10 * id,
+                        build_list_id=build_list_id,
+                        owner_id=1,
+                    )
+                )
+            expected = await _rollups(db)
+            # Drift the stored values behind the triggers' back
+            await db.execute(
+                update(DBBuildList)
+                .where(DBBuildList.id.in_([1, 2]))
+                .values(part_count=7)
+            )
+            await db.execute(
+                update(DBCar).where(DBCar.id == 2).values(build_list_count=3)
+            )
+            await db.commit()
+
+        first = await reconcile(session_factory, Base.metadata, batch_size=1)
+        second = await reconcile(session_factory, Base.metadata, batch_size=2)
+        async with session_factory() as db:
+            return expected, await _rollups(db), first, second
+
+    expected, repaired, first, second = _run(scenario)
+    assert repaired == expected
+    assert first == {"build_lists": 2, "cars": 1}
+    assert second == {"build_lists": 0, "cars": 0}
+
+
+def test_build_list_and_car_reads_include_rollups(
+    client: TestClient, db_session: AsyncSession
+):
+    username = "rollup_reader"
+    client.post(
+        f"{settings.API_STR}/users/",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "pw123456",
+        },
+    )
+    client.post(
+        f"{settings.API_STR}/auth/token",
+        data={"username": username, "password": "pw123456"},
+    )
+    car_id = client.post(
+        f"{settings.API_STR}/cars/",
+        json={"make": "Mazda", "model": "MX-5", "year": 1990},
+    ).json()["id"]
+    build_list_ids = [
+        client.post(
+            f"{settings.API_STR}/build-lists/", json={"name": name, "car_id": car_id}
+        ).json()["id"]
+        for name in ("Street", "Track")
+    ]
+    part_ids = [
+        client.post(
+            f"{settings.API_STR}/parts/",
+            json={"name": name, "price": price, "build_list_id": build_list_ids[0]},
+        ).json()["id"]
+        for name, price in (("Seat", 800), ("Harness", 200), ("Wheel", 300))
+    ]
+    client.put(
+        f"{settings.API_STR}/parts/{part_ids[0]}",
+        json={"price": 900, "build_list_id": build_list_ids[1]},
+    )
+    client.delete(f"{settings.API_STR}/parts/{part_ids[1]}")
+
+    # The triggers changed these rows under the test's shared session; a
+    # request in production gets a new session and reads them fresh
+    db_session.expire_all()
+    response = client.get(f"{settings.API_STR}/build-lists/{build_list_ids[0]}")
+    assert response.status_code == 200, response.text
+    assert (response.json()["part_count"], response.json()["total_price"]) == (1, 300)
+    response = client.get(f"{settings.API_STR}/cars/{car_id}")
+    assert response.status_code == 200, response.text
+    assert response.json()["build_list_count"] == 2
+    assert response.json()["total_spend"] == 1200
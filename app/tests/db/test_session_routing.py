@@ -0,0 +1,96 @@
+import asyncio
+
+from fastapi import Response
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.requests import Request
+
+from app.api.models.user import User as DBUser
+from app.db import session
+from app.db.session import PRIMARY_COOKIE, RoutingSession, get_db
+
+
+def _session_factory(tmp_path) -> async_sessionmaker:
+    """A primary and a replica that never receives the primary's writes (maximum lag)."""
+    engines = {}
+    for name in ("primary", "replica"):
+        url = f"sqlite:///{tmp_path}/{name}.db"
+        DBUser.__table__.create(create_engine(url))
+        engines[name] = create_async_engine(session.async_database_url(url))
+    return async_sessionmaker(
+        bind=engines["primary"],
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        info={"replicas": [engines["replica"].sync_engine]},
+    )
+
+
+def _user(username: str) -> DBUser:
+    return DBUser(
+        username=username, email=f"{username}@example.com", hashed_password="x"
+    )
+
+
+def _find(db, username: str):
+    return db.scalar(select(DBUser).where(DBUser.username == username))
+
+
+def test_reads_go_to_replica_only_when_enabled(tmp_path):
+    session_factory = _session_factory(tmp_path)
+
+    async def scenario():
+        async with session_factory() as db:
+            db.add(_user("routing_primary_only"))
+            await db.commit()
+        async with session_factory() as db:
+            db.sync_session.info["replica_reads"] = True
+            assert await _find(db, "routing_primary_only") is None
+        async with session_factory() as db:
+            assert await _find(db, "routing_primary_only") is not None
+
+    asyncio.run(scenario())
+
+
+def test_session_reads_its_own_writes_after_first_write(tmp_path):
+    session_factory = _session_factory(tmp_path)
+
+    async def scenario():
+        async with session_factory() as db:
+            db.sync_session.info["replica_reads"] = True
+            db.add(_user("routing_sticky"))
+            await db.commit()  # the flush pins the session to the primary
+            db.expunge_all()
+            assert await _find(db, "routing_sticky") is not None
+            assert db.sync_session.info["replica_reads"] is False
+
+    asyncio.run(scenario())
+
+
+def _request(method: str, cookie: str = "") -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": method, "headers": headers})
+
+
+def _session_for(request: Request, response: Response):
+    async def open_session():
+        dependency = get_db(request, response)
+        db = await anext(dependency)
+        await dependency.aclose()
+        return db
+
+    return asyncio.run(open_session())
+
+
+def test_get_db_routes_reads_unless_client_recently_wrote(tmp_path, monkeypatch):
+    monkeypatch.setattr(session, "AsyncSessionLocal", _session_factory(tmp_path))
+
+    write_response = Response()
+    db = _session_for(_request("POST"), write_response)
+    assert not db.sync_session.info.get("replica_reads")
+    assert PRIMARY_COOKIE in write_response.headers["set-cookie"]
+
+    db = _session_for(_request("GET"), Response())
+    assert db.sync_session.info["replica_reads"] is True
+
+    db = _session_for(_request("GET", f"{PRIMARY_COOKIE}=1"), Response())
+    assert not db.sync_session.info.get("replica_reads")
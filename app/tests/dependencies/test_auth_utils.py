@@ -57,4 +57,38 @@ def test_create_access_token_custom_expiry():
     
     expected_exp_datetime = datetime.now(timezone.utc) + custom_delta
     actual_exp_datetime = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
-    assert abs((expected_exp_datetime - actual_exp_datetime).total_seconds()) < 5
\ No newline at end of file
+    assert abs((expected_exp_datetime - actual_exp_datetime).total_seconds()) < 5
+
+def test_decode_token_returns_payload_and_caches_it():
+    from app.api.dependencies.auth import decode_token, _verified_tokens
+
+    token = create_access_token({"sub": "decode_cache_user"})
+    hits_before = _verified_tokens.hits
+
+    assert decode_token(token)["sub"] == "decode_cache_user"
+    assert decode_token(token)["sub"] == "decode_cache_user"
+    assert _verified_tokens.hits == hits_before + 1
+
+
+def test_decode_token_rejects_tampered_token():
+    import pytest
+    from jose import JWTError
+    from app.api.dependencies.auth import decode_token
+
+    token = create_access_token({"sub": "tampered_user"})
+    decode_token(token)  # a cached good token must not vouch for a different one
+    with pytest.raises(JWTError):
+        decode_token(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+
+
+def test_decode_token_honors_expiry_of_cached_token():
+    import time
+    import pytest
+    from jose import JWTError
+    from app.api.dependencies.auth import decode_token
+
+    token = create_access_token({"sub": "expiring_user"}, expires_delta=timedelta(seconds=1))
+    assert decode_token(token)["sub"] == "expiring_user"
+    time.sleep(2.1)  # exp has one-second resolution
+    with pytest.raises(JWTError):
+        decode_token(token)
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.api.models.build_list import BuildList as DBBuildList
+from app.api.models.car import Car as DBCar
+from app.api.models.part import Part as DBPart
+from app.api.models.user import User as DBUser
+from app.api.schemas.token import TokenUser
+from app.api.dependencies.ownership import (
+    verify_build_list_ownership,
+    verify_car_ownership,
+    verify_part_ownership,
+)
+
+logger = logging.getLogger(__name__)
+OWNER = TokenUser(id=1)
+STRANGER = TokenUser(id=2)
+
+
+def _run(scenario):
+    """Run `scenario(db, statements)` against a seeded database, recording its SQL."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    statements = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    async def main():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(bind=engine)() as db:
+            for user_id in (OWNER.id, STRANGER.id):
+                db.add(
+                    DBUser(
+                        id=user_id,
+                        username=f"owner{user_id}",
+                        email=f"owner{user_id}@example.com",
+                        hashed_password="x",
+                    )
+                )
+            db.add(
+                DBCar(id=10, make="Make", model="Model", year=2020, user_id=OWNER.id)
+            )
+            db.add(DBBuildList(id=20, name="Build", car_id=10, owner_id=OWNER.id))
+            db.add(DBPart(id=30, name="Part", build_list_id=20, owner_id=OWNER.id))
+            await db.commit()
+            db.expunge_all()
+            statements.clear()
+            return await scenario(db, statements)
+
+    return asyncio.run(main())
+
+
+def test_part_ownership_is_one_query_and_cached_for_the_session():
+    async def scenario(db, statements):
+        part = await verify_part_ownership(30, db, OWNER, logger)
+        assert part.id == 30
+        assert len(statements) == 1
+        assert await verify_part_ownership(30, db, OWNER, logger) is part
+        assert len(statements) == 1
+
+    _run(scenario)
+
+
+def test_build_list_and_car_ownership_are_one_query_each():
+    async def scenario(db, statements):
+        assert (await verify_build_list_ownership(20, db, OWNER, logger)).id == 20
+        assert (await verify_car_ownership(10, db, OWNER, logger)).id == 10
+        assert len(statements) == 2
+
+    _run(scenario)
+
+
+def test_missing_objects_raise_404_with_detail():
+    async def scenario(db, statements):
+        with pytest.raises(HTTPException) as exc_info:
+            await verify_part_ownership(999, db, OWNER, logger, "part not found")
+        return exc_info.value
+
+    error = _run(scenario)
+    assert error.status_code == 404
+    assert error.detail == "part not found"
+
+
+def test_other_users_objects_raise_403():
+    async def scenario(db, statements):
+        errors = []
+        for verify, object_id in (
+            (verify_car_ownership, 10),
+            (verify_build_list_ownership, 20),
+            (verify_part_ownership, 30),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                await verify(object_id, db, STRANGER, logger)
+            errors.append(exc_info.value)
+        return errors
+
+    errors = _run(scenario)
+    assert [e.status_code for e in errors] == [403, 403, 403]
+    assert errors[2].detail == "Not authorized to perform this action on this part"
+
+
+def _login(client: TestClient, username: str):
+    user_data = {
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": "testpassword",
+    }
+    response = client.post(f"{settings.API_STR}/users/", json=user_data)
+    assert response.status_code == 200, response.text
+    response = client.post(
+        f"{settings.API_STR}/auth/token",
+        data={"username": username, "password": "testpassword"},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def _create(client: TestClient, path: str, data: dict) -> int:
+    response = client.post(f"{settings.API_STR}/{path}/", json=data)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_owner_id_is_set_on_create_and_kept_on_moves(
+    client: TestClient, db_session: AsyncSession
+):
+    user_id = _login(client, "owner_id_user")
+    car = {"make": "Make", "model": "Model", "year": 2020}
+    car_ids = [_create(client, "cars", car) for _ in range(2)]
+    build_list_ids = [
+        _create(client, "build-lists", {"name": "Build", "car_id": car_ids[0]})
+        for _ in range(2)
+    ]
+    part_id = _create(
+        client, "parts", {"name": "Part", "build_list_id": build_list_ids[0]}
+    )
+
+    response = client.put(
+        f"{settings.API_STR}/parts/{part_id}",
+        json={"build_list_id": build_list_ids[1]},
+    )
+    assert response.status_code == 200, response.text
+    response = client.put(
+        f"{settings.API_STR}/build-lists/{build_list_ids[1]}",
+        json={"car_id": car_ids[1]},
+    )
+    assert response.status_code == 200, response.text
+
+    def owners(model):
+        query = select(model.owner_id).where(model.id.in_([part_id, *build_list_ids]))
+        return set(client.portal.call(db_session.scalars, query))
+
+    assert owners(DBBuildList) == {user_id}
+    assert owners(DBPart) == {user_id}
@@ -0,0 +1,91 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.api.dependencies.pagination import (
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def test_cursor_round_trip():
+    for last_id in (1, 42, 2**40):
+        cursor = encode_cursor(last_id)
+        assert str(last_id) not in cursor  # opaque to clients
+        assert decode_cursor(cursor) == last_id
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", encode_cursor(1)[:-2]])
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+def _login(client: TestClient, username: str):
+    password = "testpassword"
+    client.post(
+        f"{settings.API_STR}/users/",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": password,
+        },
+    )
+    response = client.post(
+        f"{settings.API_STR}/auth/token",
+        data={"username": username, "password": password},
+    )
+    assert response.status_code == 200, response.text
+
+
+def test_parts_listing_pages_with_cursor_and_total(
+    client: TestClient, db_session: AsyncSession, sql_statements: list
+):
+    _login(client, "pager")
+    car_id = client.post(
+        f"{settings.API_STR}/cars/",
+        json={"make": "Lotus", "model": "Elise", "year": 2004},
+    ).json()["id"]
+    build_list_id = client.post(
+        f"{settings.API_STR}/build-lists/", json={"name": "Paged", "car_id": car_id}
+    ).json()["id"]
+    part_ids = [
+        client.post(
+            f"{settings.API_STR}/parts/",
+            json={"name": f"Part {n}", "build_list_id": build_list_id},
+        ).json()["id"]
+        for n in range(5)
+    ]
+    url = f"{settings.API_STR}/parts/build-list/{build_list_id}"
+
+    response = client.get(url, params={"limit": 2, "include_total": True})
+    assert response.status_code == 200, response.text
+    assert response.headers[TOTAL_COUNT_HEADER] == "5"
+    seen = [part["id"] for part in response.json()]
+
+    while NEXT_CURSOR_HEADER in response.headers:
+        sql_statements.clear()
+        response = client.get(
+            url, params={"limit": 2, "cursor": response.headers[NEXT_CURSOR_HEADER]}
+        )
+        assert response.status_code == 200, response.text
+        assert len(sql_statements) == 1  # one range scan per page, no count
+        seen += [part["id"] for part in response.json()]
+
+    assert seen == part_ids
+    assert len(response.json()) == 1
+    assert TOTAL_COUNT_HEADER not in response.headers
+
+
+def test_limit_is_bounded(client: TestClient, db_session: AsyncSession):
+    url = f"{settings.API_STR}/cars/user/1"
+    assert client.get(url, params={"limit": 0}).status_code == 422
+    assert (
+        client.get(url, params={"limit": settings.PAGE_SIZE_MAX + 1}).status_code == 422
+    )
+    assert client.get(url, params={"cursor": "bogus"}).status_code == 400
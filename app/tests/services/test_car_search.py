@@ -0,0 +1,123 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.api.models.car import Car as DBCar
+from app.api.models.user import User as DBUser
+from app.api.services.car_search import (
+    TrigramIndex,
+    car_search_index,
+    search_cars,
+    trigrams,
+)
+
+CARS = [
+    # id, make, model
+    (1, "Honda", "Civic"),
+    (2, "Honda", "Accord"),
+    (3, "BMW", "M3"),
+    (4, "Subaru", "Impreza WRX"),
+]
+
+
+def _run(scenario):
+    """Run `scenario(db)` against an in-memory database seeded with CARS."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def main():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(bind=engine)() as db:
+            db.add(
+                DBUser(id=1, username="u", email="u@example.com", hashed_password="x")
+            )
+            for id, make, model in CARS:
+                db.add(DBCar(id=id, make=make, model=model, year=2020, user_id=1))
+            await db.commit()
+            car_search_index.invalidate()
+            return await scenario(db)
+
+    return asyncio.run(main())
+
+
+def _ids(results):
+    return [car.id for car, _ in results]
+
+
+def test_trigrams_match_pg_trgm():
+    # SELECT show_trgm('Civic!') in Postgres
+    assert trigrams("Civic!") == {"  c", " ci", "civ", "ivi", "vic", "ic "}
+    assert trigrams("M3") == {"  m", " m3", "m3 "}
+    assert trigrams("--") == set()
+
+
+def test_index_ranks_by_share_of_query_trigrams():
+    index = TrigramIndex([(id, f"{make} {model}") for id, make, model in CARS])
+    assert index.search("honda civic", limit=10, threshold=0.5)[0] == (1, 1.0)
+    # A typo keeps enough trigrams to match
+    assert [id for id, _ in index.search("Civc", limit=10, threshold=0.5)] == [1]
+    assert [id for id, _ in index.search("hond", limit=10, threshold=0.5)] == [1, 2]
+    assert index.search("hond", limit=1, threshold=0.5) == [(1, 0.8)]
+    assert index.search("toyota", limit=10, threshold=0.5) == []
+    assert index.search("", limit=10, threshold=0.0) == []
+
+
+def test_search_cars_typo_tolerant_and_thresholded():
+    async def scenario(db):
+        return (
+            await search_cars(db, "imprezza", limit=10),
+            await search_cars(db, "bmw", limit=10),
+            await search_cars(db, "acord", limit=10, threshold=0.9),
+        )
+
+    typo, make, strict = _run(scenario)
+    assert _ids(typo) == [4]
+    assert _ids(make) == [3]
+    assert strict == []
+
+
+def test_index_is_rebuilt_after_invalidation():
+    async def scenario(db):
+        assert _ids(await search_cars(db, "civic", limit=10)) == [1]
+        await db.execute(delete(DBCar).where(DBCar.id == 1))
+        db.add(DBCar(id=5, make="Honda", model="Civic Type R", year=2023, user_id=1))
+        await db.commit()
+        car_search_index.invalidate()
+        return await search_cars(db, "civic", limit=10)
+
+    assert _ids(_run(scenario)) == [5]
+
+
+def test_search_endpoint_sees_new_cars(client: TestClient, db_session: AsyncSession):
+    username = "car_searcher"
+    client.post(
+        f"{settings.API_STR}/users/",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "pw123456",
+        },
+    )
+    client.post(
+        f"{settings.API_STR}/auth/token",
+        data={"username": username, "password": "pw123456"},
+    )
+    url = f"{settings.API_STR}/cars/search"
+    assert client.get(url, params={"q": "mazda"}).json() == []
+    for make, model in (("Mazda", "MX-5 Miata"), ("Mazda", "RX-7"), ("Nissan", "GT-R")):
+        client.post(
+            f"{settings.API_STR}/cars/",
+            json={"make": make, "model": model, "year": 1995},
+        )
+
+    response = client.get(url, params={"q": "miatta mazda"})
+    assert response.status_code == 200, response.text
+    assert [car["model"] for car in response.json()][0] == "MX-5 Miata"
+    response = client.get(url, params={"q": "mazda", "limit": 1})
+    assert len(response.json()) == 1
+    assert client.get(url, params={"q": ""}).status_code == 422
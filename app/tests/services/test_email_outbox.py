@@ -0,0 +1,177 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.email import FakeEmailProvider
+from app.api.models.email_outbox import EmailOutbox
+from app.api.services.email_outbox import EmailDispatcher, enqueue_email
+
+
+def _session_factory() -> async_sessionmaker:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def create_table():
+        async with engine.begin() as connection:
+            await connection.run_sync(EmailOutbox.__table__.create)
+
+    asyncio.run(create_table())
+    return async_sessionmaker(bind=engine)
+
+
+def _enqueue(session_factory: async_sessionmaker, count: int = 1):
+    async def enqueue():
+        async with session_factory() as db:
+            for i in range(count):
+                enqueue_email(db, f"user{i}@example.com", "template", {"link": f"/{i}"})
+            await db.commit()
+
+    asyncio.run(enqueue())
+
+
+def _messages(session_factory: async_sessionmaker):
+    async def messages():
+        async with session_factory() as db:
+            return (await db.scalars(select(EmailOutbox))).all()
+
+    return asyncio.run(messages())
+
+
+def test_dispatcher_sends_pending_messages():
+    session_factory = _session_factory()
+    _enqueue(session_factory, count=3)
+    provider = FakeEmailProvider()
+    dispatcher = EmailDispatcher(provider, session_factory, batch_size=2)
+
+    assert asyncio.run(dispatcher.dispatch_once()) == 2
+    assert asyncio.run(dispatcher.dispatch_once()) == 1
+    assert asyncio.run(dispatcher.dispatch_once()) == 0
+
+    assert [m["to_email"] for m in provider.sent] == [
+        "user0@example.com",
+        "user1@example.com",
+        "user2@example.com",
+    ]
+    assert {m.status for m in _messages(session_factory)} == {"sent"}
+
+
+def test_sent_messages_drop_template_data():
+    session_factory = _session_factory()
+    _enqueue(session_factory)
+    dispatcher = EmailDispatcher(FakeEmailProvider(), session_factory)
+
+    asyncio.run(dispatcher.dispatch_once())
+    [message] = _messages(session_factory)
+    assert message.status == "sent"
+    assert message.template_data == {}
+
+
+def test_crash_mid_batch_resends_only_unreported_messages():
+    class Crash(BaseException):
+        pass
+
+    class CrashingProvider(FakeEmailProvider):
+        crashed = False
+
+        def send(self, to_email, template_id, dynamic_template_data):
+            # The worker dies while sending the second message of the batch
+            if to_email == "user1@example.com" and not self.crashed:
+                self.crashed = True
+                raise Crash()
+            return super().send(to_email, template_id, dynamic_template_data)
+
+    session_factory = _session_factory()
+    _enqueue(session_factory, count=3)
+    provider = CrashingProvider()
+    dispatcher = EmailDispatcher(provider, session_factory, lease=60)
+
+    try:
+        asyncio.run(dispatcher.dispatch_once())
+    except Crash:
+        pass
+    # The claim was committed before sending, and each send recorded on its own
+    statuses = {m.to_email: m.status for m in _messages(session_factory)}
+    assert statuses["user0@example.com"] == "sent"
+    # The rest stay leased until the lease runs out
+    assert asyncio.run(dispatcher.dispatch_once()) == 0
+
+    async def expire_lease():
+        async with session_factory() as db:
+            await db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.status == "pending")
+                .values(next_attempt_at=0)
+            )
+            await db.commit()
+
+    asyncio.run(expire_lease())
+    assert asyncio.run(dispatcher.dispatch_once()) == 2
+    assert [m["to_email"] for m in provider.sent] == [
+        "user0@example.com",
+        "user1@example.com",
+        "user2@example.com",
+    ]
+
+
+def test_failed_sends_back_off_then_dead_letter():
+    session_factory = _session_factory()
+    _enqueue(session_factory)
+    provider = FakeEmailProvider(fail_next=10)
+    dispatcher = EmailDispatcher(
+        provider, session_factory, max_attempts=3, base_backoff=60
+    )
+
+    assert asyncio.run(dispatcher.dispatch_once()) == 1
+    # Not due again until the backoff has passed
+    assert asyncio.run(dispatcher.dispatch_once()) == 0
+
+    async def skip_backoff():
+        async with session_factory() as db:
+            await db.execute(update(EmailOutbox).values(next_attempt_at=0))
+            await db.commit()
+
+    for expected_attempts in (2, 3):
+        asyncio.run(skip_backoff())
+        assert asyncio.run(dispatcher.dispatch_once()) == 1
+
+    [message] = _messages(session_factory)
+    assert message.status == "dead"
+    assert message.attempts == 3
+    assert "Simulated provider failure" in message.last_error
+    assert provider.sent == []
+    assert dispatcher.stats()["dead_lettered"] == 1
+
+
+def test_backoff_grows_exponentially_up_to_cap():
+    dispatcher = EmailDispatcher(
+        FakeEmailProvider(), _session_factory(), base_backoff=10, max_backoff=50
+    )
+    assert [dispatcher.backoff(n) for n in (1, 2, 3, 4)] == [10, 20, 40, 50]
+
+
+def test_forgot_password_enqueues_instead_of_sending(
+    client: TestClient, db_session: AsyncSession
+):
+    user_data = {
+        "username": "outbox_user",
+        "email": "outbox_user@example.com",
+        "password": "testpassword",
+    }
+    assert client.post(f"{settings.API_STR}/users/", json=user_data).status_code == 200
+
+    response = client.post(
+        f"{settings.API_STR}/auth/forgot-password",
+        json={"email": "outbox_user@example.com"},
+    )
+    assert response.status_code == 200, response.text
+
+    message = client.portal.call(
+        db_session.scalar,
+        select(EmailOutbox).where(EmailOutbox.to_email == "outbox_user@example.com"),
+    )
+    assert message.status == "pending"
+    assert message.template_id == settings.SENDGRID_RESET_PASSWORD_TEMPLATE_ID
+    assert "reset_password_link" in message.template_data
@@ -0,0 +1,188 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.api.models.build_list import BuildList as DBBuildList
+from app.api.models.car import Car as DBCar
+from app.api.models.part import Part as DBPart
+from app.api.models.user import User as DBUser
+from app.api.dependencies.pagination import NEXT_CURSOR_HEADER
+from app.api.services.part_search import fts5_query, search_parts
+
+PARTS = [
+    # id, build list, name, manufacturer, part number, description
+    (1, 1, "Brake pads", "Brembo", "BP-100", "Ceramic pads for street use"),
+    (2, 1, "Brake rotor", "Brembo", "BR-200", "Slotted rotor"),
+    (3, 1, "Oil filter", "Bosch", "OF-300", "Fits most engines; not for brakes"),
+    (4, 2, "Brake lines", "Goodridge", "BL-400", "Stainless braided"),
+    (5, 2, "Spark plugs", "NGK", "SP-500", "Iridium"),
+]
+
+
+def _run(scenario):
+    """Run `scenario(db)` against an in-memory database seeded with PARTS."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def main():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(bind=engine)() as db:
+            db.add(
+                DBUser(id=1, username="u", email="u@example.com", hashed_password="x")
+            )
+            db.add(DBCar(id=1, make="Make", model="Model", year=2020, user_id=1))
+            for build_list_id in (1, 2):
+                db.add(DBBuildList(id=build_list_id, name="B", car_id=1, owner_id=1))
+            for (
+                id,
+                build_list_id,
+                name,
+                manufacturer,
+                part_number,
+                description,
+            ) in PARTS:
+                db.add(
+                    DBPart(
+                        id=id,
+                        build_list_id=build_list_id,
+                        name=name,
+                        manufacturer=manufacturer,
+                        part_number=part_number,
+                        description=description,
+                        owner_id=1,
+                    )
+                )
+            await db.commit()
+            return await scenario(db)
+
+    return asyncio.run(main())
+
+
+def _ids(results):
+    return [part.id for part, _ in results]
+
+
+def test_name_matches_rank_above_description_matches():
+    async def scenario(db):
+        return await search_parts(db, "brake", limit=10)
+
+    results = _run(scenario)
+    # Stemming matches "brakes"; the description-only match comes last
+    assert set(_ids(results)) == {1, 2, 3, 4}
+    assert _ids(results)[-1] == 3
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_words_are_anded_and_fields_combined():
+    async def scenario(db):
+        return (
+            await search_parts(db, "brembo slotted", limit=10),
+            await search_parts(db, "BR-200", limit=10),
+            await search_parts(db, "brake", limit=10, build_list_id=2),
+        )
+
+    both_fields, part_number, filtered = _run(scenario)
+    assert _ids(both_fields) == [2]
+    assert _ids(part_number) == [2]
+    assert _ids(filtered) == [4]
+
+
+def test_keyset_pages_cover_every_match_once():
+    async def scenario(db):
+        seen, after = [], None
+        while True:
+            page = await search_parts(db, "brake", limit=1, after=after)
+            if not page:
+                return seen
+            seen += _ids(page)
+            part, score = page[-1]
+            after = (score, part.id)
+
+    seen = _run(scenario)
+    assert sorted(seen) == [1, 2, 3, 4]
+    assert len(seen) == 4
+
+
+def test_index_follows_updates_and_deletes():
+    async def scenario(db):
+        await db.execute(
+            update(DBPart).where(DBPart.id == 5).values(name="Brake caliper")
+        )
+        await db.execute(delete(DBPart).where(DBPart.id == 1))
+        await db.commit()
+        return await search_parts(db, "brake", limit=10)
+
+    assert set(_ids(_run(scenario))) == {2, 3, 4, 5}
+
+
+def test_operators_in_user_input_are_treated_as_words():
+    assert fts5_query('brake "pads" OR -(rotor*') == '"brake" "pads" "OR" "rotor"'
+    assert fts5_query("*** --") is None
+
+    async def scenario(db):
+        return await search_parts(db, "NEAR(brake", limit=10)
+
+    assert _run(scenario) == []
+
+
+def test_search_endpoint_pages_with_cursor(
+    client: TestClient, db_session: AsyncSession
+):
+    username = "part_searcher"
+    client.post(
+        f"{settings.API_STR}/users/",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "pw123456",
+        },
+    )
+    client.post(
+        f"{settings.API_STR}/auth/token",
+        data={"username": username, "password": "pw123456"},
+    )
+    car_id = client.post(
+        f"{settings.API_STR}/cars/",
+        json={"make": "Subaru", "model": "WRX", "year": 2015},
+    ).json()["id"]
+    build_list_id = client.post(
+        f"{settings.API_STR}/build-lists/", json={"name": "Rally", "car_id": car_id}
+    ).json()["id"]
+    for name in ("Turbo inlet", "Turbo blanket", "Intercooler"):
+        client.post(
+            f"{settings.API_STR}/parts/",
+            json={
+                "name": name,
+                "description": "turbo kit",
+                "build_list_id": build_list_id,
+            },
+        )
+
+    url = f"{settings.API_STR}/parts/search"
+    response = client.get(url, params={"q": "turbo", "limit": 2})
+    assert response.status_code == 200, response.text
+    names = [part["name"] for part in response.json()]
+    assert len(names) == 2
+    response = client.get(
+        url,
+        params={
+            "q": "turbo",
+            "limit": 2,
+            "cursor": response.headers[NEXT_CURSOR_HEADER],
+        },
+    )
+    assert response.status_code == 200, response.text
+    names += [part["name"] for part in response.json()]
+    assert NEXT_CURSOR_HEADER not in response.headers
+    # The description-only match ranks last
+    assert sorted(names[:2]) == ["Turbo blanket", "Turbo inlet"]
+    assert names[2] == "Intercooler"
+
+    assert client.get(url, params={"q": "turbo", "cursor": "e30"}).status_code == 400
+    assert client.get(url, params={"q": ""}).status_code == 422
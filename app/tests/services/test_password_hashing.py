@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.services.password_hashing import PasswordHasher
+
+
+def test_hash_and_verify_roundtrip():
+    hasher = PasswordHasher(max_workers=1, max_queue=4, timeout=10)
+    hashed = asyncio.run(hasher.hash("hunter22"))
+    assert hashed != "hunter22"
+    assert asyncio.run(hasher.verify("hunter22", hashed)) is True
+    assert asyncio.run(hasher.verify("wrong", hashed)) is False
+
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["queued"] == 0
+    assert stats["in_flight"] == 0
+    hasher.shutdown()
+
+
+def test_does_not_block_event_loop():
+    hasher = PasswordHasher(max_workers=1, max_queue=4, timeout=10)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        await hasher._run(time.sleep, 0.2)
+        ticker_task.cancel()
+        return ticks
+
+    # The loop keeps ticking while the worker thread sleeps
+    assert asyncio.run(scenario()) > 5
+    hasher.shutdown()
+
+
+def test_rejects_when_queue_is_full():
+    hasher = PasswordHasher(max_workers=1, max_queue=1, timeout=10)
+    release = threading.Event()
+
+    async def scenario():
+        # First call occupies the only worker, second fills the queue
+        first = asyncio.create_task(hasher._run(release.wait))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(hasher._run(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as exc_info:
+            await hasher._run(release.wait)
+        release.set()
+        await asyncio.gather(first, second)
+        return exc_info.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert hasher.stats()["rejected"] == 1
+    assert hasher.stats()["max_queue_depth"] == 1
+    hasher.shutdown()
+
+
+def test_times_out_slow_calls():
+    hasher = PasswordHasher(max_workers=1, max_queue=4, timeout=0.05)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(hasher._run(time.sleep, 0.3))
+    assert exc_info.value.status_code == 503
+    assert hasher.stats()["timed_out"] == 1
+    hasher.shutdown()
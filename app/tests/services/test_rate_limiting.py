@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.api.models.rate_limit_counter import RateLimitCounter
+from app.api.services.password_hashing import password_hasher
+from app.api.services.rate_limiting import (
+    DatabaseRateLimitBackend,
+    InMemoryRateLimitBackend,
+    RateLimitBackend,
+    RateLimiter,
+)
+
+
+def test_enforce_rejects_once_limit_is_exceeded():
+    limiter = RateLimiter(InMemoryRateLimitBackend())
+
+    async def scenario():
+        for _ in range(3):
+            await limiter.enforce(("key", 3, 60))
+        with pytest.raises(HTTPException) as exc_info:
+            await limiter.enforce(("key", 3, 60))
+        return exc_info.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 429
+    assert 0 < int(error.headers["Retry-After"]) <= 60
+    # Other keys have their own budget
+    asyncio.run(limiter.enforce(("other-key", 3, 60)))
+
+
+def test_replicas_sharing_a_backend_share_one_budget():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    backend = DatabaseRateLimitBackend(async_sessionmaker(bind=engine))
+    replica_a, replica_b = RateLimiter(backend), RateLimiter(backend)
+
+    async def scenario():
+        async with engine.begin() as connection:
+            await connection.run_sync(RateLimitCounter.__table__.create)
+        await replica_a.enforce(("shared", 2, 60))
+        await replica_b.enforce(("shared", 2, 60))
+        with pytest.raises(HTTPException):
+            await replica_a.enforce(("shared", 2, 60))
+
+    asyncio.run(scenario())
+
+
+def test_incomplete_backend_fails_on_creation():
+    class NoPurge(RateLimitBackend):
+        async def increment(self, key, window_start, expires_at):
+            return 1
+
+        async def get(self, key, window_start):
+            return 0
+
+    with pytest.raises(TypeError):
+        NoPurge()
+
+
+def test_login_is_throttled_before_password_check(
+    client: TestClient, db_session: AsyncSession, monkeypatch
+):
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_USERNAME", 2)
+    user_data = {
+        "username": "throttled_user",
+        "email": "throttled_user@example.com",
+        "password": "testpassword",
+    }
+    assert client.post(f"{settings.API_STR}/users/", json=user_data).status_code == 200
+
+    bad_login = {"username": "throttled_user", "password": "wrong"}
+    for _ in range(2):
+        response = client.post(f"{settings.API_STR}/auth/token", data=bad_login)
+        assert response.status_code == 401
+
+    hashes_before = password_hasher.stats()["completed"]
+    response = client.post(f"{settings.API_STR}/auth/token", data=bad_login)
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
+    assert password_hasher.stats()["completed"] == hashes_before
+
+
+def test_per_ip_budgets_follow_forwarded_client_behind_proxy(
+    client: TestClient, db_session: AsyncSession, monkeypatch
+):
+    monkeypatch.setattr(settings, "TRUSTED_PROXY_CIDRS", ["10.0.0.0/8"])
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_IP", 2)
+    # Every request reaches the app from the ingress
+    monkeypatch.setattr(client._transport, "client", ("10.0.0.7", 50000))
+    attempts = iter(range(100))
+
+    def login(forwarded_for: str) -> int:
+        # A fresh username each time, so only the per-IP limit applies
+        bad_login = {"username": f"nobody_{next(attempts)}", "password": "wrong"}
+        return client.post(
+            f"{settings.API_STR}/auth/token",
+            data=bad_login,
+            headers={"X-Forwarded-For": forwarded_for},
+        ).status_code
+
+    assert [login("203.0.113.5") for _ in range(3)] == [401, 401, 429]
+    # Another client behind the same ingress has its own budget...
+    assert login("198.51.100.9") == 401
+    # ...and a client cannot claim a fresh one by prepending an address
+    assert login("192.0.2.1, 203.0.113.5") == 429
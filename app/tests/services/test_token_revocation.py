@@ -0,0 +1,123 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.api.models.revoked_token import RevokedToken
+from app.api.services.token_revocation import (
+    BloomFilter,
+    DatabaseRevocationBackend,
+    InMemoryRevocationBackend,
+    RevocationBackend,
+    TokenRevocationStore,
+)
+
+
+def _store(backend=None) -> TokenRevocationStore:
+    return TokenRevocationStore(
+        backend=backend or InMemoryRevocationBackend(),
+        capacity=1000,
+        error_rate=0.01,
+        sync_interval=30,
+    )
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [uuid.uuid4().hex for _ in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+    assert false_positives < 300  # ~1% expected
+
+
+def test_unrevoked_tokens_never_reach_backend():
+    store = _store()
+    asyncio.run(store.revoke("revoked-jti", int(time.time()) + 60))
+
+    assert asyncio.run(store.is_revoked("revoked-jti")) is True
+    for _ in range(100):
+        assert asyncio.run(store.is_revoked(uuid.uuid4().hex)) is False
+    assert store.stats()["backend_lookups"] - store.stats()["false_positives"] == 1
+
+
+def test_sync_picks_up_other_replicas_and_purges_expired():
+    shared = InMemoryRevocationBackend()
+    replica_a, replica_b = _store(shared), _store(shared)
+    now = int(time.time())
+
+    asyncio.run(replica_a.revoke("live-jti", now + 60))
+    asyncio.run(shared.revoke("expired-jti", now - 1))
+    assert asyncio.run(replica_b.is_revoked("live-jti")) is False  # not synced yet
+
+    asyncio.run(replica_b.sync())
+    assert asyncio.run(replica_b.is_revoked("live-jti")) is True
+    assert asyncio.run(shared.active_ids(now)) == ["live-jti"]
+    assert replica_b.stats()["entries"] == 1
+
+
+def test_database_backend_roundtrip():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    backend = DatabaseRevocationBackend(async_sessionmaker(bind=engine))
+    now = int(time.time())
+
+    async def scenario():
+        async with engine.begin() as connection:
+            await connection.run_sync(RevokedToken.__table__.create)
+        await backend.revoke("db-jti", now + 60)
+        await backend.revoke("db-old-jti", now - 60)
+        assert await backend.is_revoked("db-jti", now) is True
+        assert await backend.is_revoked("db-old-jti", now) is False
+        assert await backend.purge_expired(now) == 1
+        assert await backend.active_ids(now) == ["db-jti"]
+        assert await backend.claim("db-claimed-jti", now + 60) is True
+        assert await backend.claim("db-claimed-jti", now + 60) is False
+        assert await backend.claim("db-jti", now + 60) is False
+
+    asyncio.run(scenario())
+
+
+def test_claim_succeeds_once_across_replicas():
+    shared = InMemoryRevocationBackend()
+    replica_a, replica_b = _store(shared), _store(shared)
+    expires_at = int(time.time()) + 60
+
+    async def scenario():
+        return await asyncio.gather(
+            replica_a.claim("refresh-jti", expires_at),
+            replica_b.claim("refresh-jti", expires_at),
+        )
+
+    # Neither replica has synced, so only the backend can tell them apart
+    assert sorted(asyncio.run(scenario())) == [False, True]
+    assert asyncio.run(replica_a.claim(None, expires_at)) is False
+
+
+def test_revocations_during_sync_survive_the_rebuild():
+    store = _store()
+
+    class RevokeDuringSnapshot(InMemoryRevocationBackend):
+        async def active_ids(self, now: int):
+            snapshot = await super().active_ids(now)
+            # A logout lands after the snapshot was read but before the swap
+            await store.revoke("late-jti", now + 60)
+            return snapshot
+
+    store.backend = RevokeDuringSnapshot()
+    asyncio.run(store.sync())
+    assert asyncio.run(store.is_revoked("late-jti")) is True
+
+
+def test_incomplete_backend_fails_on_creation():
+    class NoClaim(RevocationBackend):
+        async def revoke(self, jti, expires_at):
+            pass
+
+    with pytest.raises(TypeError):
+        NoClaim()
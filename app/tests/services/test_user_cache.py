@@ -0,0 +1,83 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.api.dependencies.auth import ACCESS_TOKEN_TYPE, get_current_user, read_token
+from app.api.services.user_cache import user_cache
+
+
+def _create_and_login(
+    client: TestClient, username: str, password: str = "testpassword"
+):
+    user_data = {
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": password,
+    }
+    response = client.post(f"{settings.API_STR}/users/", json=user_data)
+    assert response.status_code == 200, response.text
+    login_response = client.post(
+        f"{settings.API_STR}/auth/token",
+        data={"username": username, "password": password},
+    )
+    assert login_response.status_code == 200, login_response.text
+    return response.json()
+
+
+def test_repeat_requests_are_served_from_cache(client: TestClient, db_session: AsyncSession):
+    _create_and_login(client, "user_cache_hits")
+    before = user_cache.stats()
+
+    for _ in range(3):
+        response = client.get(f"{settings.API_STR}/users/me")
+        assert response.status_code == 200, response.text
+        assert response.json()["username"] == "user_cache_hits"
+
+    after = user_cache.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 2
+
+
+def test_update_user_invalidates_cached_entry(client: TestClient, db_session: AsyncSession):
+    user = _create_and_login(client, "user_cache_update")
+    assert client.get(f"{settings.API_STR}/users/me").status_code == 200
+    assert user_cache.stats()["size"] == 1
+
+    response = client.put(
+        f"{settings.API_STR}/users/{user['id']}",
+        json={"current_password": "testpassword", "email": "cache_updated@example.com"},
+    )
+    assert response.status_code == 200, response.text
+    assert user_cache.stats()["size"] == 0
+
+    me = client.get(f"{settings.API_STR}/users/me")
+    assert me.status_code == 200
+    assert me.json()["email"] == "cache_updated@example.com"
+
+
+def test_delete_user_invalidates_cached_entry(client: TestClient, db_session: AsyncSession):
+    user = _create_and_login(client, "user_cache_delete")
+    assert client.get(f"{settings.API_STR}/users/me").status_code == 200
+
+    response = client.delete(f"{settings.API_STR}/users/{user['id']}")
+    assert response.status_code == 200, response.text
+
+    # The still-valid cookie must not resolve to the deleted user
+    assert client.get(f"{settings.API_STR}/users/me").status_code == 401
+
+
+def test_cached_user_carries_token_version(client: TestClient, db_session: AsyncSession):
+    _create_and_login(client, "user_cache_token_version")
+    token_user = read_token(client.cookies.get("access_token"), ACCESS_TOKEN_TYPE)
+
+    async def current_token_version() -> int:
+        # A fresh identity map, as in a new request; reading a column the cache
+        # does not hold would then lazy-load and fail here
+        db_session.expunge_all()
+        user = await get_current_user(token_user, db_session)
+        return user.token_version
+
+    assert client.portal.call(current_token_version) == token_user.token_version
+    hits = user_cache.stats()["hits"]
+    assert client.portal.call(current_token_version) == token_user.token_version
+    assert user_cache.stats()["hits"] == hits + 1
@@ -1,7 +1,26 @@
 from fastapi.testclient import TestClient
+from app.core.config import settings
 
 def test_read_root(client: TestClient): # Inject the client fixture
     response = client.get("/")
     assert response.status_code == 200
     assert response.json() == {"Hello": "World"}
 
+
+
+def test_read_internal_metrics(client: TestClient):
+    response = client.get(
+        f"{settings.API_STR}/internal/metrics",
+        headers={"X-Internal-Token": settings.INTERNAL_API_TOKEN},
+    )
+    assert response.status_code == 200
+    assert "password_hasher" in response.json()
+
+
+def test_internal_metrics_require_token(client: TestClient, monkeypatch):
+    url = f"{settings.API_STR}/internal/metrics"
+    assert client.get(url).status_code == 401
+    assert client.get(url, headers={"X-Internal-Token": "wrong"}).status_code == 401
+    # Without a configured token the endpoint does not exist
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "")
+    assert client.get(url, headers={"X-Internal-Token": ""}).status_code == 404
@@ -0,0 +1,53 @@
+from app.api.utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_and_set_count_hits_and_misses():
+    cache = TTLCache(max_size=2, ttl=10)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(max_size=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    clock.now += 9
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_per_entry_ttl_cannot_exceed_default():
+    clock = FakeClock()
+    cache = TTLCache(max_size=2, ttl=10, clock=clock)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=100)
+    clock.now += 5
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    clock.now += 6
+    assert cache.get("long") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
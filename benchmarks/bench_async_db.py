@@ -0,0 +1,85 @@
+"""
+Concurrency benchmark: many concurrent handlers each running one query, with
+a blocking Session (the old get_db) versus an AsyncSession (the current one).
+Query latency is simulated with a SQLite function that sleeps inside the
+database driver, standing in for a round trip to Postgres.
+
+    python -m benchmarks.bench_async_db [requests] [latency_ms]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Settings require these; the values do not affect the measurement
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("SENDGRID_API_KEY", "unused")
+os.environ.setdefault("EMAIL_FROM", "bench@example.com")
+os.environ.setdefault("SENDGRID_VERIFY_EMAIL_TEMPLATE_ID", "unused")
+os.environ.setdefault("SENDGRID_RESET_PASSWORD_TEMPLATE_ID", "unused")
+
+from sqlalchemy import create_engine, event, func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db.session import async_database_url  # noqa: E402
+
+
+def _add_latency(engine, latency: float):
+    @event.listens_for(engine, "connect")
+    def register(dbapi_connection, connection_record):
+        def sleep(value):
+            time.sleep(latency)
+            return value
+
+        dbapi_connection.create_function("sleep", 1, sleep)
+
+
+def main(requests: int, latency_ms: float):
+    latency = latency_ms / 1000
+    url = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    query = select(func.sleep(1))
+
+    sync_engine = create_engine(url, connect_args={"check_same_thread": False})
+    _add_latency(sync_engine, latency)
+    SessionLocal = sessionmaker(bind=sync_engine)
+
+    async def blocking_handler():
+        with SessionLocal() as db:
+            return db.scalar(query)  # blocks the event loop for the whole query
+
+    async_engine = create_async_engine(async_database_url(url))
+    _add_latency(async_engine.sync_engine, latency)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine)
+
+    async def async_handler():
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(query)
+
+    async def run(handler) -> float:
+        await handler()  # warm up the pool
+        started = time.perf_counter()
+        await asyncio.gather(*(handler() for _ in range(requests)))
+        return time.perf_counter() - started
+
+    blocking_seconds = asyncio.run(run(blocking_handler))
+
+    async def run_async() -> float:
+        seconds = await run(async_handler)
+        await async_engine.dispose()
+        return seconds
+
+    async_seconds = asyncio.run(run_async())
+
+    print(f"{requests} concurrent requests, {latency_ms:.0f} ms per query")
+    print(f"     Session: {requests / blocking_seconds:8.1f} requests/s")
+    print(f"AsyncSession: {requests / async_seconds:8.1f} requests/s")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 10.0,
+    )
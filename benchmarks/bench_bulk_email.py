@@ -0,0 +1,48 @@
+"""
+Load test for bulk sends: one request per recipient versus multi-recipient
+batches, against a fake provider that simulates SendGrid latency.
+
+    python -m benchmarks.bench_bulk_email [recipients] [latency_ms] [batch_size]
+"""
+
+import os
+import sys
+import time
+
+# Settings require these; the values do not affect the measurement
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("SENDGRID_API_KEY", "unused")
+os.environ.setdefault("EMAIL_FROM", "bench@example.com")
+os.environ.setdefault("SENDGRID_VERIFY_EMAIL_TEMPLATE_ID", "unused")
+os.environ.setdefault("SENDGRID_RESET_PASSWORD_TEMPLATE_ID", "unused")
+
+from app.core.email import FakeEmailProvider, send_bulk_email  # noqa: E402
+
+
+def main(recipients: int, latency_ms: float, batch_size: int):
+    latency = latency_ms / 1000
+    targets = [(f"user{i}@example.com", {"n": i}) for i in range(recipients)]
+
+    provider = FakeEmailProvider(latency=latency)
+    started = time.perf_counter()
+    for to_email, data in targets:
+        provider.send(to_email, "template", data)
+    single_seconds = time.perf_counter() - started
+
+    provider = FakeEmailProvider(latency=latency)
+    report = send_bulk_email("template", targets, batch_size, provider=provider)
+    assert report.sent == recipients
+
+    print(f"one per request: {recipients / single_seconds:10.1f} recipients/s")
+    print(
+        f"  batches of {batch_size}: {recipients / report.seconds:10.1f} recipients/s "
+        f"({provider.requests} requests)"
+    )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 50.0,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 500,
+    )
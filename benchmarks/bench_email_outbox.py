@@ -0,0 +1,62 @@
+"""
+Load test for the email outbox: enqueue messages, then drain them with the
+dispatcher against a fake provider that simulates SendGrid latency.
+
+    python -m benchmarks.bench_email_outbox [messages] [latency_ms]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Settings require these; the values do not affect the measurement
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("SENDGRID_API_KEY", "unused")
+os.environ.setdefault("EMAIL_FROM", "bench@example.com")
+os.environ.setdefault("SENDGRID_VERIFY_EMAIL_TEMPLATE_ID", "unused")
+os.environ.setdefault("SENDGRID_RESET_PASSWORD_TEMPLATE_ID", "unused")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.core.email import FakeEmailProvider  # noqa: E402
+from app.api.models.email_outbox import EmailOutbox  # noqa: E402
+from app.api.services.email_outbox import EmailDispatcher, enqueue_email  # noqa: E402
+
+
+def main(messages: int, latency_ms: float):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    session_factory = async_sessionmaker(bind=engine)
+    provider = FakeEmailProvider(latency=latency_ms / 1000)
+    dispatcher = EmailDispatcher(provider, session_factory, batch_size=100)
+
+    async def enqueue() -> float:
+        async with engine.begin() as connection:
+            await connection.run_sync(EmailOutbox.__table__.create)
+        started = time.perf_counter()
+        async with session_factory() as db:
+            for i in range(messages):
+                enqueue_email(db, f"user{i}@example.com", "template", {"n": i})
+                await db.commit()  # one transaction per request, as the endpoints do
+        return time.perf_counter() - started
+
+    async def drain() -> float:
+        started = time.perf_counter()
+        while await dispatcher.dispatch_once():
+            pass
+        return time.perf_counter() - started
+
+    enqueue_seconds = asyncio.run(enqueue())
+    drain_seconds = asyncio.run(drain())
+
+    print(f"enqueue: {enqueue_seconds / messages * 1e6:8.1f} us/message (request path)")
+    print(f"  drain: {messages / drain_seconds:8.1f} messages/s (background)")
+    assert len(provider.sent) == messages
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.0,
+    )
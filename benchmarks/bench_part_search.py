@@ -0,0 +1,178 @@
+"""
+Part search benchmark: the first page of /parts/search results from the
+full-text index versus a LIKE scan over the same four columns, on a seeded
+corpus of parts. Runs on a temporary SQLite database (FTS5) unless a
+Postgres URL is given (tsvector + GIN; the database must be empty and
+migrated, or have no parts table yet).
+
+    python -m benchmarks.bench_part_search [parts] [database_url]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Settings require these; the values do not affect the measurement
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("SENDGRID_API_KEY", "unused")
+os.environ.setdefault("EMAIL_FROM", "bench@example.com")
+os.environ.setdefault("SENDGRID_VERIFY_EMAIL_TEMPLATE_ID", "unused")
+os.environ.setdefault("SENDGRID_RESET_PASSWORD_TEMPLATE_ID", "unused")
+
+from sqlalchemy import create_engine, insert, or_, select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.session import async_database_url  # noqa: E402
+from app.api.models.build_list import BuildList  # noqa: E402
+from app.api.models.car import Car  # noqa: E402
+from app.api.models.part import Part  # noqa: E402
+from app.api.models.user import User  # noqa: E402
+from app.api.services.part_search import search_parts  # noqa: E402
+
+MANUFACTURERS = [
+    "Brembo",
+    "Bosch",
+    "NGK",
+    "Bilstein",
+    "Eibach",
+    "Recaro",
+    "Borla",
+    "Garrett",
+    "Koni",
+    "Hawk",
+]
+KINDS = [
+    "brake pads",
+    "brake rotor",
+    "coilover",
+    "spring",
+    "exhaust",
+    "turbo",
+    "intercooler",
+    "seat",
+    "spark plug",
+    "oil filter",
+    "clutch",
+    "flywheel",
+    "intake",
+    "wheel",
+    "tire",
+]
+WORDS = "street track performance ceramic carbon forged billet stainless lightweight racing stock replacement upgrade adjustable high flow heat resistant rally drift touring kit".split()
+# About one part in a thousand mentions one of these
+RARE_WORDS = ["inconel", "magnesium", "titanium", "homologation", "concours"]
+# Common words match a large share of the corpus and every match is ranked;
+# rare words and part numbers are the selective lookups the index is for
+QUERIES = [
+    "brake",
+    "ceramic brake pads",
+    "turbo garrett",
+    "inconel exhaust",
+    "titanium",
+    "homologation seat",
+]
+BUILD_LISTS = 1000
+PAGE = 20
+
+
+def seed(url: str, parts: int) -> str:
+    """Create and fill the tables; returns one seeded part number to look up."""
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User).values(
+                id=1, username="bench", email="bench@example.com", hashed_password="x"
+            )
+        )
+        connection.execute(
+            insert(Car).values(id=1, make="Make", model="Model", year=2020, user_id=1)
+        )
+        connection.execute(
+            insert(BuildList),
+            [
+                {"id": i, "name": f"Build {i}", "car_id": 1, "owner_id": 1}
+                for i in range(1, BUILD_LISTS + 1)
+            ],
+        )
+    started = time.perf_counter()
+    for start in range(0, parts, 10_000):
+        rows = []
+        for part_id in range(start + 1, min(start + 10_000, parts) + 1):
+            manufacturer = rng.choice(MANUFACTURERS)
+            rows.append(
+                {
+                    "id": part_id,
+                    "name": f"{rng.choice(WORDS)} {rng.choice(KINDS)}",
+                    "manufacturer": manufacturer,
+                    "part_number": f"{manufacturer[:3].upper()}-{rng.randrange(100000)}",
+                    "description": " ".join(
+                        rng.choices(WORDS, k=12)
+                        + ([rng.choice(RARE_WORDS)] if rng.random() < 0.001 else [])
+                    ),
+                    "price": rng.randrange(10, 5000),
+                    "build_list_id": rng.randrange(1, BUILD_LISTS + 1),
+                    "owner_id": 1,
+                }
+            )
+        with engine.begin() as connection:
+            connection.execute(insert(Part), rows)
+    print(f"Seeded {parts} parts in {time.perf_counter() - started:.1f}s")
+    engine.dispose()
+    return rows[-1]["part_number"]
+
+
+def like_scan(query: str):
+    """What filtering without an index amounts to: every word in some column."""
+    stmt = select(Part)
+    for word in query.split():
+        pattern = f"%{word}%"
+        stmt = stmt.where(
+            or_(
+                Part.name.ilike(pattern),
+                Part.manufacturer.ilike(pattern),
+                Part.part_number.ilike(pattern),
+                Part.description.ilike(pattern),
+            )
+        )
+    return stmt.order_by(Part.id).limit(PAGE)
+
+
+async def measure(url: str, queries: list, rounds: int = 5):
+    engine = create_async_engine(async_database_url(url))
+    Session = async_sessionmaker(bind=engine)
+
+    async def timed(run) -> float:
+        async with Session() as db:
+            await run(db)  # warm up caches
+            started = time.perf_counter()
+            for _ in range(rounds):
+                await run(db)
+            return (time.perf_counter() - started) / rounds * 1000
+
+    print(f"{'query':<24}{'full-text ms':>14}{'LIKE scan ms':>14}{'matches':>10}")
+    for query in queries:
+        search_ms = await timed(lambda db: search_parts(db, query, PAGE))
+        like_ms = await timed(lambda db: db.scalars(like_scan(query)))
+        async with Session() as db:
+            matches = len(await search_parts(db, query, 1_000_000))
+        print(f"{query:<24}{search_ms:>14.2f}{like_ms:>14.2f}{matches:>10}")
+    await engine.dispose()
+
+
+def main(parts: int, url: str | None):
+    url = url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    part_number = seed(url, parts)
+    asyncio.run(measure(url, QUERIES + [part_number]))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        sys.argv[2] if len(sys.argv) > 2 else None,
+    )
@@ -0,0 +1,41 @@
+"""
+Microbenchmark: verifying the same access token repeatedly with jwt.decode
+versus the cached decode_token used by the auth dependencies.
+
+    python -m benchmarks.bench_token_decode [iterations]
+"""
+
+import os
+import sys
+import timeit
+
+# Settings require these; the values do not affect the measurement
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("SENDGRID_API_KEY", "unused")
+os.environ.setdefault("EMAIL_FROM", "bench@example.com")
+os.environ.setdefault("SENDGRID_VERIFY_EMAIL_TEMPLATE_ID", "unused")
+os.environ.setdefault("SENDGRID_RESET_PASSWORD_TEMPLATE_ID", "unused")
+
+from jose import jwt  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.api.dependencies.auth import create_access_token, decode_token  # noqa: E402
+
+
+def main(iterations: int):
+    token = create_access_token({"sub": "benchmark_user"})
+
+    def uncached():
+        jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.HASH_ALGORITHM])
+
+    def cached():
+        decode_token(token)
+
+    decode_token(token)  # warm the cache
+    for name, func in (("jwt.decode", uncached), ("decode_token", cached)):
+        seconds = min(timeit.repeat(func, number=iterations, repeat=5))
+        print(f"{name:>14}: {seconds / iterations * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)